@@ -12,6 +12,8 @@ dir_export: str = os.path.abspath(os.path.join(dir_project, "export"))
 dir_refinement: str = os.path.abspath(os.path.join(dir_export, "@refined"))
 dir_translate: str = os.path.abspath(os.path.join(dir_export, "@translated"))
 dir_alignment: str = os.path.abspath(os.path.join(dir_export, "@aligned"))
+dir_decoded_cache: str = os.path.abspath(os.path.join(dir_temp, "decoded"))
+dir_result_cache: str = os.path.abspath(os.path.join(dir_user, "result_cache"))
 dir_silero_vad: str = os.path.abspath(os.path.join(dir_assets, "silero-vad"))
 p_app_settings: str = os.path.abspath(os.path.join(dir_user, "settings.json"))
 p_app_icon: str = os.path.abspath(os.path.join(dir_assets, "icon.ico"))
@@ -21,6 +23,10 @@ p_parameters_text: str = os.path.abspath(os.path.join(dir_assets, "parameter.txt
 p_base_filter: str = os.path.abspath(os.path.join(dir_assets, "base_hallucination_filter.json"))
 p_filter_rec: str = os.path.abspath(os.path.join(dir_user, "hallucination_filter_record.json"))
 p_filter_file_import: str = os.path.abspath(os.path.join(dir_user, "hallucination_filter_file_import.json"))
+p_model_checksum_cache: str = os.path.abspath(os.path.join(dir_user, "model_checksum_cache.json"))
+p_cpu_autotune: str = os.path.abspath(os.path.join(dir_user, "cpu_autotune.json"))
+p_file_checksum_cache: str = os.path.abspath(os.path.join(dir_user, "file_checksum_cache.json"))
+p_translation_memory: str = os.path.abspath(os.path.join(dir_user, "translation_memory.db"))
 
 # verify app_icon exist or not
 if not os.path.exists(p_app_icon):
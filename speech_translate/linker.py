@@ -33,6 +33,7 @@ if TYPE_CHECKING:
     from .ui.window.setting import SettingWindow
     from .ui.window.transcribed import TcsWindow
     from .ui.window.translated import TlsWindow
+    from .utils.audio.scheduler import TickScheduler
 
 # ------------------ #
 sj: SettingJson = SettingJson(p_app_settings, [dir_user, dir_temp, dir_log, dir_export, dir_debug], p_app_icon)
@@ -58,6 +59,7 @@ class BridgeClass:
         # rec
         self.rec_tc_thread: Optional[Thread] = None
         self.rec_tl_thread: Optional[Thread] = None
+        self.rec_scheduler: Optional[TickScheduler] = None
         self.recording: bool = False
 
         # Style
@@ -117,6 +119,8 @@ class BridgeClass:
 
     def disable_rec(self):
         self.recording = False
+        if self.rec_scheduler is not None:
+            self.rec_scheduler.wake()  # wake up the record session so it can stop right away
 
     def enable_file_process(self):
         self.file_processing = True
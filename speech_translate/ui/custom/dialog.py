@@ -20,6 +20,7 @@ from speech_translate.utils.translate.language import (
     get_whisper_lang_source,
 )
 from speech_translate.utils.whisper.helper import model_keys
+from speech_translate.utils.whisper.prewarm import prewarm_selection
 
 
 class MultipleChoiceQuestion:
@@ -314,6 +315,16 @@ class FileImportDialog(FileOperationDialog):
         )
         self.cbtn_translate.pack(padx=5, side="left")
 
+        self.var_recompute = BooleanVar(self.root)
+        self.cbtn_recompute = ttk.Checkbutton(self.frame_top, text="Recompute", variable=self.var_recompute)
+        self.cbtn_recompute.pack(padx=5, side="left")
+        tk_tooltip(
+            self.cbtn_recompute,
+            "Run whisper again even if the files were already processed with the same model and settings, "
+            "instead of using the stored result. Only for this import.",
+            wrap_len=400,
+        )
+
         self.var_model.set(sj.cache["model_f_import"])
         self.cb_model.bind("<<ComboboxSelected>>", self.cb_model_change)
         self.var_engine.set(sj.cache["tl_engine_f_import"])
@@ -425,6 +436,10 @@ class FileImportDialog(FileOperationDialog):
                 self.cb_source_lang.current(0)
                 sj.save_key("source_lang_f_import", self.cb_source_lang.get())
 
+            prewarm_selection(
+                self.var_task_transcribe.get(), self.var_task_translate.get(), self.var_model.get(),
+                self.var_engine.get(), self.cb_source_lang.get(), sj.cache
+            )
         except AttributeError:
             pass
 
@@ -464,7 +479,7 @@ class FileImportDialog(FileOperationDialog):
             self.var_model.get(), self.var_engine.get(),
             self.var_source_lang.get().lower(),
             self.var_target_lang.get().lower(), self.var_task_transcribe.get(), self.var_task_translate.get(),
-            [x[0] for x in self.data_list]
+            [x[0] for x in self.data_list], self.var_recompute.get()
         )
         if status:  # if status is True, meaning process thread is successfully started, then close the window
             self.root.destroy()
@@ -478,12 +493,14 @@ class FileImportDialog(FileOperationDialog):
         self.btn_start.configure(state="disabled")
         self.cbtn_transcribe.configure(state="disabled")
         self.cbtn_translate.configure(state="disabled")
+        self.cbtn_recompute.configure(state="disabled")
 
     def enable_interactions(self):
         super().enable_interactions()
         self.cbtn_task_change()
         self.cbtn_transcribe.configure(state="normal")
         self.cbtn_translate.configure(state="normal")
+        self.cbtn_recompute.configure(state="normal")
 
 
 class TranslateResultDialog(FileOperationDialog):
@@ -1,6 +1,5 @@
 import os
 import urllib.request
-from hashlib import sha256
 from pathlib import Path
 from threading import Thread
 from time import sleep, time
@@ -17,6 +16,7 @@ from speech_translate._path import p_app_icon
 from speech_translate.linker import bc
 from speech_translate.ui.custom.message import mbox
 from speech_translate.utils.helper import kill_thread
+from speech_translate.utils.whisper.checksum import checksum_cache
 
 
 def whisper_download_with_progress_gui(
@@ -61,9 +61,7 @@ def whisper_download_with_progress_gui(
         return False
 
     if os.path.isfile(download_target):
-        with open(download_target, "rb") as f:
-            model_bytes = f.read()
-        if sha256(model_bytes).hexdigest() == expected_sha256:
+        if checksum_cache.sha256(download_target) == expected_sha256:
             return download_target
         else:
             logger.warning(f"{download_target} exists, but the SHA256 checksum does not match; re-downloading the file")
@@ -199,8 +197,7 @@ def whisper_download_with_progress_gui(
         # download failed, stop running this function
         return False
 
-    model_bytes = open(download_target, "rb").read()
-    if sha256(model_bytes).hexdigest() != expected_sha256:
+    if checksum_cache.sha256(download_target) != expected_sha256:
         mbox(
             "Download Failed",
             "Model has been downloaded but the SHA256 checksum does not match. Please retry loading the model.", 0, master
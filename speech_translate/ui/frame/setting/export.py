@@ -10,6 +10,7 @@ from speech_translate.ui.custom.combobox import ComboboxWithKeyNav
 from speech_translate.ui.custom.message import MBoxText, mbox
 from speech_translate.ui.custom.spinbox import SpinboxNumOnly
 from speech_translate.ui.custom.tooltip import tk_tooltip, tk_tooltips
+from speech_translate.utils.audio.decoded_cache import decoded_cache
 from speech_translate.utils.helper import filename_only, popup_menu, start_file, up_first_case
 from speech_translate.utils.whisper.helper import get_task_format
 
@@ -36,6 +37,15 @@ class SettingExport:
         self.f_export_mode_3 = ttk.Frame(self.lf_export_mode)
         self.f_export_mode_3.pack(side="top", fill="x", padx=5, pady=5)
 
+        self.lf_batch = LabelFrame(self.master, text="• Batch Processing")
+        self.lf_batch.pack(side="top", fill="x", padx=5, pady=5)
+
+        self.f_batch_1 = ttk.Frame(self.lf_batch)
+        self.f_batch_1.pack(side="top", fill="x", padx=5, pady=5)
+
+        self.f_batch_2 = ttk.Frame(self.lf_batch)
+        self.f_batch_2.pack(side="top", fill="x", padx=5, pady=5)
+
         self.lf_result_modify = LabelFrame(self.master, text="• Result Modification")
         self.lf_result_modify.pack(side="top", fill="x", padx=5, pady=5)
 
@@ -211,6 +221,133 @@ class SettingExport:
             wrap_len=300,
         )
 
+        self.lbl_file_workers = ttk.Label(self.f_batch_1, text="Parallel Files", width=17)
+        self.lbl_file_workers.pack(side="left", padx=5)
+        self.spn_file_workers = SpinboxNumOnly(
+            self.root,
+            self.f_batch_1,
+            1,
+            64,
+            lambda x: sj.save_key("file_workers", int(x)),
+            initial_value=sj.cache["file_workers"],
+            allow_empty=False,
+            delay=10,
+            width=5,
+        )
+        self.spn_file_workers.pack(side="left", padx=5)
+        tk_tooltips(
+            [self.lbl_file_workers, self.spn_file_workers],
+            "Amount of files processed at the same time when importing files. All files share the loaded model.\n\n"
+            "Faster whisper runs the files concurrently on the model, whisper runs one transcription at a time but "
+            "decoding, exporting, and translating with an API still overlap.\n\nDefault is 1",
+            wrap_len=350,
+        )
+
+        self.lbl_file_prefetch = ttk.Label(self.f_batch_1, text="Prefetch Files")
+        self.lbl_file_prefetch.pack(side="left", padx=5)
+        self.spn_file_prefetch = SpinboxNumOnly(
+            self.root,
+            self.f_batch_1,
+            0,
+            32,
+            lambda x: sj.save_key("file_prefetch", int(x)),
+            initial_value=sj.cache["file_prefetch"],
+            allow_empty=False,
+            delay=10,
+            width=5,
+        )
+        self.spn_file_prefetch.pack(side="left", padx=5)
+        tk_tooltips(
+            [self.lbl_file_prefetch, self.spn_file_prefetch],
+            "Amount of files to decode ahead in the background while the current file is being processed, so the "
+            "model does not have to wait for the next file to be decoded.\n\nSet to 0 to disable.\n\nDefault is 2",
+            wrap_len=350,
+        )
+
+        self.lbl_file_prefetch_max_s = ttk.Label(self.f_batch_1, text="Max Prefetch (s)")
+        self.lbl_file_prefetch_max_s.pack(side="left", padx=5)
+        self.spn_file_prefetch_max_s = SpinboxNumOnly(
+            self.root,
+            self.f_batch_1,
+            60,
+            86400,
+            lambda x: sj.save_key("file_prefetch_max_s", int(x)),
+            initial_value=sj.cache["file_prefetch_max_s"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_file_prefetch_max_s.pack(side="left", padx=5)
+        tk_tooltips(
+            [self.lbl_file_prefetch_max_s, self.spn_file_prefetch_max_s],
+            "Maximum total duration in seconds of the audio kept decoded ahead, to limit the memory used by the "
+            "prefetch. One hour of audio takes around 230 MB.\n\nDefault is 3600",
+            wrap_len=350,
+        )
+
+        self.cbtn_file_prefetch_demucs = CustomCheckButton(
+            self.f_batch_1,
+            sj.cache["file_prefetch_demucs"],
+            lambda x: sj.save_key("file_prefetch_demucs", x),
+            text="Demucs on prefetch",
+            style="Switch.TCheckbutton",
+        )
+        self.cbtn_file_prefetch_demucs.pack(side="left", padx=5)
+        tk_tooltip(
+            self.cbtn_file_prefetch_demucs,
+            "When demucs is enabled in the whisper arguments, isolate the vocals of the prefetched files in the "
+            "background too instead of during transcription.\n\nDefault is unchecked",
+            wrap_len=350,
+        )
+
+        self.lbl_decoded_cache_mb = ttk.Label(self.f_batch_2, text="Decoded Cache (MB)", width=17)
+        self.lbl_decoded_cache_mb.pack(side="left", padx=5)
+        self.spn_decoded_cache_mb = SpinboxNumOnly(
+            self.root,
+            self.f_batch_2,
+            0,
+            1_000_000,
+            lambda x: sj.save_key("decoded_cache_mb", int(x)) or decoded_cache.set_budget(int(x)),
+            initial_value=sj.cache["decoded_cache_mb"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_decoded_cache_mb.pack(side="left", padx=5)
+        tk_tooltips(
+            [self.lbl_decoded_cache_mb, self.spn_decoded_cache_mb],
+            "Disk space for keeping the decoded audio of imported files in the temp folder. Each file is decoded only "
+            "once for transcribing, translating, visualizing, refining, and aligning, and importing the same file "
+            "again (even renamed) skips the decoding. The least recently used files are deleted when it is full. "
+            "One hour of audio takes around 230 MB.\n\nIt is kept in temp/decoded and is not deleted with the "
+            "temporary wav files on start, use the clear button to delete it.\n\nSet to 0 to disable."
+            "\n\nDefault is 2048",
+            wrap_len=350,
+        )
+
+        self.btn_clear_decoded_cache = ttk.Button(
+            self.f_batch_2, text="Clear", command=decoded_cache.clear
+        )
+        self.btn_clear_decoded_cache.pack(side="left", padx=5)
+        tk_tooltip(self.btn_clear_decoded_cache, "Delete all the decoded audio kept in the cache")
+
+        self.cbtn_result_cache = CustomCheckButton(
+            self.f_batch_2,
+            sj.cache["result_cache"],
+            lambda x: sj.save_key("result_cache", x),
+            text="Reuse previous results",
+            style="Switch.TCheckbutton",
+        )
+        self.cbtn_result_cache.pack(side="left", padx=5)
+        tk_tooltip(
+            self.cbtn_result_cache,
+            "Store the whisper result of imported files. When the same file is imported again with the same model, "
+            "language, and whisper arguments (for example to export another format), the stored result is exported "
+            "directly instead of transcribing / translating again. Check recompute in the import window to run "
+            "whisper again for an import.\n\nDefault is checked",
+            wrap_len=350,
+        )
+
         self.cbtn_remove_repetition_file_import = CustomCheckButton(
             self.f_result_modify_1,
             sj.cache["remove_repetition_file_import"],
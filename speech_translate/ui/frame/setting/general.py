@@ -11,6 +11,7 @@ from speech_translate.linker import bc, sj
 from speech_translate.ui.custom.checkbutton import CustomCheckButton
 from speech_translate.ui.custom.combobox import ComboboxWithKeyNav
 from speech_translate.ui.custom.message import mbox
+from speech_translate.ui.custom.spinbox import SpinboxNumOnly
 from speech_translate.ui.custom.tooltip import tk_tooltip, tk_tooltips
 from speech_translate.utils.helper import (
     change_folder_w_f_call,
@@ -20,12 +21,16 @@ from speech_translate.utils.helper import (
     up_first_case,
 )
 from speech_translate.utils.tk.style import set_ui_style
+from speech_translate.utils.whisper.autotune import autotune_model
+from speech_translate.utils.whisper.cache import model_cache
 from speech_translate.utils.whisper.download import (
     download_model,
     get_default_download_root,
     verify_model_faster_whisper,
     verify_model_whisper,
 )
+from speech_translate.utils.whisper.helper import model_select_dict
+from speech_translate.utils.whisper.load import get_model_args
 
 
 class ModelDownloadFrame:
@@ -364,6 +369,9 @@ class SettingGeneral:
         self.f_model_2 = ttk.Frame(self.ft1lf_model)
         self.f_model_2.pack(side="top", fill="x", pady=0, padx=5)
 
+        self.f_model_3 = ttk.Frame(self.ft1lf_model)
+        self.f_model_3.pack(side="top", fill="x", pady=(5, 0), padx=5)
+
         self.lf_model_whisper = ttk.LabelFrame(self.ft1lf_model, text="Whisper Model")
         self.lf_model_whisper.pack(side="top", fill="x", padx=5, pady=5)
 
@@ -402,6 +410,82 @@ class SettingGeneral:
             "while and might use lots of your RAM / Memory depending on the model size.",
         )
 
+        self.lbl_model_cache = ttk.Label(self.f_model_2, text="Keep Loaded Models (MB)")
+        self.lbl_model_cache.pack(side="left", padx=5)
+        self.spn_model_cache = SpinboxNumOnly(
+            self.root,
+            self.f_model_2,
+            0,
+            131072,
+            lambda x: sj.save_key("model_cache_budget_mb", int(x)) or model_cache.set_budget(int(x)),
+            initial_value=sj.cache["model_cache_budget_mb"],
+            width=7,
+        )
+        self.spn_model_cache.pack(side="left", padx=5)
+        tk_tooltips(
+            [self.lbl_model_cache, self.spn_model_cache],
+            "Maximum memory used to keep models loaded after a record or file session ends, so the next session "
+            "with the same model can start right away. The least recently used models are unloaded when it is full."
+            "\n\nSet to 0 to always load the model again.\n\nDefault value is 4096 MB.",
+            wrap_len=350,
+        )
+
+        self.cbtn_prewarm_model = CustomCheckButton(
+            self.f_model_2,
+            sj.cache["prewarm_model"],
+            lambda x: sj.save_key("prewarm_model", x),
+            text="Prewarm selected model",
+            style="Switch.TCheckbutton"
+        )
+        self.cbtn_prewarm_model.pack(side="left", padx=5)
+        tk_tooltip(
+            self.cbtn_prewarm_model,
+            "Start loading the selected model in the background as soon as it is selected in the main window or "
+            "in the file import dialog, so recording or processing can start right away.\n\nThe model is only loaded "
+            "if it is already downloaded and it is kept within the loaded models memory.\n\nDefault is unchecked",
+            wrap_len=350,
+        )
+
+        self.cbtn_prewarm_dummy_decode = CustomCheckButton(
+            self.f_model_2,
+            sj.cache["prewarm_dummy_decode"],
+            lambda x: sj.save_key("prewarm_dummy_decode", x),
+            text="Test run on prewarm",
+            style="Switch.TCheckbutton"
+        )
+        self.cbtn_prewarm_dummy_decode.pack(side="left", padx=5)
+        tk_tooltip(
+            self.cbtn_prewarm_dummy_decode,
+            "Run a short transcription of silence after prewarming the model, so the first real transcription does "
+            "not have to wait for the initialization.\n\nDefault is unchecked",
+            wrap_len=350,
+        )
+
+        self.cbtn_cpu_autotune = CustomCheckButton(
+            self.f_model_3,
+            sj.cache["cpu_autotune"],
+            lambda x: sj.save_key("cpu_autotune", x),
+            text="Use tuned CPU config",
+            style="Switch.TCheckbutton"
+        )
+        self.cbtn_cpu_autotune.pack(side="left", padx=5)
+        tk_tooltip(
+            self.cbtn_cpu_autotune,
+            "Use the fastest threads, compute type, and quantization found by the CPU tuner when running a model "
+            "on the CPU. Values set in the whisper raw arguments are kept.\n\nDefault is unchecked",
+            wrap_len=350,
+        )
+
+        self.btn_cpu_autotune = ttk.Button(self.f_model_3, text="Tune CPU for selected model", command=self.cpu_autotune)
+        self.btn_cpu_autotune.pack(side="left", padx=5)
+        tk_tooltip(
+            self.btn_cpu_autotune,
+            "Benchmark the model selected in the main window on the CPU with different thread counts, compute types "
+            "(faster whisper), and quantization (whisper) then save the fastest one for this machine.\n\n"
+            "The model needs to be downloaded first. This could take a few minutes depending on the model size.",
+            wrap_len=350,
+        )
+
         self.btn_model_config = ttk.Button(
             self.f_model_1,
             image=bc.wrench_emoji,
@@ -637,6 +721,50 @@ class SettingGeneral:
         btn.configure(text="Download", command=lambda: self.model_download(model, btn, use_faster_whisper), state="normal")
         bc.cancel_dl = True  # Raise flag to stop
 
+    def cpu_autotune(self) -> None:
+        """
+        Run the cpu autotuner for the model selected in the main window in a thread
+        """
+        model = model_select_dict[sj.cache["model_mw"]]
+        use_faster_whisper = sj.cache["use_faster_whisper"]
+        model_dir = sj.cache["dir_model"] if sj.cache["dir_model"] != "auto" else get_default_download_root()
+        if use_faster_whisper:
+            downloaded = verify_model_faster_whisper(model, model_dir)
+        else:
+            downloaded = verify_model_whisper(model, model_dir)
+
+        if not downloaded:
+            mbox("Model not downloaded", f"Please download the {model} model first before tuning it.", 1, self.root)
+            return
+
+        if not mbox(
+            "Tune CPU", f"Benchmark the {model} model on the CPU? This could take a few minutes and the app "
+            "could be slow while it is running.", 3, self.root
+        ):
+            return
+
+        def run():
+            try:
+                best = autotune_model(
+                    model,
+                    use_faster_whisper,
+                    get_model_args(sj.cache),
+                    lambda msg: self.btn_cpu_autotune.configure(text=msg),
+                )
+                tuned = f"compute type {best['compute_type']}" if use_faster_whisper else f"quantization {best['dq']}"
+                mbox(
+                    "Tune CPU", f"Best config for {model}: {best['threads']} threads, {tuned}, "
+                    f"real time factor {best['rtf']}", 0, self.root
+                )
+            except Exception as e:
+                logger.exception(e)
+                mbox("Tune CPU failed", f"Err details: {e}", 2, self.root)
+            finally:
+                self.btn_cpu_autotune.configure(text="Tune CPU for selected model", state="normal")
+
+        self.btn_cpu_autotune.configure(text="Tuning...", state="disabled")
+        Thread(target=run, daemon=True).start()
+
     def model_btn_checker(self, model: str, btn: ttk.Button, faster_whisper: bool = False) -> None:
         """
         Helper to check if model is downloaded.
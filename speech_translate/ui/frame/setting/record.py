@@ -4,19 +4,18 @@ from time import sleep
 from tkinter import Frame, IntVar, LabelFrame, StringVar, Toplevel, ttk
 from typing import Literal, Union
 
-import webrtcvad
 from loguru import logger
 
 from speech_translate._constants import MAX_THRESHOLD, MIN_THRESHOLD, WHISPER_SR
-from speech_translate._path import dir_silero_vad
 from speech_translate.linker import bc, sj
 from speech_translate.ui.custom.audio import AudioMeter
 from speech_translate.ui.custom.checkbutton import CustomCheckButton
 from speech_translate.ui.custom.combobox import ComboboxTypeOnCustom
 from speech_translate.ui.custom.spinbox import SpinboxNumOnly
 from speech_translate.ui.custom.tooltip import tk_tooltip, tk_tooltips
-from speech_translate.utils.audio.audio import get_db, get_frame_duration, get_speech_webrtc, resample_sr, to_silero
+from speech_translate.utils.audio.audio import ChunkAnalysis, Resampler, get_frame_duration
 from speech_translate.utils.audio.device import get_device_details
+from speech_translate.utils.audio.vad import vad_registry
 from speech_translate.utils.helper import cbtn_invoker, windows_os_only
 
 if system() == "Windows":
@@ -33,7 +32,6 @@ class RecordingOptionsDevice:
         self, root: Toplevel, master_frame: Union[ttk.Frame, Frame], device: Literal["speaker", "mic"],
         cb_sr: ComboboxTypeOnCustom, cb_channels: ComboboxTypeOnCustom
     ):
-        import torch  # pylint: disable=import-outside-toplevel
         self.on_start = True
         self.root = root
         self.master = master_frame
@@ -47,15 +45,16 @@ class RecordingOptionsDevice:
         self.min_threshold = MIN_THRESHOLD
         self.p = None
         self.device_detail = {}
+        self.resampler = None
         self.stream = None
         self.auto_threshold_disabled = False
         self.silero_disabled = False
-        self.webrtcvad = webrtcvad.Vad()
+        self.webrtcvad = vad_registry.webrtc_vad()
         self.silerovad = None
         self.frame_duration = 10
 
         def load_silero_in_thread():
-            self.silerovad, _ = torch.hub.load(repo_or_dir=dir_silero_vad, source="local", model="silero_vad", onnx=True)
+            self.silerovad = vad_registry.silero_stream()
 
         Thread(target=load_silero_in_thread, daemon=True).start()
 
@@ -383,7 +382,7 @@ class RecordingOptionsDevice:
                 logger.debug(f"Opening {self.long_device} meter")
                 self.possible_auto_threshold()
                 self.possible_silerovad()
-                self.silerovad.reset_states()
+                self.silerovad.reset()
                 self.f_device_5.pack(side="top", fill="x", pady=(10, 5), padx=5)
                 self.f_device_6.pack(side="top", fill="x", pady=(0, 5), padx=5)
                 self.audiometer.pack(side="left", padx=5)
@@ -402,6 +401,9 @@ class RecordingOptionsDevice:
                     raise Exception(f"Failed to get {self.long_device} details")
 
                 self.frame_duration = get_frame_duration(self.device_detail["sample_rate"], self.device_detail["chunk_size"])
+                self.resampler = Resampler(
+                    self.device_detail["sample_rate"], WHISPER_SR, self.device_detail["num_of_channels"]
+                )
                 self.stream = self.p.open(
                     format=pyaudio.paInt16,
                     channels=self.device_detail["num_of_channels"],
@@ -448,7 +450,7 @@ class RecordingOptionsDevice:
         try:
             if self.stream:
                 if self.silerovad:
-                    self.silerovad.reset_states()
+                    self.silerovad.reset()
                 self.audiometer.stop()
                 self.stream.stop_stream()
                 self.stream.close()
@@ -488,8 +490,9 @@ class RecordingOptionsDevice:
         """
         try:
             assert self.silerovad is not None, "SileroVAD is not loaded yet!"
-            resampled = resample_sr(in_data, self.device_detail["sample_rate"], WHISPER_SR)
-            db = get_db(in_data)
+            assert self.resampler is not None, "Resampler is not created yet!"
+            chunk = ChunkAnalysis(in_data, self.device_detail["num_of_channels"], self.resampler)
+            db = chunk.db
             self.audiometer.set_db(db)
 
             if db > self.max_threshold:
@@ -502,15 +505,16 @@ class RecordingOptionsDevice:
             if not self.vad_checked:  # check at least once so we know if silero is possible to use or not
                 self.vad_checked = True
                 logger.debug("Checking if webrtcvad is possible to use. You can ignore the error log if it fails!")
-                get_speech_webrtc(resampled, WHISPER_SR, self.frame_duration, self.webrtcvad)
+                chunk.is_speech_webrtc(self.frame_duration, self.webrtcvad)
                 logger.debug("Checking if silero is possible to use. You can ignore the error log if it fails!")
-                self.silerovad(to_silero(resampled, self.device_detail["num_of_channels"]), WHISPER_SR)
+                self.silerovad(chunk.silero)
 
             if sj.cache.get(f"threshold_enable_{self.device}", True) and not self.auto_threshold_disabled:
-                is_speech = get_speech_webrtc(resampled, WHISPER_SR, self.frame_duration, self.webrtcvad)
-                if is_speech and sj.cache.get(f"threshold_auto_silero_{self.device}", True) and not self.silero_disabled:
-                    conf = self.silerovad(to_silero(resampled, self.device_detail["num_of_channels"]), WHISPER_SR)
-                    is_speech = conf.item() >= sj.cache.get(f"threshold_silero_{self.device}_min", 0.7)
+                is_speech = chunk.is_speech_webrtc(self.frame_duration, self.webrtcvad)
+                if sj.cache.get(f"threshold_auto_silero_{self.device}", True) and not self.silero_disabled:
+                    is_speech = self.silerovad.is_speech(
+                        chunk.silero, sj.cache.get(f"threshold_silero_{self.device}_min", 0.7)
+                    ) and is_speech
                 self.audiometer.set_recording(is_speech)
 
             return (in_data, pyaudio.paContinue)
@@ -862,6 +866,23 @@ class SettingRecord:
             wrap_len=350,
         )
 
+        self.cbtn_incremental = CustomCheckButton(
+            self.f_recording_0,
+            sj.cache["rec_incremental"],
+            lambda x: sj.save_key("rec_incremental", x),
+            text="Incremental transcription",
+            style="Switch.TCheckbutton"
+        )
+        self.cbtn_incremental.pack(side="left", padx=5)
+        tk_tooltip(
+            self.cbtn_incremental,
+            "If checked, words that stay the same across transcribe ticks are committed and their audio is removed from "
+            "the buffer, so each tick only transcribes the uncommitted part instead of the whole buffer. This keeps the "
+            "delay flat on long sentences.\n\nNeeds word timestamps and is not used when translating with whisper."
+            "\n\nDefault is unchecked",
+            wrap_len=350,
+        )
+
         # ----- procesing
         self.lf_processing = ttk.LabelFrame(self.f_recording_1, text="Audio Processing")
         self.lf_processing.pack(side="top", padx=5, fill="x", expand=True)
@@ -3,7 +3,10 @@ from typing import Union
 
 from speech_translate.linker import sj
 from speech_translate.ui.custom.checkbutton import CustomCheckButton
+from speech_translate.ui.custom.message import mbox
+from speech_translate.ui.custom.spinbox import SpinboxNumOnly
 from speech_translate.ui.custom.tooltip import tk_tooltip, tk_tooltips
+from speech_translate.utils.translate.memory import translation_memory
 
 
 class SettingTranslate:
@@ -113,6 +116,248 @@ class SettingTranslate:
         )
         self.cbtn_proxies_http.pack(side="left", padx=5, pady=(0, 5))
 
+        # ------------------ Request limits ------------------
+        self.lf_tl_limits = LabelFrame(self.master, text="• Request Limits")
+        self.lf_tl_limits.pack(side="top", fill="x", padx=5, pady=5)
+
+        self.f_tl_limits_1 = ttk.Frame(self.lf_tl_limits)
+        self.f_tl_limits_1.pack(side="top", fill="x", pady=5, padx=5)
+
+        self.f_tl_limits_2 = ttk.Frame(self.lf_tl_limits)
+        self.f_tl_limits_2.pack(side="top", fill="x", pady=5, padx=5)
+
+        self.f_tl_limits_3 = ttk.Frame(self.lf_tl_limits)
+        self.f_tl_limits_3.pack(side="top", fill="x", pady=5, padx=5)
+
+        self.lbl_tl_workers_google = ttk.Label(self.f_tl_limits_1, text="Google Translate", width=20)
+        self.lbl_tl_workers_google.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_tl_workers_google = SpinboxNumOnly(
+            self.root,
+            self.f_tl_limits_1,
+            1,
+            64,
+            lambda x: sj.save_key("tl_workers_google", int(x)),
+            initial_value=sj.cache["tl_workers_google"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_tl_workers_google.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_tl_workers_google, self.spn_tl_workers_google],
+            "Maximum requests to Google Translate sent at the same time when translating. "
+            "Higher is faster for long files but the server might refuse too many requests.\n\nDefault is 4",
+            wrap_len=400,
+        )
+
+        self.lbl_tl_rate_google = ttk.Label(self.f_tl_limits_1, text="Requests / Second")
+        self.lbl_tl_rate_google.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_tl_rate_google = SpinboxNumOnly(
+            self.root,
+            self.f_tl_limits_1,
+            0,
+            1000,
+            lambda x: sj.save_key("tl_rate_google", int(x)),
+            initial_value=sj.cache["tl_rate_google"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_tl_rate_google.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_tl_rate_google, self.spn_tl_rate_google],
+            "Maximum requests to Google Translate started per second. "
+            "Failed requests are retried after an increasing delay.\n\nSet to 0 for no limit.\n\nDefault is 5",
+            wrap_len=400,
+        )
+
+        self.lbl_tl_workers_mymemory = ttk.Label(self.f_tl_limits_2, text="MyMemoryTranslator", width=20)
+        self.lbl_tl_workers_mymemory.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_tl_workers_mymemory = SpinboxNumOnly(
+            self.root,
+            self.f_tl_limits_2,
+            1,
+            64,
+            lambda x: sj.save_key("tl_workers_mymemory", int(x)),
+            initial_value=sj.cache["tl_workers_mymemory"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_tl_workers_mymemory.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_tl_workers_mymemory, self.spn_tl_workers_mymemory],
+            "Maximum requests to MyMemoryTranslator sent at the same time when translating. "
+            "Higher is faster for long files but the server might refuse too many requests.\n\nDefault is 2",
+            wrap_len=400,
+        )
+
+        self.lbl_tl_rate_mymemory = ttk.Label(self.f_tl_limits_2, text="Requests / Second")
+        self.lbl_tl_rate_mymemory.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_tl_rate_mymemory = SpinboxNumOnly(
+            self.root,
+            self.f_tl_limits_2,
+            0,
+            1000,
+            lambda x: sj.save_key("tl_rate_mymemory", int(x)),
+            initial_value=sj.cache["tl_rate_mymemory"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_tl_rate_mymemory.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_tl_rate_mymemory, self.spn_tl_rate_mymemory],
+            "Maximum requests to MyMemoryTranslator started per second. "
+            "Failed requests are retried after an increasing delay.\n\nSet to 0 for no limit.\n\nDefault is 2",
+            wrap_len=400,
+        )
+
+        self.lbl_tl_workers_libre = ttk.Label(self.f_tl_limits_3, text="LibreTranslate", width=20)
+        self.lbl_tl_workers_libre.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_tl_workers_libre = SpinboxNumOnly(
+            self.root,
+            self.f_tl_limits_3,
+            1,
+            64,
+            lambda x: sj.save_key("tl_workers_libre", int(x)),
+            initial_value=sj.cache["tl_workers_libre"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_tl_workers_libre.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_tl_workers_libre, self.spn_tl_workers_libre],
+            "Maximum requests to LibreTranslate sent at the same time when translating. "
+            "Higher is faster for long files but the server might refuse too many requests.\n\nDefault is 4",
+            wrap_len=400,
+        )
+
+        self.lbl_tl_rate_libre = ttk.Label(self.f_tl_limits_3, text="Requests / Second")
+        self.lbl_tl_rate_libre.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_tl_rate_libre = SpinboxNumOnly(
+            self.root,
+            self.f_tl_limits_3,
+            0,
+            1000,
+            lambda x: sj.save_key("tl_rate_libre", int(x)),
+            initial_value=sj.cache["tl_rate_libre"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_tl_rate_libre.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_tl_rate_libre, self.spn_tl_rate_libre],
+            "Maximum requests to LibreTranslate started per second. "
+            "Failed requests are retried after an increasing delay.\n\nSet to 0 for no limit.\n\nDefault is 0",
+            wrap_len=400,
+        )
+
+        self.f_tl_limits_4 = ttk.Frame(self.lf_tl_limits)
+        self.f_tl_limits_4.pack(side="top", fill="x", pady=5, padx=5)
+
+        self.cbtn_tl_pack_segments = CustomCheckButton(
+            self.f_tl_limits_4,
+            sj.cache["tl_pack_segments"],
+            lambda x: sj.save_key("tl_pack_segments", x),
+            text="Pack segments",
+            style="Switch.TCheckbutton"
+        )
+        self.cbtn_tl_pack_segments.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltip(
+            self.cbtn_tl_pack_segments,
+            "Send many segments in one Google Translate / MyMemoryTranslator request (one segment per line) instead "
+            "of one request for every segment. If the translation does not come back with the same amount of lines, "
+            "the segments are sent one by one.\n\nDefault is checked",
+            wrap_len=400,
+        )
+
+        self.cbtn_tl_live_latest_only = CustomCheckButton(
+            self.f_tl_limits_4,
+            sj.cache["tl_live_latest_only"],
+            lambda x: sj.save_key("tl_live_latest_only", x),
+            text="Live translate newest only",
+            style="Switch.TCheckbutton"
+        )
+        self.cbtn_tl_live_latest_only.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltip(
+            self.cbtn_tl_live_latest_only,
+            "When recording, only translate the newest transcribed text. Text that is replaced by a newer "
+            "transcription before its translation starts is skipped, and text that did not change since the last "
+            "translation is not translated again, so a slow engine does not fall behind.\n\nDefault is checked",
+            wrap_len=400,
+        )
+
+        # ------------------ Translation memory ------------------
+        self.lf_tl_memory = LabelFrame(self.master, text="• Translation Memory")
+        self.lf_tl_memory.pack(side="top", fill="x", padx=5, pady=5)
+
+        self.f_tl_memory_1 = ttk.Frame(self.lf_tl_memory)
+        self.f_tl_memory_1.pack(side="top", fill="x", pady=5, padx=5)
+
+        self.cbtn_tl_memory = CustomCheckButton(
+            self.f_tl_memory_1,
+            sj.cache["tl_memory"],
+            lambda x: sj.save_key("tl_memory", x),
+            text="Reuse translations",
+            style="Switch.TCheckbutton"
+        )
+        self.cbtn_tl_memory.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltip(
+            self.cbtn_tl_memory,
+            "Keep every translation made with the translation APIs and reuse it when the same text (same engine and "
+            "languages) needs to be translated again, instead of sending it to the API.\n\nDefault is checked",
+            wrap_len=400,
+        )
+
+        self.lbl_tl_memory_fuzzy = ttk.Label(self.f_tl_memory_1, text="Fuzzy Match (%)")
+        self.lbl_tl_memory_fuzzy.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_tl_memory_fuzzy = SpinboxNumOnly(
+            self.root,
+            self.f_tl_memory_1,
+            0,
+            100,
+            lambda x: sj.save_key("tl_memory_fuzzy", int(x)),
+            initial_value=sj.cache["tl_memory_fuzzy"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_tl_memory_fuzzy.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_tl_memory_fuzzy, self.spn_tl_memory_fuzzy],
+            "Also reuse the translation of a text that is at least this similar to the text to translate. "
+            "Keep it high, a small difference can change the meaning.\n\nSet to 0 to only reuse exact matches."
+            "\n\nDefault is 0",
+            wrap_len=400,
+        )
+
+        self.lbl_tl_memory_max_entries = ttk.Label(self.f_tl_memory_1, text="Max Entries")
+        self.lbl_tl_memory_max_entries.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_tl_memory_max_entries = SpinboxNumOnly(
+            self.root,
+            self.f_tl_memory_1,
+            100,
+            10_000_000,
+            lambda x: sj.save_key("tl_memory_max_entries", int(x)),
+            initial_value=sj.cache["tl_memory_max_entries"],
+            allow_empty=False,
+            delay=10,
+            width=9,
+        )
+        self.spn_tl_memory_max_entries.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_tl_memory_max_entries, self.spn_tl_memory_max_entries],
+            "Maximum translations kept, the least recently used ones are deleted when it is full.\n\nDefault is 100000",
+            wrap_len=400,
+        )
+
+        self.btn_tl_memory_clear = ttk.Button(self.f_tl_memory_1, text="Clear", command=self.clear_tl_memory)
+        self.btn_tl_memory_clear.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltip(self.btn_tl_memory_clear, "Delete every kept translation")
+
         # ------------------ Libre translate ------------------
         self.lf_libre = LabelFrame(self.master, text="• Libre Translate Setting")
         self.lf_libre.pack(side="top", fill="x", padx=5, pady=5)
@@ -158,3 +403,82 @@ class SettingTranslate:
         )
         self.cbtn_supress_empty_api_key.pack(side="left", padx=5, pady=(0, 5))
         tk_tooltip(self.cbtn_supress_empty_api_key, "Supress warning when libre api key is empty.")
+
+        self.f_libre_2 = ttk.Frame(self.lf_libre)
+        self.f_libre_2.pack(side="top", fill="x", pady=5, padx=5)
+
+        self.lbl_libre_batch_size = ttk.Label(self.f_libre_2, text="Batch Size")
+        self.lbl_libre_batch_size.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_libre_batch_size = SpinboxNumOnly(
+            self.root,
+            self.f_libre_2,
+            1,
+            1000,
+            lambda x: sj.save_key("libre_batch_size", int(x)),
+            initial_value=sj.cache["libre_batch_size"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_libre_batch_size.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_libre_batch_size, self.spn_libre_batch_size],
+            "Maximum amount of texts sent in one request when translating a file, instead of one request for every "
+            "segment. Lower it if the server has a lower batch limit.\n\nSet to 1 to send the texts one by one."
+            "\n\nDefault is 50",
+            wrap_len=400,
+        )
+
+        self.lbl_libre_batch_chars = ttk.Label(self.f_libre_2, text="Batch Characters")
+        self.lbl_libre_batch_chars.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_libre_batch_chars = SpinboxNumOnly(
+            self.root,
+            self.f_libre_2,
+            100,
+            1_000_000,
+            lambda x: sj.save_key("libre_batch_chars", int(x)),
+            initial_value=sj.cache["libre_batch_chars"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_libre_batch_chars.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_libre_batch_chars, self.spn_libre_batch_chars],
+            "Maximum total characters of the texts sent in one request. Lower it if the server has a character limit."
+            "\n\nDefault is 5000",
+            wrap_len=400,
+        )
+
+        self.lbl_libre_pool_size = ttk.Label(self.f_libre_2, text="Connections")
+        self.lbl_libre_pool_size.pack(side="left", padx=5, pady=(0, 5))
+        self.spn_libre_pool_size = SpinboxNumOnly(
+            self.root,
+            self.f_libre_2,
+            1,
+            64,
+            lambda x: sj.save_key("libre_pool_size", int(x)),
+            initial_value=sj.cache["libre_pool_size"],
+            allow_empty=False,
+            delay=10,
+            width=7,
+        )
+        self.spn_libre_pool_size.pack(side="left", padx=5, pady=(0, 5))
+        tk_tooltips(
+            [self.lbl_libre_pool_size, self.spn_libre_pool_size],
+            "Maximum connections kept open to the server. Connections are reused between requests so each request "
+            "does not need to connect again.\n\nDefault is 4",
+            wrap_len=400,
+        )
+
+    def clear_tl_memory(self):
+        stats = translation_memory.stats()
+        if mbox(
+            "Clear translation memory",
+            f"Delete {stats['entries']} kept translations?\n\nReused {stats['hits']} exact and "
+            f"{stats['fuzzy_hits']} fuzzy matches, {stats['misses']} texts were sent to the APIs "
+            "since the app started.",
+            3,
+            self.root,
+        ):
+            translation_memory.clear()
@@ -64,6 +64,7 @@ from speech_translate.utils.whisper.download import (
     verify_model_whisper,
 )
 from speech_translate.utils.whisper.helper import append_dot_en, create_hallucination_filter, model_keys
+from speech_translate.utils.whisper.prewarm import prewarm_selection
 
 
 # monkey patch subprocess.run
@@ -1288,6 +1289,9 @@ class MainWindow:
             self.cb_source_lang.current(0)
             sj.save_key("source_lang_f_import", self.cb_source_lang.get())
 
+        tc, tl, m_key, tl_engine, source, _target, _mic, _speaker = self.get_args()
+        prewarm_selection(tc, tl, m_key, tl_engine, source, sj.cache)
+
     def disable_rec(self):
         self.btn_record.configure(state="disabled")
         self.tb_transcribed.configure(state="disabled")
@@ -1750,7 +1754,7 @@ class MainWindow:
         if "disabled" in self.btn_import_file.state():
             return
 
-        def do_process(m_key, tl_engine, source, target, tc, tl, files):
+        def do_process(m_key, tl_engine, source, target, tc, tl, files, recompute):
             nonlocal prompt
             # lang is lowered when send from FileImportDialog
             if source == target and tl:
@@ -1814,7 +1818,9 @@ class MainWindow:
             try:
                 from speech_translate.utils.audio.file import process_file  # pylint: disable=import-outside-toplevel
                 f_import_thread = Thread(
-                    target=process_file, args=(list(files), model_tc, source, target, tc, tl, tl_engine), daemon=True
+                    target=process_file,
+                    args=(list(files), model_tc, source, target, tc, tl, tl_engine, recompute),
+                    daemon=True
                 )
                 f_import_thread.start()
 
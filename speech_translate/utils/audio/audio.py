@@ -1,29 +1,19 @@
-# pylint: disable=deprecated-module
-from audioop import rms as calculate_rms
-from io import BytesIO
-from wave import Wave_read, Wave_write
-from wave import open as w_open
-
-import torch
-from numpy import abs as np_abs
-from numpy import float32, frombuffer, iinfo, int16, log10, reshape
-from scipy.signal import butter, filtfilt, resample_poly
+from math import gcd
+from typing import Optional
+
+import numpy as np
+from numpy import float32, frombuffer, iinfo, int16, log10, multiply, ndarray
+from scipy.signal import butter, firwin, sosfilt
 from webrtcvad import Vad
 
 from speech_translate._constants import WHISPER_SR
 
-
-class Frame(object):
-    """Represents a "frame" of audio data."""
-    def __init__(self, _bytes, timestamp, duration):
-        self.bytes = _bytes
-        self.timestamp = timestamp
-        self.duration = duration
+MAX_INT16 = iinfo(int16).max
 
 
 def get_frame_duration(sample_rate: int, chunk_size: int) -> int:
     """
-    Get the frame duration to be used in the frame generator.
+    Get the frame duration of the webrtc vad frames.
     Value return is either 10, 20, or 30 ms.
 
     Parameters
@@ -48,141 +38,251 @@ def get_frame_duration(sample_rate: int, chunk_size: int) -> int:
         return 10
 
 
-def frame_generator(frame_duration_ms, audio, sample_rate, get_only_first_frame=False):
-    """Generates audio frames from PCM audio data.
-
-    Takes the desired frame duration in milliseconds, the PCM data, and
-    the sample rate.
+def pcm_to_float32(data, num_of_channels: int, channel: int = 0) -> ndarray:
+    """Convert interleaved int16 pcm data straight to a normalized float32 numpy array.
 
-    Yields Frames of the requested duration.
-    """
-    n = int(sample_rate * (frame_duration_ms / 1000.0) * 2)
-    offset = 0
-    timestamp = 0.0
-    duration = (float(n) / sample_rate) / 2.0
-    while offset + n < len(audio):
-        yield Frame(audio[offset:offset + n], timestamp, duration)
-        timestamp += duration
-        offset += n
-        if get_only_first_frame:
-            break
-
-
-def resample_sr(data: bytes, sample_rate: int, target_sample_rate: int) -> bytes:
-    """
-    This function resamples the audio data from a given sample rate to a target sample rate.
-    The function is used when the sample rate of the audio is not 16kHz.
-
-    If by chance the sample rate is already 16kHz, the function will return the original audio data.
+    Samples are interleaved, so for a stereo stream with left channel of [L0, L1, L2, ...]
+    and right channel of [R0, R1, R2, ...] the data is ordered as [L0, R0, L1, R1, L2, R2, ...].
+    The channel is taken with a strided view and normalized in a single vectorized operation,
+    no intermediate container is created.
 
     Parameters
     ----------
-    data : bytes
-        chunk of audio data from pyaudio input stream in bytes
-    sample_rate : int
-        sample rate of the audio data
-    target_sample_rate : int
-        target sample rate
+    data : bytes or np.ndarray
+        int16 pcm audio data
+    num_of_channels : int
+        number of channels of the audio data
+    channel : int, optional
+        channel to take, by default 0 (left channel)
 
     Returns
     -------
-    bytes
+    np.ndarray
+        float32 audio data in the range of -1.0 to 1.0
     """
-    if sample_rate == target_sample_rate:
-        return data
+    samples = frombuffer(data, dtype=int16) if not isinstance(data, ndarray) else data
+    if num_of_channels > 1:
+        samples = samples[channel::num_of_channels]
 
-    audio_as_np_int16 = frombuffer(data, dtype=int16)  # read as numpy array of int16
-    audio_as_np_float32 = audio_as_np_int16.astype(float32)  # convert to float32
+    return multiply(samples, 1 / MAX_INT16, dtype=float32)
 
-    # Filter the audio with a anti aliasing filter
-    nyquist = 0.5 * sample_rate  # nyquist frequency / folding frequency
-    cutoff = 0.9 * nyquist  # Adjust the cutoff frequency as needed
 
-    # Use a butterworth filter with order of 4
-    filter_order = 4
-    b, a = butter(filter_order, cutoff / nyquist, btype='lowpass')
-
-    # Filter the audio using filtfilt (zero-phase filtering)
-    filtered_audio = filtfilt(b, a, audio_as_np_float32)
-
-    # Resample the filtered audio with zero-padding
-    resampled = resample_poly(filtered_audio, target_sample_rate, sample_rate, window=('kaiser', 5.0))
-
-    return resampled.astype(int16).tobytes()  # convert back to int16 and bytes
-
-
-def get_db(audio_data: bytes) -> float:
-    """Get the db value of the audio data.
-
-    Parameters
-    ----------
-    audio_data : bytes
-        chunk of audio data from pyaudio input stream in bytes
-
-    Returns
-    -------
-    float
-        db value of the audio data
+class Resampler:
     """
-    rms: float = calculate_rms(audio_data, 2) / 32767
-    if rms == 0.0:
-        return 0.0
-    else:
-        return 20 * log10(rms)  # convert to db
-
-
-def get_speech_webrtc(
-    data: bytes, sample_rate: int, frame_duration_ms: int, vad: Vad, get_only_first_frame: bool = True
-) -> bool:
-    frames = list(frame_generator(frame_duration_ms, data, sample_rate, get_only_first_frame=get_only_first_frame))
-    data_to_check = data if len(frames) == 0 else frames[0].bytes
-    is_speech: bool = vad.is_speech(data_to_check, sample_rate)
-    return is_speech
-
-
-def to_silero(sound_bytes: bytes, num_of_channels: int, samp_width: int = 2):
-    """Converts a byte array to a 32-bit float tensor.
+    Stateful streaming resampler, created once per stream and called on every chunk of the stream.
 
-    Parameters
-    ----------
-    sound_bytes : byte array
-        A byte array representing a sound file.
-    num_of_channels : int
-        The number of channels in the sound file.
-    samp_width : int, optional
-        The sample width of the sound file, by default 2 (16-bit)
+    The anti aliasing filter and the polyphase filter (designed the same way as ``resample_poly``) are only
+    computed once on creation. The filter state and the input history of every channel are carried over
+    between calls, so consecutive chunks are resampled as one continuous signal without edge artifacts
+    on the chunk boundaries. Channels are resampled separately and returned interleaved.
+    """
+    def __init__(self, sample_rate: int, target_sample_rate: int, num_of_channels: int = 1):
+        """
+        Parameters
+        ----------
+        sample_rate : int
+            sample rate of the audio data
+        target_sample_rate : int
+            target sample rate
+        num_of_channels : int, optional
+            number of channels of the audio data, by default 1
+        """
+        self.sample_rate = sample_rate
+        self.target_sample_rate = target_sample_rate
+        self.num_of_channels = num_of_channels
+        self.passthrough = sample_rate == target_sample_rate
+        if self.passthrough:
+            return
+
+        divisor = gcd(sample_rate, target_sample_rate)
+        self.up = target_sample_rate // divisor
+        self.down = sample_rate // divisor
+
+        # anti aliasing filter, in second order sections so it can be run chunk by chunk
+        nyquist = 0.5 * sample_rate
+        cutoff = 0.9 * nyquist
+        self.sos = butter(4, cutoff / nyquist, btype='lowpass', output='sos')
+
+        # polyphase filter, phase p uses the taps h[p], h[p + up], h[p + 2 * up], ...
+        max_rate = max(self.up, self.down)
+        h = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=('kaiser', 5.0)) * self.up
+        self.n_taps = -(-len(h) // self.up)
+        h = np.concatenate([h, np.zeros(self.n_taps * self.up - len(h))])
+        self.phases = h.reshape(self.n_taps, self.up).T
+        self.tap_offsets = np.arange(self.n_taps)
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset the filter state and the input history, used when the stream is not continuous anymore"""
+        if self.passthrough:
+            return
+
+        self.zi = np.zeros((self.sos.shape[0], 2, self.num_of_channels))
+        self.history = np.zeros((self.n_taps, self.num_of_channels))
+        self.n_in = 0  # total frames received
+        self.n_out = 0  # total frames produced
+
+    def __call__(self, data: bytes) -> bytes:
+        """Resample a chunk of the stream
+
+        Parameters
+        ----------
+        data : bytes
+            chunk of audio data from pyaudio input stream in bytes
+
+        Returns
+        -------
+        bytes
+            resampled int16 audio data
+        """
+        if self.passthrough:
+            return data
+
+        return self.resample(frombuffer(data, dtype=int16)).tobytes()
+
+    def resample(self, samples: ndarray) -> ndarray:
+        """Resample a chunk of the stream that is already decoded
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            interleaved int16 samples of the chunk
+
+        Returns
+        -------
+        np.ndarray
+            resampled interleaved int16 samples, the input itself if no resampling is needed
+        """
+        if self.passthrough:
+            return samples
+
+        chunk = samples.reshape(-1, self.num_of_channels)
+        filtered, self.zi = sosfilt(self.sos, chunk, axis=0, zi=self.zi)
+
+        # buf[0] is the input frame at n_in - n_taps
+        buf = np.concatenate([self.history, filtered])
+        n_in_total = self.n_in + len(filtered)
+
+        # output m lands on input position m * down / up, produce every output that has its input available
+        n_out_total = ((n_in_total - 1) * self.up) // self.down + 1
+        pos = np.arange(self.n_out, n_out_total) * self.down
+        base = pos // self.up - (self.n_in - self.n_taps)
+        resampled = np.einsum(
+            "mk,mkc->mc", self.phases[pos % self.up], buf[base[:, None] - self.tap_offsets[None, :]]
+        )
+
+        self.history = buf[-self.n_taps:]
+        self.n_in = n_in_total
+        self.n_out = n_out_total
+
+        return np.clip(np.round(resampled), -32768, 32767).astype(int16).reshape(-1)
+
+
+class ChunkAnalysis:
+    """
+    Shared analysis of a single captured chunk.
 
-    Returns
-    -------
-    torch tensor
-        A tensor representing the sound file data.
+    The chunk is decoded to numpy once and every consumer (db metering, resampling, silero and webrtc) reads
+    from the same buffers. Every value is computed lazily on first access and cached, so consumers that are
+    not used for the current setting cost nothing.
     """
-    if num_of_channels == 1:
-        audio_as_np_int16 = frombuffer(sound_bytes, dtype=int16).flatten()
-        abs_max = np_abs(audio_as_np_int16).max()
-        np_buf = audio_as_np_int16.astype('float32')
-        if abs_max > 0:
-            np_buf *= 1 / abs_max
-    else:
-        # need to make temp in memory to make sure the audio will be read properly
-        wf = BytesIO()
-        wav_writer: Wave_write = w_open(wf, "wb")
-        wav_writer.setframerate(WHISPER_SR)
-        wav_writer.setsampwidth(samp_width)
-        wav_writer.setnchannels(num_of_channels)
-        wav_writer.writeframes(sound_bytes)
-        wav_writer.close()
-        wf.seek(0)
-
-        wav_reader: Wave_read = w_open(wf)
-        samples = wav_reader.getnframes()
-        audio_bytes = wav_reader.readframes(samples)
-
-        audio_as_np_int16 = frombuffer(audio_bytes, dtype=int16).flatten()
-        audio_as_np_float32 = audio_as_np_int16.astype(float32)
-        chunk_length = len(audio_as_np_float32) / num_of_channels
-        audio_reshaped = reshape(audio_as_np_float32, (int(chunk_length), num_of_channels))
-        np_buf = audio_reshaped[:, 0] / iinfo(int16).max  # take left channel only
-
-    torch_float32 = torch.from_numpy(np_buf.squeeze())
-    return torch_float32
+    def __init__(self, data: bytes, num_of_channels: int, resampler: Optional[Resampler] = None):
+        """
+        Parameters
+        ----------
+        data : bytes
+            chunk of audio data from pyaudio input stream in bytes
+        num_of_channels : int
+            number of channels of the audio data
+        resampler : Optional[Resampler], optional
+            resampler of the stream to WHISPER_SR, by default None (chunk is already in WHISPER_SR)
+        """
+        self.raw = data
+        self.num_of_channels = num_of_channels
+        self.resampler = resampler
+        self._samples: Optional[ndarray] = None
+        self._db: Optional[float] = None
+        self._resampled: Optional[ndarray] = None
+        self._mono: Optional[ndarray] = None
+        self._silero: Optional[ndarray] = None
+
+    @property
+    def samples(self) -> ndarray:
+        """Interleaved int16 samples of the original chunk (a view of the raw bytes)"""
+        if self._samples is None:
+            self._samples = frombuffer(self.raw, dtype=int16)
+        return self._samples
+
+    @property
+    def db(self) -> float:
+        """db value of the original chunk"""
+        if self._db is None:
+            samples = self.samples.astype(float32)
+            rms = float(np.sqrt(np.dot(samples, samples) / len(samples))) / 32767 if len(samples) > 0 else 0.0
+            self._db = 0.0 if rms == 0.0 else float(20 * log10(rms))
+        return self._db
+
+    @property
+    def resampled(self) -> ndarray:
+        """Interleaved int16 samples resampled to WHISPER_SR. Resampling is stateful so it is only run once"""
+        if self._resampled is None:
+            self._resampled = self.resampler.resample(self.samples) if self.resampler is not None else self.samples
+        return self._resampled
+
+    @property
+    def resampled_bytes(self) -> bytes:
+        return self.resampled.tobytes()
+
+    @property
+    def mono(self) -> ndarray:
+        """First channel of the resampled samples (strided view, no copy)"""
+        if self._mono is None:
+            self._mono = self.resampled[::self.num_of_channels] if self.num_of_channels > 1 else self.resampled
+        return self._mono
+
+    @property
+    def silero(self) -> ndarray:
+        """Normalized float32 mono audio (first channel) of the resampled audio for SileroStream"""
+        if self._silero is None:
+            self._silero = pcm_to_float32(self.resampled, self.num_of_channels)
+        return self._silero
+
+    def frames(self, frame_duration_ms: int) -> ndarray:
+        """Full webrtc frames of the resampled mono audio
+
+        Parameters
+        ----------
+        frame_duration_ms : int
+            frame duration in ms, 10, 20, or 30
+
+        Returns
+        -------
+        np.ndarray
+            2d view of shape (amount of frames, samples per frame)
+        """
+        n = int(WHISPER_SR * (frame_duration_ms / 1000.0))
+        mono = self.mono
+        return np.lib.stride_tricks.as_strided(
+            mono, shape=(len(mono) // n, n), strides=(mono.strides[0] * n, mono.strides[0]), writeable=False
+        )
+
+    def is_speech_webrtc(self, frame_duration_ms: int, vad: Vad) -> bool:
+        """Check the first frame of the chunk with webrtc vad
+
+        Parameters
+        ----------
+        frame_duration_ms : int
+            frame duration in ms, 10, 20, or 30
+        vad : Vad
+            webrtc vad
+
+        Returns
+        -------
+        bool
+            True if the frame is speech
+        """
+        frames = self.frames(frame_duration_ms)
+        # when the chunk is shorter than a frame, check the whole chunk (webrtc will raise if it is not valid)
+        data_to_check = frames[0] if len(frames) > 0 else self.mono
+        return vad.is_speech(data_to_check.tobytes(), WHISPER_SR)
@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class AudioBuffer:
+    """
+    Preallocated int16 sliding buffer used to accumulate the recorded audio of a live session.
+
+    Samples are stored interleaved (same layout as pyaudio output) inside a single numpy array.
+    Appending only copies the new chunk into the free space at the end, trimming from the front
+    only moves the start index, and reading the active window returns a view without copying.
+    When the free space at the end runs out, the active window is moved back to the start of the
+    array (or the array is grown if the window itself no longer fits), so appending is amortized O(1).
+    """
+    def __init__(self, sample_rate: int, num_of_channels: int, seconds: float):
+        """
+        Parameters
+        ----------
+        sample_rate : int
+            sample rate of the audio that will be stored
+        num_of_channels : int
+            number of channels of the audio that will be stored
+        seconds : float
+            initial capacity of the buffer in seconds
+        """
+        self.sample_rate = sample_rate
+        self.num_of_channels = num_of_channels
+        self._data = np.zeros(max(int(sample_rate * seconds), 1) * num_of_channels, dtype=np.int16)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def capacity(self) -> int:
+        """Capacity of the buffer in samples (all channels)"""
+        return len(self._data)
+
+    @property
+    def frames(self) -> int:
+        """Amount of frames (samples per channel) currently stored"""
+        return len(self) // self.num_of_channels
+
+    @property
+    def duration(self) -> float:
+        """Duration of the currently stored audio in seconds"""
+        return self.frames / self.sample_rate
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the currently stored audio in bytes"""
+        return len(self) * self._data.itemsize
+
+    def _make_room(self, size: int):
+        """Make sure that there is space for `size` more samples at the end of the buffer"""
+        if self._end + size <= len(self._data):
+            return
+
+        used = len(self)
+        if used + size > len(self._data):
+            # grow, double the capacity until it fits
+            new_capacity = len(self._data)
+            while used + size > new_capacity:
+                new_capacity *= 2
+
+            new_data = np.zeros(new_capacity, dtype=np.int16)
+            new_data[:used] = self._data[self._start:self._end]
+            self._data = new_data
+        else:
+            # move the active window back to the start
+            self._data[:used] = self._data[self._start:self._end]
+
+        self._start = 0
+        self._end = used
+
+    def append(self, data) -> None:
+        """Append audio data to the end of the buffer
+
+        Parameters
+        ----------
+        data : bytes or np.ndarray
+            int16 pcm audio data (interleaved if more than 1 channel)
+        """
+        samples = np.frombuffer(data, dtype=np.int16) if isinstance(data, (bytes, bytearray, memoryview)) else data
+        size = len(samples)
+        if size == 0:
+            return
+
+        self._make_room(size)
+        self._data[self._end:self._end + size] = samples
+        self._end += size
+
+    def view(self) -> np.ndarray:
+        """Get the active window of the buffer. The returned array is a view, it is not copied.
+
+        Returns
+        -------
+        np.ndarray
+            int16 interleaved samples
+        """
+        return self._data[self._start:self._end]
+
+    def consume(self, frames: int) -> None:
+        """Remove frames from the start of the buffer
+
+        Parameters
+        ----------
+        frames : int
+            amount of frames (samples per channel) to remove
+        """
+        self._start = min(self._start + max(frames, 0) * self.num_of_channels, self._end)
+        if self._start == self._end:
+            self.clear()
+
+    def clear(self) -> None:
+        """Clear the buffer, the allocated memory is kept for reuse"""
+        self._start = 0
+        self._end = 0
@@ -0,0 +1,146 @@
+import hashlib
+import os
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+from numpy import ndarray
+from whisper.audio import load_audio
+
+from speech_translate._constants import WHISPER_SR
+from speech_translate._logging import logger
+from speech_translate._path import dir_decoded_cache
+from speech_translate.utils.whisper.checksum import file_checksum_cache
+
+
+class DecodedAudioCache:
+    """
+    On disk cache of decoded audio, so a file is only decoded by ffmpeg once for every task that needs it
+    (transcribe, translate, suppression visualization, refinement, alignment) and across imports.
+
+    The audio is stored as 16kHz mono float32 .npy keyed by the sha256 of the file content and the decode options,
+    so renamed or copied files still hit the cache. Entries are memory mapped when loaded. When the total size goes
+    over the budget, the least recently used entries are deleted.
+    """
+    def __init__(self, cache_dir: str = dir_decoded_cache, budget_mb: float = 2048):
+        """
+        Parameters
+        ----------
+        cache_dir : str, optional
+            folder to store the decoded audio, by default dir_decoded_cache
+        budget_mb : float, optional
+            maximum total size in MB, by default 2048. 0 disables the cache
+        """
+        self.cache_dir = cache_dir
+        self.budget_mb = budget_mb
+        self._lock = Lock()
+        self._key_locks: Dict[str, List] = {}  # key -> [lock, amount of callers using it], removed when unused
+
+    def make_key(self, path: str, options: str) -> str:
+        digest = file_checksum_cache.sha256(path)
+        options_digest = hashlib.sha1(f"{WHISPER_SR}|{options}".encode("utf-8")).hexdigest()[:8]
+        return f"{digest[:32]}_{options_digest}"
+
+    def load(
+        self,
+        path: str,
+        separator: Optional[Callable[[ndarray], ndarray]] = None,
+    ) -> ndarray:
+        """Get the decoded audio of a file, decoding and storing it if it is not cached yet
+
+        Parameters
+        ----------
+        path : str
+            path of the audio / video file
+        separator : Optional[Callable[[ndarray], ndarray]], optional
+            demucs function to run on the decoded audio, the separated audio is cached separately, by default None
+
+        Returns
+        -------
+        np.ndarray
+            16kHz mono float32 audio, memory mapped (copy on write) when it comes from the cache
+        """
+        if self.budget_mb <= 0:
+            audio = load_audio(path, WHISPER_SR)
+            return separator(audio) if separator is not None else audio
+
+        key = self.make_key(path, "demucs" if separator is not None else "")
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, [Lock(), 0])
+            key_lock[1] += 1
+
+        # the same file requested by several tasks at the same time is only decoded once
+        try:
+            with key_lock[0]:
+                return self._load_key(key, path, separator)
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if key_lock[1] == 0:
+                    del self._key_locks[key]
+
+    def _load_key(self, key: str, path: str, separator: Optional[Callable[[ndarray], ndarray]]) -> ndarray:
+        """Load the cached audio of the key or decode and store it, must hold the lock of the key"""
+        target = os.path.join(self.cache_dir, key + ".npy")
+        if os.path.exists(target):
+            try:
+                os.utime(target)  # mark as recently used
+                return np.load(target, mmap_mode="c")
+            except Exception as e:
+                logger.warning(f"Failed to read cached audio, decoding again: {e}")
+
+        audio = load_audio(path, WHISPER_SR)
+        if separator is not None:
+            audio = separator(audio)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp = target + ".tmp"
+            with open(temp, "wb") as f:
+                np.save(f, np.ascontiguousarray(audio, dtype=np.float32))
+            os.replace(temp, target)
+            self._evict()
+        except Exception as e:
+            logger.warning(f"Failed to cache decoded audio: {e}")
+
+        return audio
+
+    def set_budget(self, budget_mb: float) -> None:
+        """Change the budget, deleting entries that no longer fit"""
+        self.budget_mb = budget_mb
+        self._evict()
+
+    def _evict(self, budget_mb: Optional[float] = None) -> None:
+        """Delete the least recently used entries until the total size is within the budget"""
+        budget = (self.budget_mb if budget_mb is None else budget_mb) * 1024 * 1024
+        with self._lock:
+            try:
+                entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".npy")]
+            except FileNotFoundError:
+                return
+
+            stats = []
+            for entry in entries:
+                try:
+                    stats.append((entry.stat().st_mtime, entry.stat().st_size, entry.path))
+                except OSError:
+                    pass
+
+            stats.sort()
+            total = sum(size for _, size, _ in stats)
+            for _, size, path in stats:
+                if total <= budget:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    # might still be memory mapped (windows), try again on the next eviction
+                    pass
+
+    def clear(self) -> None:
+        """Delete every cached audio"""
+        self._evict(0)
+
+
+decoded_cache = DecodedAudioCache()
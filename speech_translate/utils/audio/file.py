@@ -1,16 +1,19 @@
 import json
 import sys
+from contextlib import nullcontext
 from datetime import datetime
 from os import makedirs, path
-from threading import Thread
+from threading import Lock, Thread
 from time import gmtime, sleep, strftime, time
 from tkinter import filedialog
-from typing import Dict, List, Literal, Union
+from typing import Dict, List, Literal, Optional, Union
 
+import numpy as np
 import stable_whisper
 from torch import cuda
 from whisper.tokenizer import TO_LANGUAGE_CODE
 
+from speech_translate._constants import WHISPER_SR
 from speech_translate._logging import logger
 from speech_translate._path import dir_alignment, dir_export, dir_refinement, dir_translate
 from speech_translate.linker import bc, sj
@@ -28,17 +31,25 @@ from ..helper import (
     start_file,
     up_first_case,
 )
-from ..translate.translator import translate
+from ..translate.translator import get_tl_args, translate
+from ..whisper.cache import model_cache
 from ..whisper.helper import get_hallucination_filter, get_task_format, model_values, to_language_name
 from ..whisper.load import get_model, get_model_args, get_tc_args
 from ..whisper.result import remove_segments_by_str, split_res
+from ..whisper.result_cache import result_cache
 from ..whisper.save import save_output_stable_ts
+from .decoded_cache import decoded_cache
+from .prefetch import AudioPrefetcher, make_demucs_separator
 
 # Global variable
 # to track which file is processed
 processed_tc = []
 processed_tl = []
 F_IMPORT_COUNTER = 0
+# whisper (torch) model can not run several transcriptions at once, faster whisper can
+INFER_LOCK: Optional[Lock] = None
+Q_LOCK = Lock()
+COUNTER_LOCK = Lock()  # file counters are updated by every worker
 
 
 def update_q_process(list_of_dict: List[dict], index: int, status: str) -> None:
@@ -49,26 +60,45 @@ def update_q_process(list_of_dict: List[dict], index: int, status: str) -> None:
         "index": index,
         "status": status,
     }
-    temp = get_list_of_dict(list_of_dict, "index", index)
     try:
-        if temp is not None:
-            list_of_dict[index] = update
-        else:
-            list_of_dict.append(update)
+        with Q_LOCK:
+            # files can finish out of order when processed in parallel, find the position of the index
+            pos = next((i for i, item in enumerate(list_of_dict) if item["index"] == index), None)
+            if pos is not None:
+                list_of_dict[pos] = update
+            else:
+                list_of_dict.append(update)
     except Exception as e:
         logger.exception(e)
         logger.warning("Failed to update processed list of dict")
 
 
-def run_whisper(func, audio: str, task: str, fail_status: List, **kwargs):
+def run_whisper(
+    func,
+    audio: Union[str, np.ndarray],
+    task: str,
+    fail_status: List,
+    result_holder: List,
+    result_keys: Optional[Dict[str, str]] = None,
+    recompute: bool = False,
+    **kwargs
+):
     """Run whisper function
 
     Args
     ----
     func : function
         The whisper function to run.
+    audio : str or np.ndarray
+        The audio file path or the decoded audio.
     fail_status : list
         To store the fail status, use list because it is passed by reference so it can be changed in thread.
+    result_holder : list
+        To store the result, each call gets its own list so parallel files never take the result of another file.
+    result_keys : dict, optional
+        Result cache key of each task, if set the stored result is used when there is one and new results are stored.
+    recompute : bool, optional
+        Run whisper even if there is a stored result, the new result replaces the stored one.
     **kwargs
         The arguments to pass to the whisper function.
 
@@ -77,9 +107,22 @@ def run_whisper(func, audio: str, task: str, fail_status: List, **kwargs):
     None
     """
     try:
+        key = result_keys.get(task) if result_keys else None
+        if key and not recompute:
+            result = result_cache.get(key)
+            if result is not None:
+                sys.stderr.write(f"Whisper {task} loaded from previous result\n")
+                result_holder.append(result)
+                return
+
         sys.stderr.write(f"Running Whisper {task}...\n")
-        result = func(audio, task=task, **kwargs)
-        bc.data_queue.put(result)
+        if not isinstance(audio, str) and sj.cache["use_faster_whisper"]:
+            kwargs["input_sr"] = WHISPER_SR  # when using numpy array as input, will need to set input_sr
+        with INFER_LOCK if INFER_LOCK is not None else nullcontext():
+            result = func(audio, task=task, **kwargs)
+        if key:
+            result_cache.set(key, result)
+        result_holder.append(result)
         sys.stderr.write(f"Whisper {task} done\n")
     except Exception as e:
         logger.exception(e)
@@ -214,7 +257,7 @@ def run_translate_api(
 
 # run in threaded environment with queue and exception to cancel
 def cancellable_tc(
-    audio_name: str,
+    audio_name: Union[str, np.ndarray],
     lang_source: str,
     lang_target: str,
     model_name_tc: str,
@@ -236,8 +279,8 @@ def cancellable_tc(
 
     Args
     ----
-    audio_name: str
-        path to file
+    audio_name: str or np.ndarray
+        path to file or the prefetched audio
     lang_source: str
         source language
     lang_target: str
@@ -296,9 +339,14 @@ def cancellable_tc(
         logger.debug("Source Language: Auto" if auto else f"Source Language: {lang_source}")
 
         fail_status = [False, ""]
+        result_holder = []
 
+        # audio_name is already decoded by the caller (same audio given to both tasks when translating with whisper)
         thread = Thread(
-            target=run_whisper, args=[stable_tc, audio_name, "transcribe", fail_status], kwargs=whisper_args, daemon=True
+            target=run_whisper,
+            args=[stable_tc, audio_name, "transcribe", fail_status, result_holder],
+            kwargs=whisper_args,
+            daemon=True
         )
         thread.start()
 
@@ -312,7 +360,7 @@ def cancellable_tc(
         if fail_status[0]:
             raise Exception(fail_status[1])
 
-        result_tc: stable_whisper.WhisperResult = bc.data_queue.get()
+        result_tc: stable_whisper.WhisperResult = result_holder[0]
         if sj.cache["filter_file_import"]:
             try:
                 assert result_tc.language is not None, "Language is None"
@@ -341,7 +389,8 @@ def cancellable_tc(
             result_text = result_tc.text.strip()
 
             if len(result_text) > 0:
-                bc.file_tced_counter += 1
+                with COUNTER_LOCK:
+                    bc.file_tced_counter += 1
                 save_output_stable_ts(result_tc_save, path.join(export_to, f_name), sj.cache["export_to"], sj)
             else:
                 logger.warning("Transcribed Text is empty")
@@ -391,11 +440,12 @@ def cancellable_tc(
             logger.exception(e)
             native_notify("Error: Transcribing Audio", str(e))
     finally:
-        F_IMPORT_COUNTER += 1
+        with COUNTER_LOCK:
+            F_IMPORT_COUNTER += 1
 
 
 def cancellable_tl(
-    query: Union[str, stable_whisper.WhisperResult],
+    query: Union[str, np.ndarray, stable_whisper.WhisperResult],
     lang_source: str,
     lang_target: str,
     stable_tl,
@@ -414,8 +464,8 @@ def cancellable_tl(
 
     Args
     ----
-    query: str or stable_whisper.WhisperResult
-        audio file path if engine is whisper, result of whisper process if engine is not whisper
+    query: str or np.ndarray or stable_whisper.WhisperResult
+        audio file path or decoded audio if engine is whisper, result of whisper process if engine is not whisper
     lang_source: str
         source language
     lang_target: str
@@ -473,8 +523,12 @@ def cancellable_tl(
             logger.debug("Source Language: Auto" if auto else f"Source Language: {lang_source}")
 
             fail_status = [False, ""]
+            result_holder = []
             thread = Thread(
-                target=run_whisper, args=[stable_tl, query, "translate", fail_status], kwargs=whisper_args, daemon=True
+                target=run_whisper,
+                args=[stable_tl, query, "translate", fail_status, result_holder],
+                kwargs=whisper_args,
+                daemon=True
             )
             thread.start()
 
@@ -488,7 +542,7 @@ def cancellable_tl(
             if fail_status[0]:
                 raise Exception(fail_status[1])
 
-            result_tl: stable_whisper.WhisperResult = bc.data_queue.get()
+            result_tl: stable_whisper.WhisperResult = result_holder[0]
             if sj.cache["filter_file_import"]:
                 try:
                     assert result_tl.language is not None, "Language is None"
@@ -509,7 +563,7 @@ def cancellable_tl(
             if sj.cache["remove_repetition_file_import"]:
                 result_tl = result_tl.remove_repetition(sj.cache["remove_repetition_amount"])
 
-            # if whisper, sended text (toTranslate) is the audio file path
+            # if whisper, sended text (toTranslate) is the audio file path or the decoded audio
             res_text = result_tl.text.strip()
 
             if len(res_text) == 0:
@@ -518,7 +572,8 @@ def cancellable_tl(
                 return
 
             result_tl = split_res(result_tl, sj.cache)
-            bc.file_tled_counter += 1
+            with COUNTER_LOCK:
+                bc.file_tled_counter += 1
             save_output_stable_ts(result_tl, path.join(export_to, f_name), sj.cache["export_to"], sj)
         else:
             # when using TL API, query is the result of whisper process
@@ -530,10 +585,7 @@ def cancellable_tl(
 
             debug_log = sj.cache["debug_translate"]
             proxies = get_proxies(sj.cache["http_proxy"], sj.cache["https_proxy"])
-            kwargs = {}
-            if engine == "LibreTranslate":
-                kwargs["libre_link"] = sj.cache["libre_link"]
-                kwargs["libre_api_key"] = sj.cache["libre_api_key"]
+            kwargs = get_tl_args(engine, sj.cache)
 
             fail_status = [False, ""]
             thread = Thread(
@@ -554,7 +606,8 @@ def cancellable_tl(
             if fail_status[0]:
                 raise Exception(fail_status[1])
 
-            bc.file_tled_counter += 1
+            with COUNTER_LOCK:
+                bc.file_tled_counter += 1
             query = split_res(query, sj.cache)
             save_output_stable_ts(query, path.join(export_to, f_name), sj.cache["export_to"], sj)
 
@@ -586,11 +639,19 @@ def cancellable_tl(
             logger.exception(e)
             native_notify(f"Error: translation with {engine} failed ", str(e) + " Check log for details")
     finally:
-        F_IMPORT_COUNTER += 1
+        with COUNTER_LOCK:
+            F_IMPORT_COUNTER += 1
 
 
 def process_file(
-    data_files: List[str], model_name_tc: str, lang_source: str, lang_target: str, is_tc: bool, is_tl: bool, engine: str
+    data_files: List[str],
+    model_name_tc: str,
+    lang_source: str,
+    lang_target: str,
+    is_tc: bool,
+    is_tl: bool,
+    engine: str,
+    recompute: bool = False
 ) -> None:
     """Function to transcribe and translate from audio/video files.
 
@@ -610,6 +671,8 @@ def process_file(
         Whether to translate the audio.
     engine (str)
         The engine to use for the translation.
+    recompute (bool)
+        Whether to run whisper again even if the files were already processed with the same settings.
 
     Returns
     -------
@@ -632,13 +695,18 @@ def process_file(
         file_slice_start = (None if sj.cache["file_slice_start"] == "" else int(sj.cache["file_slice_start"]))
         file_slice_end = None if sj.cache["file_slice_end"] == "" else int(sj.cache["file_slice_end"])
         visualize_suppression = sj.cache["visualize_suppression"]
+        n_workers = max(1, int(sj.cache["file_workers"]))
+        decoded_cache.set_budget(sj.cache["decoded_cache_mb"])
 
         # load model
         model_args = get_model_args(sj.cache)
+        if sj.cache["use_faster_whisper"] and n_workers > 1:
+            # let ctranslate2 run the workers transcription concurrently on the same model
+            model_args.setdefault("num_workers", n_workers)
         _model_tc, _model_tl, stable_tc, stable_tl, to_args = get_model(
             is_tc, is_tl, tl_engine_whisper, model_name_tc, engine, sj.cache, **model_args
         )
-        whisper_args = get_tc_args(to_args, sj.cache)
+        whisper_args = get_tc_args(to_args, sj.cache, model_name=model_name_tc)
         whisper_args["language"] = TO_LANGUAGE_CODE[get_whisper_lang_similar(lang_source)] if not auto else None
         if sj.cache["filter_file_import"]:
             hallucination_filters = get_hallucination_filter('file', sj.cache["path_filter_file_import"])
@@ -653,10 +721,11 @@ def process_file(
         logger.info(f"Process Args: {whisper_args}")
         local_file_import_counter = 0
 
-        global processed_tc, processed_tl, F_IMPORT_COUNTER
+        global processed_tc, processed_tl, F_IMPORT_COUNTER, INFER_LOCK
         processed_tc = []
         processed_tl = []
         F_IMPORT_COUNTER = 0
+        INFER_LOCK = None if sj.cache["use_faster_whisper"] else Lock()
         all_done = False
 
         def get_queue_data():
@@ -794,12 +863,57 @@ def process_file(
         bc.enable_file_tc()
         bc.enable_file_tl()
 
-        for file in data_files:
-            if not bc.file_processing:  # if cancel button is pressed
-                return
-
+        # decode the next files in the background so the model does not wait for ffmpeg
+        # if both demucs and vad is enabled, use file instead of numpy array to avoid error
+        prefetcher = None
+        if sj.cache["file_prefetch"] > 0 and not (whisper_args["demucs"] and whisper_args["vad"]):
+            separator = None
+            if whisper_args["demucs"] and sj.cache["file_prefetch_demucs"]:
+                separator = make_demucs_separator(model_args["device"])
+            prefetcher = AudioPrefetcher(
+                data_files, sj.cache["file_prefetch"] + n_workers - 1, sj.cache["file_prefetch_max_s"],
+                lambda: bc.file_processing, separator
+            ).start()
+
+        # files are taken by index so files added while running also join the pool
+        next_index = 0
+        busy = 0
+        index_lock = Lock()
+
+        def process_one(index: int, file: str):
             # Proccess it
             logger.debug("FILE PROCESSING: " + file)
+            audio, file_args = file, whisper_args
+            if prefetcher is not None:
+                prefetched, separated = prefetcher.get(index)
+                if prefetched is not None:
+                    audio = prefetched
+                    if separated:  # demucs already done in the prefetch
+                        file_args = {**whisper_args, "demucs": False}
+            elif not (whisper_args["demucs"] and whisper_args["vad"]):
+                try:
+                    audio = decoded_cache.load(file)
+                except Exception as e:
+                    # the file is given as is to the model, it will show the error if there is any
+                    logger.exception(e)
+                    logger.warning(f"Failed to decode {file}")
+
+            if sj.cache["result_cache"]:
+                # key with the original args, demucs done in the prefetch gives the same result
+                try:
+                    use_fw = sj.cache["use_faster_whisper"]
+                    file_args = {
+                        **file_args,
+                        "result_keys": {
+                            "transcribe": result_cache.make_key(file, model_name_tc, use_fw, "transcribe", whisper_args),
+                            "translate": result_cache.make_key(file, engine, use_fw, "translate", whisper_args),
+                        },
+                        "recompute": recompute,
+                    }
+                except Exception as e:
+                    logger.exception(e)
+                    logger.warning(f"Failed to hash {file}, the result will not be stored")
+
             file_name = filename_only(file)
             save_name = datetime.now().strftime(export_format)
             save_name = save_name.replace("{file}", file_name[file_slice_start:file_slice_end])
@@ -830,7 +944,7 @@ def process_file(
                     save_visual = save_visual.replace(fmt, value)
 
                 stable_whisper.visualize_suppression(
-                    file, path.join(export_to, save_visual + ".png"), vad=whisper_args["vad"]
+                    audio, path.join(export_to, save_visual + ".png"), vad=whisper_args["vad"]
                 )
                 logger.debug("saved visualized suppression")
 
@@ -866,10 +980,10 @@ def process_file(
                 proc_thread = Thread(
                     target=cancellable_tl,
                     args=[
-                        file, lang_source, lang_target, stable_tl, engine, auto, save_name, save_meta,
-                        local_file_import_counter, hallucination_filters
+                        audio, lang_source, lang_target, stable_tl, engine, auto, save_name, save_meta,
+                        index, hallucination_filters
                     ],
-                    kwargs=whisper_args,
+                    kwargs=file_args,
                     daemon=True,
                 )
             else:
@@ -878,19 +992,55 @@ def process_file(
                 proc_thread = Thread(
                     target=cancellable_tc,
                     args=[
-                        file, lang_source, lang_target, model_name_tc, stable_tc, stable_tl, auto, is_tc, is_tl, engine,
-                        save_name, save_meta, local_file_import_counter, hallucination_filters
+                        audio, lang_source, lang_target, model_name_tc, stable_tc, stable_tl, auto, is_tc, is_tl, engine,
+                        save_name, save_meta, index, hallucination_filters
                     ],
-                    kwargs=whisper_args,
+                    kwargs=file_args,
                     daemon=True,
                 )
 
             proc_thread.start()
-            proc_thread.join()  # wait for thread to finish until continue to next file
-            local_file_import_counter += 1
+            proc_thread.join()  # wait for thread to finish until the worker takes the next file
 
-            while adding:
-                sleep(0.5)
+        def worker():
+            nonlocal next_index, busy, local_file_import_counter
+            while bc.file_processing:
+                with index_lock:
+                    index = None
+                    if next_index < len(data_files):
+                        index = next_index
+                        next_index += 1
+                        local_file_import_counter = next_index
+                        busy += 1
+                    elif busy == 0 and not adding:
+                        return  # nothing left and no other worker can get more files
+
+                if index is None:  # wait for files that might still be added
+                    sleep(0.5)
+                    continue
+
+                try:
+                    process_one(index, data_files[index])
+                except Exception as e:
+                    logger.exception(e)
+                    for processed, on in ((processed_tc, is_tc), (processed_tl, is_tl)):
+                        if on:
+                            update_q_process(processed, index, "Failed to process (check log)")
+                finally:
+                    with index_lock:
+                        busy -= 1
+
+        workers = [Thread(target=worker, daemon=True) for _ in range(n_workers)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+        if prefetcher is not None:
+            prefetcher.stop()
+
+        if not bc.file_processing:  # if cancel button is pressed
+            return
 
         # making sure that all file is processed
         # when all_done is True, it means that all file is processed
@@ -907,7 +1057,6 @@ def process_file(
 
         logger.info(f"End process (FILE) [Total time: {time() - t_start:.2f}s]")
 
-        del _model_tc, _model_tl, stable_tc, stable_tl, to_args, whisper_args
         # turn off loadbar
         bc.mw.stop_lb("file")
         bc.disable_file_process()  # update flag
@@ -987,10 +1136,14 @@ def mod_result(data_files: List, model_name_tc: str, mode: Literal["refinement",
         file_slice_end = None if sj.cache["file_slice_end"] == "" else int(sj.cache["file_slice_end"])
 
         # load model
-        model_args = get_model_args(sj.cache)
-        model = stable_whisper.load_model(model_name_tc, **model_args)
+        model_args = get_model_args(sj.cache, model_name_tc)
+        model_cache.set_budget(sj.cache["model_cache_budget_mb"])
+        decoded_cache.set_budget(sj.cache["decoded_cache_mb"])
+        model = model_cache.load("whisper", model_name_tc, **model_args)
         mod_function = model.refine if mode == "refinement" else model.align  # type: ignore
-        mod_args = get_tc_args(mod_function, sj.cache, mode="refine" if mode == "refinement" else "align")
+        mod_args = get_tc_args(
+            mod_function, sj.cache, mode="refine" if mode == "refinement" else "align", model_name=model_name_tc
+        )
 
         t_start = time()
         logger.info(f"Model Args: {model_args}")
@@ -1160,8 +1313,13 @@ def mod_result(data_files: List, model_name_tc: str, mode: Literal["refinement",
 
             def run_mod():
                 # pylint: disable=cell-var-from-loop
-                nonlocal mod_source, processed, model, mod_function
+                nonlocal audio, mod_source, processed, model, mod_function
                 try:
+                    # decode once (or take it from the cache) for the mod and the re-transcribe on null token
+                    # if both demucs and vad is enabled, use file instead of numpy array to avoid error
+                    if not (mod_args.get("demucs") and mod_args.get("vad")):
+                        audio = decoded_cache.load(audio)
+
                     update_q_process(processed, bc.mod_file_counter, f"Processing {mode}")
                     result = mod_function(audio, mod_source, **mod_args)
                     bc.data_queue.put(result)
@@ -1177,7 +1335,7 @@ def mod_result(data_files: List, model_name_tc: str, mode: Literal["refinement",
                                 "Found null token, now trying to re-transcribe with whisper model"
                             )
                             try:
-                                transcribe_args = get_tc_args(model.transcribe, sj.cache)
+                                transcribe_args = get_tc_args(model.transcribe, sj.cache, model_name=model_name_tc)
                                 logger.info(f"Process Args: {transcribe_args}")
                                 result = model.transcribe(audio, **transcribe_args)
                                 update_q_process(
@@ -1333,9 +1491,7 @@ def translate_result(data_files: List, engine: str, lang_target: str):
             "debug_log": sj.cache["debug_translate"],
             "fail_status": fail_status
         }
-        if engine == "LibreTranslate":
-            tl_args["libre_link"] = sj.cache["libre_link"]
-            tl_args["libre_api_key"] = sj.cache["libre_api_key"]
+        tl_args.update(get_tl_args(engine, sj.cache))
 
         t_start = time()
         logger.info(f"Process Args: {tl_args}")
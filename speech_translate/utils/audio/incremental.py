@@ -0,0 +1,90 @@
+from typing import List, NamedTuple
+
+
+class TimedWord(NamedTuple):
+    """A transcribed word with its timestamps in seconds, relative to the start of the sentence"""
+    start: float
+    end: float
+    text: str
+
+
+def normalize_word(text: str) -> str:
+    """Normalize word for comparing hypotheses, so casing and punctuation changes do not block the agreement"""
+    return "".join(c for c in text.lower() if c.isalnum())
+
+
+class LocalAgreement:
+    """
+    Incremental transcript of a live sentence using the local agreement rule.
+
+    Each tick only the uncommitted tail of the audio is transcribed. The words of the new hypothesis are compared
+    against the hypothesis of the previous tick, the longest common prefix of both is considered stable and is
+    committed. The end timestamp of the last committed word tells how much audio can be trimmed from the front of
+    the buffer, so the next tick only needs to decode the audio after it.
+    """
+    def __init__(self, overlap: float = 0.1):
+        """
+        Parameters
+        ----------
+        overlap : float, optional
+            tolerance in seconds when dropping new words that overlap the committed part, by default 0.1
+        """
+        self.overlap = overlap
+        self.committed: List[TimedWord] = []
+        self.hypothesis: List[TimedWord] = []
+
+    @property
+    def committed_until(self) -> float:
+        """End time in seconds of the last committed word, relative to the start of the sentence"""
+        return self.committed[-1].end if self.committed else 0.0
+
+    @property
+    def committed_text(self) -> str:
+        return "".join(w.text for w in self.committed).strip()
+
+    @property
+    def tentative_text(self) -> str:
+        return "".join(w.text for w in self.hypothesis).strip()
+
+    @property
+    def text(self) -> str:
+        """Committed text followed by the tentative text of the latest hypothesis"""
+        return "".join(w.text for w in self.committed + self.hypothesis).strip()
+
+    def insert(self, result, offset: float) -> List[TimedWord]:
+        """Insert a new hypothesis and commit the words that agree with the previous one
+
+        Parameters
+        ----------
+        result : WhisperResult
+            stable-ts result of the transcribed tail, must contain word timestamps
+        offset : float
+            start time in seconds of the transcribed audio, relative to the start of the sentence
+
+        Returns
+        -------
+        List[TimedWord]
+            newly committed words
+        """
+        limit = self.committed_until - self.overlap
+        new = [
+            TimedWord(w.start + offset, w.end + offset, w.word) for w in result.all_words()
+            if w.start + offset >= limit
+        ]
+
+        agreed = 0
+        for prev, cur in zip(self.hypothesis, new):
+            if normalize_word(prev.text) != normalize_word(cur.text):
+                break
+            agreed += 1
+
+        commit = new[:agreed]
+        self.committed.extend(commit)
+        self.hypothesis = new[agreed:]
+
+        return commit
+
+    def reset(self) -> None:
+        """Reset for a new sentence"""
+        self.committed = []
+        self.hypothesis = []
@@ -0,0 +1,156 @@
+from threading import Condition, Thread
+from typing import Callable, Dict, List, Optional, Tuple
+
+from numpy import ndarray
+
+from speech_translate._constants import WHISPER_SR
+from speech_translate._logging import logger
+
+from .decoded_cache import decoded_cache
+
+
+def make_demucs_separator(device: Optional[str] = None) -> Optional[Callable[[ndarray], ndarray]]:
+    """Load the demucs model once and get a function to isolate the vocals of decoded audio
+
+    Parameters
+    ----------
+    device : Optional[str], optional
+        device to run demucs on, by default None (same default as stable ts)
+
+    Returns
+    -------
+    Optional[Callable[[ndarray], ndarray]]
+        function taking and returning 16kHz float32 audio, None if demucs can not be loaded
+    """
+    try:
+        from stable_whisper.audio import demucs_audio, load_demucs_model  # pylint: disable=import-outside-toplevel
+        model = load_demucs_model()
+    except Exception as e:
+        logger.exception(e)
+        logger.warning("Failed to load demucs for prefetching, demucs will run during transcription instead")
+        return None
+
+    def separate(audio: ndarray) -> ndarray:
+        return demucs_audio(audio, input_sr=WHISPER_SR, output_sr=WHISPER_SR, model=model, device=device, verbose=False)
+
+    return separate
+
+
+class AudioPrefetcher:
+    """
+    Decode the next files of a batch in the background so the model does not wait for ffmpeg (and demucs).
+
+    Files are decoded in order to 16kHz mono float32, at most `ahead` files past the latest requested file and at most
+    `max_seconds` of audio are kept decoded at the same time. The file list can grow while running, added files are
+    prefetched too.
+    """
+    def __init__(
+        self,
+        files: List[str],
+        ahead: int,
+        max_seconds: float,
+        is_running: Callable[[], bool],
+        separator: Optional[Callable[[ndarray], ndarray]] = None,
+    ):
+        """
+        Parameters
+        ----------
+        files : List[str]
+            path of the files, read by reference so added files are picked up
+        ahead : int
+            how many files to decode ahead of the latest requested file
+        max_seconds : float
+            maximum total duration of the decoded audio kept, a file is always decoded if nothing is kept
+        is_running : Callable[[], bool]
+            return False to stop prefetching (e.g. the process is cancelled)
+        separator : Optional[Callable[[ndarray], ndarray]], optional
+            demucs function to run on the decoded audio, by default None
+        """
+        self.files = files
+        self.ahead = ahead
+        self.max_seconds = max_seconds
+        self.is_running = is_running
+        self.separator = separator
+
+        self._cond = Condition()
+        self._ready: Dict[int, Tuple[Optional[ndarray], bool]] = {}
+        self._seconds = 0.0
+        self._next = 0  # next index to decode
+        self._requested = 0  # one past the latest requested index
+        self._stopped = False
+        self._thread = Thread(target=self._run, daemon=True)
+
+    def start(self) -> "AudioPrefetcher":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._ready.clear()
+            self._cond.notify_all()
+
+    def _active(self) -> bool:
+        return not self._stopped and self.is_running()
+
+    def _can_decode(self) -> bool:
+        """Must hold the lock"""
+        if self._next >= len(self.files) or self._next >= self._requested + self.ahead:
+            return False
+        return len(self._ready) == 0 or self._seconds < self.max_seconds
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._active() and not self._can_decode():
+                    self._cond.wait(0.5)  # timeout to notice added files and cancel
+                if not self._active():
+                    return
+                index = self._next
+                self._next += 1
+                file = self.files[index]
+
+            audio, separated = None, False
+            try:
+                # files decoded (and separated) on a previous run are read from the cache instead
+                audio = decoded_cache.load(file, self.separator)
+                separated = self.separator is not None
+            except Exception as e:
+                # the file is given as is to the model, it will show the error if there is any
+                logger.exception(e)
+                logger.warning(f"Failed to prefetch {file}")
+
+            with self._cond:
+                if self._stopped:
+                    return
+                self._ready[index] = (audio, separated)
+                if audio is not None:
+                    self._seconds += len(audio) / WHISPER_SR
+                self._cond.notify_all()
+
+    def get(self, index: int) -> Tuple[Optional[ndarray], bool]:
+        """Get the decoded audio of a file, waiting for it if it is not decoded yet. The audio is handed over and
+        not kept by the prefetcher anymore
+
+        Parameters
+        ----------
+        index : int
+            index of the file
+
+        Returns
+        -------
+        Tuple[Optional[ndarray], bool]
+            decoded audio (None if it failed or prefetching is stopped) and whether demucs has been run on it
+        """
+        with self._cond:
+            self._requested = max(self._requested, index + 1)
+            self._cond.notify_all()
+            while index not in self._ready and self._active():
+                self._cond.wait(0.5)
+
+            audio, separated = self._ready.pop(index, (None, False))
+            if audio is not None:
+                self._seconds -= len(audio) / WHISPER_SR
+            self._cond.notify_all()
+
+        return audio, separated
@@ -1,27 +1,25 @@
 # pylint: disable=global-variable-undefined
 import os
 from ast import literal_eval
-from datetime import datetime, timedelta
-from io import BytesIO
 from platform import system
+from queue import Full, Queue, SimpleQueue
 from shlex import quote
 from threading import Lock, Thread
 from time import gmtime, sleep, strftime, time
 from tkinter import IntVar, Toplevel, ttk
-from wave import Wave_read, Wave_write
+from typing import Union
+from wave import Wave_write
 from wave import open as w_open
 
-import numpy as np
 import requests
 import scipy.io.wavfile as wav
 import torch
 import torchaudio
-import webrtcvad
 from whisper.tokenizer import TO_LANGUAGE_CODE
 
 from speech_translate._constants import MAX_THRESHOLD, MIN_THRESHOLD, WHISPER_SR
 from speech_translate._logging import logger
-from speech_translate._path import dir_debug, dir_silero_vad, dir_temp, p_app_icon
+from speech_translate._path import dir_debug, dir_temp, p_app_icon
 from speech_translate.linker import bc, sj
 from speech_translate.ui.custom.audio import AudioMeter
 from speech_translate.ui.custom.checkbutton import CustomCheckButton
@@ -29,15 +27,22 @@ from speech_translate.ui.custom.label import LabelTitleText
 from speech_translate.ui.custom.message import mbox
 from speech_translate.ui.custom.spinbox import SpinboxNumOnly
 from speech_translate.ui.custom.tooltip import tk_tooltip
-from speech_translate.utils.audio.audio import get_db, get_frame_duration, get_speech_webrtc, resample_sr, to_silero
+from speech_translate.utils.audio.audio import ChunkAnalysis, Resampler, get_frame_duration, pcm_to_float32
+from speech_translate.utils.audio.buffer import AudioBuffer
 from speech_translate.utils.audio.device import get_device_details
+from speech_translate.utils.audio.incremental import LocalAgreement
+from speech_translate.utils.audio.scheduler import TickScheduler
+from speech_translate.utils.audio.vad import vad_registry
 from speech_translate.utils.translate.language import get_whisper_lang_name, get_whisper_lang_similar
+from speech_translate.utils.translate.live import LiveTranslationQueue
+from speech_translate.utils.translate.memory import normalize_text
 
 from ..helper import cbtn_invoker, generate_temp_filename, get_proxies, native_notify, str_separator_to_html, unique_rec_list
-from ..translate.translator import translate
+from ..translate.translator import get_tl_args, translate
 from ..whisper.helper import get_hallucination_filter, model_values, stablets_verbose_log
 from ..whisper.load import get_model, get_model_args, get_tc_args
 from ..whisper.result import remove_segments_by_str
+from ..whisper.shared_encoder import set_encoder_sharing
 
 if system() == "Windows":
     import pyaudiowpatch as pyaudio  # type: ignore # pylint: disable=import-error
@@ -46,6 +51,9 @@ else:
 
 ERROR_CON_NOTIFIED = False
 ERROR_CON_NOFIFIED_AMOUNT = 0
+BREAK_BUFFER = "break_buffer"  # marker passed through the pipeline stages when the buffer is broken
+STREAM_RESUMED = "stream_resumed"  # marker passed to the analysis thread when the stream is resumed
+MAX_ANALYSIS_BACKLOG_S = 2  # seconds of raw audio that can wait for the analysis before the oldest is dropped
 
 
 # -------------------------------------------------------------------------------------------------------------------------
@@ -90,6 +98,7 @@ def record_session(
     assert bc.mw is not None
     master = bc.mw.root
     root = None
+    models = []  # loaded models, their encoder sharing is turned off when the session ends
 
     # ----------------- Get device -----------------
     try:
@@ -97,7 +106,7 @@ def record_session(
             silero_min_conf, vad_checked, num_of_channels, prev_tc_res, prev_tl_res, max_db, min_db, \
             is_silence, was_recording, t_silence, samp_width, webrtc_vad, silero_vad, use_temp, \
             disable_silerovad, disable_auto_threshold, silero_disabled, ERROR_CON_NOTIFIED, \
-            ERROR_CON_NOFIFIED_AMOUNT
+            ERROR_CON_NOFIFIED_AMOUNT, resampler, raw_queue, overflow_count, dropped_count, max_backlog
 
         ERROR_CON_NOTIFIED = False
         ERROR_CON_NOFIFIED_AMOUNT = 0
@@ -111,7 +120,7 @@ def record_session(
         sr_ori = detail["sample_rate"]
         num_of_channels = detail["num_of_channels"]
         chunk_size = detail["chunk_size"]
-        transcribe_rate = timedelta(seconds=sj.cache["transcribe_rate"] / 1000)
+        transcribe_rate = sj.cache["transcribe_rate"] / 1000
         max_buffer_s = int(sj.cache.get(f"max_buffer_{rec_type}", 10))
         max_sentences = int(sj.cache.get(f"max_sentences_{rec_type}", 5))
         sentence_limitless = sj.cache.get(f"{rec_type}_no_limit", False)
@@ -254,6 +263,14 @@ def record_session(
         lbl_sentences = LabelTitleText(frame_lbl_3, "Sentences: ", "0/0")
         lbl_sentences.pack(side="left", fill="x", padx=5, pady=5)
 
+        lbl_overrun = LabelTitleText(frame_lbl_3, "Overruns: ", "0")
+        lbl_overrun.pack(side="left", fill="x", padx=5, pady=5)
+        tk_tooltip(
+            lbl_overrun,
+            "Amount of audio chunks lost because the input device or the audio analysis could not keep up. "
+            "If this keeps going up, try increasing the chunk size of the device.",
+        )
+
         # 4
         progress_buffer = ttk.Progressbar(frame_lbl_4, orient="horizontal", length=200, mode="determinate")
         progress_buffer.pack(side="left", fill="x", padx=5, pady=5, expand=True)
@@ -374,12 +391,11 @@ def record_session(
             pass
 
         # ----------------- Vars that is load after window to show loading -----------------
-        max_int16 = np.iinfo(np.int16).max  # bit depth of 16 bit audio (32768)
         separator = str_separator_to_html(literal_eval(quote(sj.cache["separate_with"])))
-        webrtc_vad = webrtcvad.Vad(sj.cache.get(f"threshold_auto_mode_{rec_type}", 3))
+        webrtc_vad = vad_registry.webrtc_vad(sj.cache.get(f"threshold_auto_mode_{rec_type}", 3))
         torchaudio.set_audio_backend("soundfile")
-        silero_vad, _ = torch.hub.load(repo_or_dir=dir_silero_vad, source="local", model="silero_vad", onnx=True)
-        silero_vad.reset_states()
+        silero_vad = vad_registry.silero_stream()  # already loaded if the setting page has been opened
+        resampler = Resampler(sr_ori, WHISPER_SR, num_of_channels)
 
         # cannot transcribe and translate concurrently. Will need to wait for the previous transcribe to finish
         if is_tc and is_tl and tl_engine_whisper:
@@ -390,9 +406,10 @@ def record_session(
         # ---- load model -----
         model_args = get_model_args(sj.cache)
         _model_tc, _model_tl, stable_tc, stable_tl, to_args = get_model(
-            is_tc, is_tl, tl_engine_whisper, model_name_tc, engine, sj.cache, **model_args
+            is_tc, is_tl, tl_engine_whisper, model_name_tc, engine, sj.cache, share_encoder=True, **model_args
         )
-        whisper_args = get_tc_args(to_args, sj.cache)
+        models = [m for m in (_model_tc, _model_tl) if m is not None]
+        whisper_args = get_tc_args(to_args, sj.cache, model_name=model_name_tc)
         whisper_args["verbose"] = None  # set to none so no printing of the progress to stdout
         whisper_lang = get_whisper_lang_similar(lang_source) if not auto else None
         whisper_args["language"] = TO_LANGUAGE_CODE[whisper_lang] if whisper_lang else None
@@ -407,12 +424,28 @@ def record_session(
 
         cuda_device = model_args["device"]
 
+        # ---- incremental transcription -----
+        # only re-decode the uncommitted tail of the buffer, committing words that agree across ticks
+        incremental = sj.cache["rec_incremental"] and is_tc
+        if incremental and is_tl and tl_engine_whisper:
+            logger.info("Incremental transcription is not used when translating with whisper (needs the full audio)")
+            incremental = False
+        if incremental and not whisper_args.get("word_timestamps", True):
+            logger.info("Incremental transcription needs word timestamps. Falling back to full buffer transcription")
+            incremental = False
+
         # ---- load hallucination filter -----
         if sj.cache["filter_rec"]:
             hallucination_filters = get_hallucination_filter('rec', sj.cache["path_filter_rec"])
         else:
             hallucination_filters = {}
 
+        # ---- preallocate audio buffer -----
+        # audio is resampled to WHISPER_SR in the callback unless using temp file
+        sr_divider = WHISPER_SR if not use_temp else sr_ori
+        # give some headroom for audio that keeps coming in while the buffer is being processed
+        audio_buffer = AudioBuffer(sr_divider, num_of_channels, max_buffer_s + 5)
+
         bc.mw.stop_lb(rec_type)
         logger.info("-" * 50)
         logger.info(f"Taskname: {taskname}")
@@ -422,6 +455,7 @@ def record_session(
         logger.info(f"Engine: {engine}")
         logger.info(f"CUDA: {cuda_device}")
         logger.info(f"Auto mode: {auto}")
+        logger.info(f"Incremental: {incremental}")
         logger.info(f"Whisper Lang/Key: {whisper_lang}/{whisper_args['language']}")
         logger.info(f"Source Languange: {lang_source}")
         if is_tl:
@@ -435,18 +469,18 @@ def record_session(
 
         t_start = time()
         paused = False
-        duration_seconds = 0
         bc.current_rec_status = "💤 Idle"
         bc.auto_detected_lang = "~"
 
         def stop_recording():
-            bc.recording = False  # only set flag to false because cleanup is handled directly down below
+            bc.disable_rec()  # only set flag to false because cleanup is handled directly down below
             btn_stop.configure(state="disabled", text="Stopping...")  # disable btn
             btn_pause.configure(state="disabled")
 
         def toggle_pause():
             nonlocal paused
             paused = not paused
+            rec_scheduler.wake()
             if paused:
                 if bc.stream:
                     bc.stream.stop_stream()
@@ -454,8 +488,8 @@ def record_session(
                 root.title(f"Recording {rec_type} (Paused)")
                 bc.current_rec_status = "⏸️ Paused"
                 update_status_lbl()
-                silero_vad.reset_states()
             else:
+                raw_queue.put(STREAM_RESUMED)  # stream is not continuous anymore
                 if bc.stream:
                     bc.stream.start_stream()
                 btn_pause.configure(text="Pause")
@@ -534,7 +568,7 @@ def record_session(
             use_silero = state
             logger.info(f"Silero VAD is {'enabled' if state else 'disabled'}")
             sj.save_key(f"threshold_auto_silero_{rec_type}", state)
-            silero_vad.reset_states()
+            silero_vad.reset()
             if state:
                 spn_silero_min_conf.pack(side="left", fill="x", padx=5, pady=5)
             else:
@@ -593,15 +627,17 @@ def record_session(
                         text=f"REC: {timer} | "
                         f"{language.replace('auto detect', f'auto detect ({bc.auto_detected_lang})') if auto else language}"
                     )
+                    buffer_seconds = audio_buffer.duration
                     lbl_buffer.set_text(
-                        f"{round(duration_seconds, 2)}/{round(max_buffer_s, 2)} sec (~{round(data_queue_size, 2)} kb)"
+                        f"{round(buffer_seconds, 2)}/{round(max_buffer_s, 2)} sec (~{round(data_queue_size, 2)} kb)"
                     )
                     sentence_text = f"{len(bc.tc_sentences) or len(bc.tl_sentences) or '0'}"
                     if not sentence_limitless:
                         sentence_text += f"/{max_sentences}"
                     lbl_sentences.set_text(sentence_text)
+                    lbl_overrun.set_text(overflow_count + dropped_count)
 
-                    progress_buffer["value"] = duration_seconds / max_buffer_s * 100
+                    progress_buffer["value"] = buffer_seconds / max_buffer_s * 100
                     update_status_lbl()
                     sleep(0.1)
                 except Exception as e:
@@ -626,6 +662,12 @@ def record_session(
         if not use_silero:
             spn_silero_min_conf.pack_forget()
         toggle_enable_threshold()
+
+        # the stream callback only queues the raw chunks, resampling, vad and metering is done in the analysis thread.
+        # Set before the ui thread starts, it shows the counters and pausing puts a marker in the queue
+        raw_queue = SimpleQueue()
+        overflow_count = 0  # only written by record_cb
+        dropped_count = 0  # only written by analysis_loop
         update_ui_thread = Thread(target=update_modal_ui, daemon=True)
         update_ui_thread.start()
 
@@ -637,10 +679,7 @@ def record_session(
         temp_list = []
         prev_tc_res = ""
         prev_tl_res = ""
-        next_transcribe_time = None
-        last_sample = bytes()
         samp_width = p.get_sample_size(pyaudio.paInt16)
-        sr_divider = WHISPER_SR if not use_temp else sr_ori
 
         # threshold
         is_silence = False
@@ -648,127 +687,118 @@ def record_session(
         t_silence = time()
         max_db = MAX_THRESHOLD
         min_db = MIN_THRESHOLD
-        bc.stream = p.open(
-            format=pyaudio.paInt16,  # 16 bit audio
-            channels=num_of_channels,
-            rate=sr_ori,
-            input=True,
-            frames_per_buffer=chunk_size,
-            input_device_index=int(device_detail["index"]),
-            stream_callback=record_cb,
-        )
+        rec_scheduler = TickScheduler(transcribe_rate)
+        bc.rec_scheduler = rec_scheduler
+
+        max_backlog = max(int(MAX_ANALYSIS_BACKLOG_S * sr_ori / chunk_size), 1)
+        analysis_thread = Thread(target=analysis_loop, daemon=True)
+        analysis_thread.start()
+        try:
+            bc.stream = p.open(
+                format=pyaudio.paInt16,  # 16 bit audio
+                channels=num_of_channels,
+                rate=sr_ori,
+                input=True,
+                frames_per_buffer=chunk_size,
+                input_device_index=int(device_detail["index"]),
+                stream_callback=record_cb,
+            )
+        except Exception:
+            raw_queue.put(None)  # stop the analysis thread, no audio will come
+            analysis_thread.join()
+            raise
 
         logger.debug("Recording session started")
 
-        def break_buffer_store_update():
+        # ----------------- Pipeline -----------------
+        # capture (this loop) -> transcribe (tc worker) -> translate (tl worker) -> ui (update_tc / update_tl)
+        # Each stage hands the tick to the next one through a bounded queue, so the next tick can be transcribed
+        # while the previous one is still being translated. Buffer breaks are passed through the same queues
+        # so every stage stores its result into the sentences in the same order as the ticks.
+        tc_queue: Queue = Queue(maxsize=1)
+        # If only translating and its using whisper engine, the audio goes straight to the translate stage.
+        # Otherwise only the newest text of the sentence waiting to be translated is kept, older ones are superseded
+        tl_first = is_tl and tl_engine_whisper and not is_tc
+        tl_queue: Union[Queue, LiveTranslationQueue] = Queue(maxsize=2)
+        if not tl_first and sj.cache["tl_live_latest_only"]:
+            tl_queue = LiveTranslationQueue(on_drop=lambda job: remove_temp(job[0]))
+        first_stage = tl_queue if tl_first else tc_queue
+        pending_audio = False  # audio in buffer that is not sent to the pipeline yet
+        # incremental mode, position of the buffer start in the current sentence and the trim requested by tc worker
+        transcript = LocalAgreement()
+        sentence_id = 0
+        buffer_offset = 0  # frames trimmed from the front of the buffer in the current sentence
+        trim_request = (0, 0.0)  # (sentence_id, committed until in seconds)
+
+        def put_stage(stage: Queue, item) -> bool:
             """
-            Break the buffer (last_sample). Resetting the buffer means that the buffer will be cleared and
-            it will be stored in the currently transcribed or translated text.
+            Put item to the stage queue, blocking while the stage is full. Gives up when the session is stopped.
             """
-            nonlocal last_sample, duration_seconds
-            last_sample = bytes()
-            duration_seconds = 0
+            while bc.recording:
+                try:
+                    stage.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    continue
+            return False
+
+        def remove_temp(audio_target):
+            if use_temp and not sj.cache["keep_temp"]:
+                try:
+                    os.remove(audio_target)
+                    temp_list.remove(audio_target)
+                except Exception:
+                    pass
 
+        def store_tc():
+            """
+            Store the currently transcribed text into the transcribed sentences
+            """
             # append if there is any text
             # remove text that is exactly the same because some dupe might accidentally happened
             # update only if there is any text
-            if is_tc:
-                if prev_tc_res:
-                    bc.tc_sentences.append(prev_tc_res)
-                bc.tc_sentences = unique_rec_list(bc.tc_sentences)
-                if not sentence_limitless and len(bc.tc_sentences) > max_sentences:
-                    bc.tc_sentences.pop(0)
-                if len(bc.tc_sentences) > 0:
-                    bc.update_tc(None, separator)
-            if is_tl:
-                if prev_tl_res:
-                    bc.tl_sentences.append(prev_tl_res)
-                bc.tl_sentences = unique_rec_list(bc.tl_sentences)
-                if not sentence_limitless and len(bc.tl_sentences) > max_sentences:
-                    bc.tl_sentences.pop(0)
-                if len(bc.tl_sentences) > 0:
-                    bc.update_tl(None, separator)
-
-        # transcribing loop
-        while bc.recording:
-            if paused:
-                sleep(0.1)
-                continue
-
-            if bc.data_queue.empty():
-                # no audio is being recorded, Could be because threshold is not met or because device is paused
-                # in case of speaker device, it will pause the stream  when the speaker is not playing anything
-                if auto_break_buffer:
-                    # if silence has been detected for more than 1 second, break the buffer (last_sample)
-                    if is_silence and time() - t_silence > 1:
-                        is_silence = False
-                        break_buffer_store_update()
-                        bc.current_rec_status = "💤 Idle (Buffer Cleared)"
-                        if sj.cache["debug_realtime_record"]:
-                            logger.debug("Silence found for more than 1 second. Buffer reseted")
-                continue
-
-            # update now if there is audio being recorded
-            now = datetime.utcnow()
-
-            # Set next_transcribe_time for the first time.
-            if not next_transcribe_time:  # run only once
-                next_transcribe_time = now + transcribe_rate
-
-            # Run transcription based on transcribe rate that is set by user.
-            # The more delay it have the more it will reduces stress on the GPU / CPU (if using cpu).
-            if next_transcribe_time > now:
-                continue
-
-            # update next_transcribe_time
-            next_transcribe_time = now + transcribe_rate
-
-            # Getting the stream data from the queue while also clearing the queue.
-            while not bc.data_queue.empty():
-                data = bc.data_queue.get()
-                last_sample += data
+            if prev_tc_res:
+                bc.tc_sentences.append(prev_tc_res)
+            bc.tc_sentences = unique_rec_list(bc.tc_sentences)
+            if not sentence_limitless and len(bc.tc_sentences) > max_sentences:
+                bc.tc_sentences.pop(0)
+            if len(bc.tc_sentences) > 0:
+                bc.update_tc(None, separator)
+
+        def store_tl():
+            """
+            Store the currently translated text into the translated sentences
+            """
+            if prev_tl_res:
+                bc.tl_sentences.append(prev_tl_res)
+            bc.tl_sentences = unique_rec_list(bc.tl_sentences)
+            if not sentence_limitless and len(bc.tl_sentences) > max_sentences:
+                bc.tl_sentences.pop(0)
+            if len(bc.tl_sentences) > 0:
+                bc.update_tl(None, separator)
+
+        def submit_buffer(block: bool) -> bool:
+            """
+            Send the current buffer (audio_buffer) to the first stage of the pipeline.
+            If not blocking and the previous tick is still waiting in the stage, the tick is skipped and its audio
+            will be included in the next tick instead.
+            """
+            nonlocal pending_audio
+            if not block and first_stage.full():
+                return False
 
-            if sj.cache["debug_realtime_record"]:
-                logger.info("Processing Audio")
+            if incremental:
+                trim_buffer()
+                if audio_buffer.duration < sj.cache.get(f"min_input_length_{rec_type}", 0.4):
+                    return False  # all committed, wait for more audio
 
-            # need to make temp in memory to make sure the audio will be read properly
-            wf = BytesIO()
-            wav_writer: Wave_write = w_open(wf, "wb")
-            wav_writer.setframerate(WHISPER_SR if not use_temp else sr_ori)
-            wav_writer.setsampwidth(samp_width)
-            wav_writer.setnchannels(num_of_channels)
-            wav_writer.writeframes(last_sample)
-            wav_writer.close()
-            wf.seek(0)
-
-            duration_seconds = len(last_sample) / (samp_width * sr_divider)
             if not use_temp:
-                # Read the audio data
-                wav_reader: Wave_read = w_open(wf)
-                samples = wav_reader.getnframes()
-                audio_bytes = wav_reader.readframes(samples)
-                wav_reader.close()
-
-                # Convert the wave data straight to a numpy array for the model.
-                audio_as_np_int16 = np.frombuffer(audio_bytes, dtype=np.int16).flatten()
-                audio_as_np_float32 = audio_as_np_int16.astype(np.float32)
-                if num_of_channels == 1:
-                    audio_np = audio_as_np_float32 / max_int16  # normalized as Numpy array
-                    if whisper_args["demucs"]:
-                        audio_target = torch.from_numpy(audio_np).to(cuda_device)  # convert to torch tensor
-                    else:
-                        audio_target = audio_np
+                # Convert the buffered pcm straight to a normalized numpy array for the model (left channel only)
+                audio_np = pcm_to_float32(audio_buffer.view(), num_of_channels)
+                if whisper_args["demucs"]:
+                    audio_target = torch.from_numpy(audio_np).to(cuda_device)  # convert to torch tensor
                 else:
-                    # Samples are interleaved, so for a stereo stream with left channel
-                    # of [L0, L1, L2, ...] and right channel of [R0, R1, R2, ...]
-                    # the output is ordered as [[L0, R0], [L1, R1], [L2, R2], ...
-                    chunk_length = len(audio_as_np_float32) / num_of_channels
-                    audio_reshaped = np.reshape(audio_as_np_float32, (int(chunk_length), num_of_channels))
-                    audio_np = audio_reshaped[:, 0] / max_int16  # take left channel only
-                    if whisper_args["demucs"]:
-                        audio_target = torch.from_numpy(audio_np).to(cuda_device)  # convert to torch tensor
-                    else:
-                        audio_target = audio_np
+                    audio_target = audio_np
 
                 if sj.cache["debug_recorded_audio"]:
                     wav.write(generate_temp_filename(dir_debug), WHISPER_SR, audio_np)
@@ -779,120 +809,267 @@ def record_session(
 
                 # block until the file is written
                 t_start_write = time()
-                with open(audio_target, "wb") as f:
-                    f.write(wf.getvalue())
+                wav_writer: Wave_write = w_open(audio_target, "wb")
+                wav_writer.setframerate(sr_ori)
+                wav_writer.setsampwidth(samp_width)
+                wav_writer.setnchannels(num_of_channels)
+                wav_writer.writeframes(audio_buffer.view())
+                wav_writer.close()
 
                 if sj.cache["debug_realtime_record"]:
                     logger.debug(f"File Write Time: {time() - t_start_write}")
 
-            # if duration is < 0.4 seconds, skip. Wait until more context is available
-            if duration_seconds < sj.cache.get(f"min_input_length_{rec_type}", 0.4):
-                if sj.cache["debug_realtime_record"]:
-                    logger.debug(f"Duration is {duration_seconds} seconds. Skipping")
-                continue
+            position = (sentence_id, buffer_offset / audio_buffer.sample_rate)
+            if not put_stage(first_stage, (audio_target, position)):
+                remove_temp(audio_target)
+                return False
 
-            # If only translating and its using whisper engine
-            if is_tl and tl_engine_whisper and not is_tc:
-                if sj.cache["debug_realtime_record"]:
-                    logger.info("Translating")
-                bc.current_rec_status = "▶️ Recording ⟳ Translating Audio"
-                bc.rec_tl_thread = Thread(
-                    target=run_whisper_tl,
-                    args=[audio_target, stable_tl, separator, False, hallucination_filters],
-                    kwargs=whisper_args,
-                    daemon=True
-                )
-                bc.rec_tl_thread.start()
-            else:
-                # will automatically check translate on or not depend on input
-                # translate is called from here because other engine need to get transcribed text first if translating
-                if sj.cache["debug_realtime_record"]:
-                    logger.info("Transcribing")
+            pending_audio = False
+            return True
+
+        def trim_buffer():
+            """
+            Trim the audio of the words that are already committed by the tc worker from the front of the buffer
+            """
+            nonlocal buffer_offset
+            trim_id, committed_until = trim_request
+            if trim_id != sentence_id:  # request from the previous sentence
+                return
 
-                bc.current_rec_status = "▶️ Recording ⟳ Transcribing Audio"
-                result = None
+            target = int(committed_until * audio_buffer.sample_rate)
+            if target > buffer_offset:
+                audio_buffer.consume(target - buffer_offset)
+                buffer_offset = target
 
-                def run_tc():
-                    nonlocal result
+        def break_buffer_store_update():
+            """
+            Break the buffer (audio_buffer). Resetting the buffer means that the buffer will be cleared and
+            it will be stored in the currently transcribed or translated text.
+            """
+            nonlocal pending_audio, sentence_id, buffer_offset
+            audio_buffer.clear()
+            pending_audio = False
+            sentence_id += 1
+            buffer_offset = 0
+            put_stage(first_stage, BREAK_BUFFER)
+
+        def tc_worker():
+            """
+            Transcribe stage, transcribe each tick and pass the text to the translate stage
+            """
+            global prev_tc_res
+            nonlocal trim_request
+            while True:
+                job = tc_queue.get()
+                if job is None:  # stop
+                    if is_tl:
+                        tl_queue.put(None)
+                    return
+
+                if job == BREAK_BUFFER:
+                    if is_tc:
+                        store_tc()
+                    if incremental:
+                        transcript.reset()
+                        prev_tc_res = ""
+                    if is_tl:
+                        tl_queue.put(job)
+                    continue
+
+                audio_target, (job_sentence_id, offset) = job
+                forwarded = False
+                try:
+                    if not bc.recording:  # stopped, drop the leftover ticks
+                        continue
+
+                    # will automatically check translate on or not depend on input
+                    # translate is called from here because other engine need to get transcribed text first
+                    if sj.cache["debug_realtime_record"]:
+                        logger.info("Transcribing")
+
+                    bc.current_rec_status = "▶️ Recording ⟳ Transcribing Audio"
                     if bc.tc_lock is not None:
                         with bc.tc_lock:
-                            result = stable_tc(  # type: ignore
-                                audio_target, task="transcribe", **whisper_args
-                            )
+                            result = stable_tc(audio_target, task="transcribe", **whisper_args)  # type: ignore
                     else:
-                        result = stable_tc(  # type: ignore
-                            audio_target, task="transcribe", **whisper_args
-                        )
-
-                # def run_tc
-                bc.rec_tc_thread = Thread(target=run_tc, args=[], daemon=True)
-                bc.rec_tc_thread.start()
-                bc.rec_tc_thread.join()
-
-                if result is None:
+                        result = stable_tc(audio_target, task="transcribe", **whisper_args)  # type: ignore
+
+                    if sj.cache["filter_rec"]:
+                        try:
+                            result = remove_segments_by_str(
+                                result,
+                                hallucination_filters[get_whisper_lang_name(result.language) \
+                                                      if auto else whisper_lang],
+                                sj.cache["filter_rec_case_sensitive"],
+                                sj.cache["filter_rec_strip"],
+                                sj.cache["filter_rec_ignore_punctuations"],
+                                sj.cache["filter_rec_exact_match"],
+                                sj.cache["filter_rec_similarity"],
+                                sj.cache["debug_realtime_record"],
+                            )
+                        except Exception as e:
+                            logger.exception(e)
+                            logger.error("Error in filtering hallucination")
+
+                    text = result.text.strip()
+                    bc.auto_detected_lang = result.language or "~"
+                    display = result
+
+                    if incremental:
+                        # commit the words that agree with the previous tick, the committed audio is trimmed
+                        # from the buffer before the next submit so only the uncommitted tail gets re-decoded
+                        committed = transcript.insert(result, offset)
+                        trim_request = (job_sentence_id, transcript.committed_until)
+                        text = display = transcript.text
+                        if committed and sj.cache["debug_realtime_record"]:
+                            logger.debug(f"Committed: {''.join(w.text for w in committed)}")
+
+                    if len(text) > 0:
+                        if sj.cache["debug_realtime_record"]:
+                            logger.debug("New text (Whisper)")
+                            if sj.cache["verbose_record"]:
+                                stablets_verbose_log(result)
+                            else:
+                                logger.debug(f"{text}")
+
+                        prev_tc_res = display
+                        bc.update_tc(display, separator)
+
+                        if is_tl:
+                            tl_queue.put((audio_target, text))
+                            forwarded = True
+                except Exception as e:
+                    logger.exception(e)
                     logger.warning("Transcribing failed, check log for details!")
+                finally:
+                    if not forwarded:
+                        remove_temp(audio_target)
+                    bc.current_rec_status = "▶️ Recording"  # reset status
+
+        def tl_worker():
+            """
+            Translate stage, translate each tick using whisper or translation API
+            """
+            last_text = None  # normalized text of the last translation in the current sentence
+            while True:
+                job = tl_queue.get()
+                if job is None:  # stop
+                    return
+
+                if job == BREAK_BUFFER:
+                    store_tl()
+                    last_text = None
                     continue
 
-                if sj.cache["filter_rec"]:
-                    try:
-                        result = remove_segments_by_str(
-                            result,
-                            hallucination_filters[get_whisper_lang_name(result.language) \
-                                                  if auto else whisper_lang],
-                            sj.cache["filter_rec_case_sensitive"],
-                            sj.cache["filter_rec_strip"],
-                            sj.cache["filter_rec_ignore_punctuations"],
-                            sj.cache["filter_rec_exact_match"],
-                            sj.cache["filter_rec_similarity"],
-                            sj.cache["debug_realtime_record"],
+                audio_target, text = job
+                try:
+                    if not bc.recording:  # stopped, drop the leftover ticks
+                        continue
+
+                    # same text as the last tick (only the audio grew), the translation would be the same.
+                    # whisper translate jobs carry the sentence position instead of a text, they are not compared
+                    if isinstance(tl_queue, LiveTranslationQueue) and not tl_engine_whisper:
+                        normalized = normalize_text(text)
+                        if normalized == last_text:
+                            tl_queue.unchanged += 1
+                            continue
+                        last_text = normalized
+
+                    if sj.cache["debug_realtime_record"]:
+                        logger.info("Translating")
+
+                    if tl_engine_whisper:
+                        bc.current_rec_status = "▶️ Recording ⟳ Translating Audio"
+                        run_whisper_tl(
+                            audio_target, stable_tl, separator, bc.tc_lock is not None, hallucination_filters,
+                            **whisper_args
                         )
-                    except Exception as e:
-                        logger.exception(e)
-                        logger.error("Error in filtering hallucination")
+                    else:
+                        bc.current_rec_status = "▶️ Recording ⟳ Translating text"
+                        tl_api(text, lang_source, lang_target, engine, separator)
+                except Exception as e:
+                    logger.exception(e)
+                    logger.warning("Translating failed, check log for details!")
+                finally:
+                    remove_temp(audio_target)
+                    bc.current_rec_status = "▶️ Recording"  # reset status
+
+        if first_stage is tc_queue:
+            bc.rec_tc_thread = Thread(target=tc_worker, daemon=True)
+            bc.rec_tc_thread.start()
+        if is_tl:
+            bc.rec_tl_thread = Thread(target=tl_worker, daemon=True)
+            bc.rec_tl_thread.start()
 
-                text = result.text.strip()
-                bc.auto_detected_lang = result.language or "~"
+        # transcribing loop
+        while bc.recording:
+            if paused:
+                rec_scheduler.wait_wake()  # until resumed or stopped
+                continue
 
-                if len(text) > 0:
-                    if sj.cache["debug_realtime_record"]:
-                        logger.debug("New text (Whisper)")
-                        if sj.cache["verbose_record"]:
-                            stablets_verbose_log(result)
-                        else:
-                            logger.debug(f"{text}")
+            # Run transcription based on transcribe rate that is set by user.
+            # The more delay it have the more it will reduces stress on the GPU / CPU (if using cpu).
+            # Block until a tick is due and there is audio, or until silence needs to be checked for breaking the buffer
+            silence_timeout = None
+            if auto_break_buffer and is_silence:
+                silence_timeout = max(0.0, 1 - (time() - t_silence))
 
-                    prev_tc_res = result
-                    bc.update_tc(result, separator)
+            if not rec_scheduler.wait_tick(silence_timeout) or bc.data_queue.empty():
+                # no audio is being recorded, Could be because threshold is not met or because device is paused
+                # in case of speaker device, it will pause the stream  when the speaker is not playing anything
+                if auto_break_buffer and bc.data_queue.empty():
+                    # if silence has been detected for more than 1 second, break the buffer (audio_buffer)
+                    if is_silence and time() - t_silence > 1:
+                        is_silence = False
+                        # make sure audio from skipped ticks gets processed before the break
+                        if pending_audio and audio_buffer.duration >= sj.cache.get(f"min_input_length_{rec_type}", 0.4):
+                            submit_buffer(block=True)
+                        break_buffer_store_update()
+                        bc.current_rec_status = "💤 Idle (Buffer Cleared)"
+                        if sj.cache["debug_realtime_record"]:
+                            logger.debug("Silence found for more than 1 second. Buffer reseted")
+                continue
 
-                    if is_tl:
-                        bc.current_rec_status = "▶️ Recording ⟳ Translating text"
-                        if tl_engine_whisper:
-                            bc.rec_tl_thread = Thread(
-                                target=run_whisper_tl,
-                                args=[audio_target, stable_tl, separator, True, hallucination_filters],
-                                kwargs=whisper_args,
-                                daemon=True
-                            )
-                        else:
-                            bc.rec_tl_thread = Thread(
-                                target=tl_api, args=[text, lang_source, lang_target, engine, separator], daemon=True
-                            )
+            # Getting the stream data from the queue while also clearing the queue.
+            while not bc.data_queue.empty():
+                audio_buffer.append(bc.data_queue.get())
+            pending_audio = True
 
-                        bc.rec_tl_thread.start()
-                        bc.rec_tl_thread.join()
+            if sj.cache["debug_realtime_record"]:
+                logger.info("Processing Audio")
 
-            if use_temp and not sj.cache["keep_temp"]:
-                os.remove(audio_target)  # type: ignore
-                temp_list.remove(audio_target)
+            # if duration is < 0.4 seconds, skip. Wait until more context is available
+            duration_seconds = audio_buffer.duration
+            if duration_seconds < sj.cache.get(f"min_input_length_{rec_type}", 0.4):
+                if sj.cache["debug_realtime_record"]:
+                    logger.debug(f"Duration is {duration_seconds} seconds. Skipping")
+                continue
 
             # break up the buffer If we've reached max recording time
-            if duration_seconds > max_buffer_s:
+            # the last tick of the buffer must not be skipped, so wait for the stage to be free
+            # in incremental mode, the trimmed audio still counts for the sentence length
+            buffer_full = duration_seconds + buffer_offset / audio_buffer.sample_rate > max_buffer_s
+            submit_buffer(block=buffer_full)
+            if buffer_full:
                 break_buffer_store_update()
 
-            bc.current_rec_status = "▶️ Recording"  # reset status
+        # stop the pipeline, ticks that are still queued are dropped
+        while not first_stage.empty():
+            job = first_stage.get()
+            if isinstance(job, tuple):
+                remove_temp(job[0])
+        first_stage.put(None)
+        for worker in (bc.rec_tc_thread, bc.rec_tl_thread):
+            if worker is not None and worker.is_alive():
+                worker.join()
 
         # ----------------- End recording -----------------
         logger.debug("Stopping Record Session")
+        if isinstance(tl_queue, LiveTranslationQueue) and tl_queue.saved > 0:
+            logger.info(
+                f"Live translation skipped {tl_queue.saved} translations ({tl_queue.superseded} superseded by a newer "
+                f"text, {tl_queue.unchanged} with unchanged text)"
+            )
 
         bc.current_rec_status = "⚠️ Stopping stream"
         update_status_lbl()
@@ -901,8 +1078,11 @@ def record_session(
         bc.stream.stop_stream()
         bc.stream.close()
         bc.stream = None
+        raw_queue.put(None)
+        analysis_thread.join()
         bc.rec_tc_thread = None
         bc.rec_tl_thread = None
+        bc.rec_scheduler = None
 
         bc.current_rec_status = "⚠️ Terminating pyaudio"
         update_status_lbl()
@@ -954,36 +1134,79 @@ def record_session(
         if root and root.winfo_exists():
             root.destroy()  # close if not destroyed
     finally:
+        # the models stay in the model cache, file import and the next session should not keep the encoder memo
+        for model in models:
+            set_encoder_sharing(model, False)
+        models.clear()
         torch.cuda.empty_cache()
         logger.info("Record session ended")
 
 
-def record_cb(in_data, _frame_count, _time_info, _status):
+def record_cb(in_data, _frame_count, _time_info, status):
+    """
+    Record Audio From stream buffer and hand it to the analysis thread.
+    Only the raw chunk is queued (SimpleQueue.put never blocks) so the callback returns right away
+    """
+    global overflow_count
+    if status & pyaudio.paInputOverflow:
+        overflow_count += 1
+
+    raw_queue.put(in_data)
+    return (in_data, pyaudio.paContinue)
+
+
+def analysis_loop():
+    """
+    Analyze the raw chunks queued by record_cb until the None sentinel is received
+    """
+    global dropped_count
+    while True:
+        in_data = raw_queue.get()
+        if in_data is None:
+            return
+
+        if in_data is STREAM_RESUMED:
+            resampler.reset()
+            silero_vad.reset()
+            continue
+
+        # drop the chunk if the analysis can not keep up, so the vad stays close to the live audio
+        if raw_queue.qsize() > max_backlog:
+            dropped_count += 1
+            resampler.reset()  # stream is not continuous anymore
+            continue
+
+        analyze_chunk(in_data)
+
+
+def analyze_chunk(in_data: bytes):
     """
-    Record Audio From stream buffer and save it to queue in global class
+    Resample the chunk and save it to queue in global class
     Will also check for sample rate and threshold setting 
     """
     global frame_duration_ms, max_db, min_db, is_silence, t_silence, was_recording, vad_checked
 
     try:
-        # Run resample and use resampled audio if not using temp file
-        resampled = resample_sr(in_data, sr_ori, WHISPER_SR)
+        # Decode the chunk once, db, resampled audio and vad input are all served from the same analysis.
+        # Everything is computed lazily, so when use_temp the resampling only runs if the vad needs it
+        chunk = ChunkAnalysis(in_data, num_of_channels, resampler)
         if not use_temp:  # when use_temp will use the original audio
-            in_data = resampled
+            in_data = chunk.resampled_bytes
 
         # run vad at least once to check if it is possible to use with current device config
         if not vad_checked:
             vad_checked = True
             logger.debug("Checking if webrtcvad is possible to use. You can ignore the error log if it fails!")
-            get_speech_webrtc(resampled, WHISPER_SR, frame_duration_ms, webrtc_vad)
+            chunk.is_speech_webrtc(frame_duration_ms, webrtc_vad)
             logger.debug("Checking if silero is possible to use. You can ignore the error log if it fails!")
-            silero_vad(to_silero(resampled, num_of_channels, samp_width), WHISPER_SR)
+            silero_vad(chunk.silero)
 
         if not threshold_enable:
             bc.data_queue.put(in_data)  # record regardless of db
+            bc.rec_scheduler.notify_audio()  # type: ignore
         else:
             # only record if db is above threshold
-            db = get_db(in_data)
+            db = chunk.db
             audiometer.set_db(db)
 
             if db > max_db:
@@ -995,10 +1218,10 @@ def record_cb(in_data, _frame_count, _time_info, _status):
 
             # using vad
             if threshold_auto:
-                is_speech = get_speech_webrtc(resampled, WHISPER_SR, frame_duration_ms, webrtc_vad)
-                if use_silero and is_speech and not silero_disabled:  # double check with silero if enabled
-                    conf: torch.Tensor = silero_vad(to_silero(resampled, num_of_channels, samp_width), WHISPER_SR)
-                    is_speech = conf.item() >= silero_min_conf
+                is_speech = chunk.is_speech_webrtc(frame_duration_ms, webrtc_vad)
+                if use_silero and not silero_disabled:
+                    # double check with silero if enabled. Silero is fed every chunk so its state follows the stream
+                    is_speech = silero_vad.is_speech(chunk.silero, silero_min_conf) and is_speech
 
                 audiometer.set_recording(is_speech)
             else:
@@ -1006,6 +1229,7 @@ def record_cb(in_data, _frame_count, _time_info, _status):
 
             if is_speech:
                 bc.data_queue.put(in_data)
+                bc.rec_scheduler.notify_audio()  # type: ignore
                 was_recording = True
             else:
                 bc.current_rec_status = "💤 Idle"
@@ -1014,8 +1238,9 @@ def record_cb(in_data, _frame_count, _time_info, _status):
                     if not is_silence:  # mark as silence if not already marked
                         is_silence = True
                         t_silence = time()
+                        bc.rec_scheduler.wake()  # type: ignore # so the silence timeout can start
 
-        return (in_data, pyaudio.paContinue)
+        return
     except Exception as e:
         logger.exception(e)
         logger.error("Error in record_cb")
@@ -1037,7 +1262,7 @@ def record_cb(in_data, _frame_count, _time_info, _status):
             disable_silerovad()  # pylint: disable=undefined-variable
             logger.warning("Not possible to use Silero VAD with the current device config! So it is now disabled")
 
-        return (in_data, pyaudio.paContinue)
+        return
 
 
 def run_whisper_tl(audio, stable_tl, separator: str, with_lock, hallucination_filters, **whisper_args):
@@ -1085,10 +1310,7 @@ def tl_api(text: str, lang_source: str, lang_target: str, engine: str, separator
         debug_log = sj.cache["debug_translate"]
         proxies = get_proxies(sj.cache["http_proxy"], sj.cache["https_proxy"])
         q = [text]
-        kwargs = {"live_input": True}
-        if engine == "LibreTranslate":
-            kwargs["libre_link"] = sj.cache["libre_link"]  # type: ignore
-            kwargs["libre_api_key"] = sj.cache["libre_api_key"]  # type: ignore
+        kwargs = {"live_input": True, **get_tl_args(engine, sj.cache)}
 
         success, result = translate(engine, q, lang_source, lang_target, proxies, debug_log, **kwargs)
         if not success:
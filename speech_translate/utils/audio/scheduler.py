@@ -0,0 +1,91 @@
+from threading import Condition
+from time import monotonic
+from typing import Optional
+
+
+class TickScheduler:
+    """
+    Scheduler for the transcription loop of a record session.
+
+    Instead of spinning until the next transcription tick, the loop blocks on a condition until a tick is due
+    and there is new audio available. The audio callback notifies the scheduler when new audio is queued and the
+    session can wake the loop up early (on silence, pause, or stop) so it can react to it right away.
+    """
+    def __init__(self, rate: float):
+        """
+        Parameters
+        ----------
+        rate : float
+            minimum interval between each transcription tick in seconds
+        """
+        self.rate = rate
+        self._cond = Condition()
+        self._has_audio = False
+        self._woken = False
+        self._next_tick: Optional[float] = None
+
+    def notify_audio(self) -> None:
+        """Notify that new audio is available"""
+        with self._cond:
+            self._has_audio = True
+            self._cond.notify_all()
+
+    def wake(self) -> None:
+        """Wake up the waiting loop, the wait will return False"""
+        with self._cond:
+            self._woken = True
+            self._cond.notify_all()
+
+    def wait_tick(self, timeout: Optional[float] = None) -> bool:
+        """Block until a transcription tick is due and there is new audio available.
+
+        The first tick is due one rate after the first audio is available, and each tick schedules the next
+        one a rate later, the same way as comparing against the next transcribe time on every loop.
+
+        Parameters
+        ----------
+        timeout : Optional[float], optional
+            maximum time to wait in seconds, by default None (wait until tick is due or woken up)
+
+        Returns
+        -------
+        bool
+            True if a tick is due, False if the wait timed out or was woken up
+        """
+        deadline = None if timeout is None else monotonic() + timeout
+        with self._cond:
+            while not self._woken:
+                now = monotonic()
+                wake_at = None
+                if self._has_audio:
+                    if self._next_tick is None:  # set for the first time
+                        self._next_tick = now + self.rate
+
+                    if now >= self._next_tick:
+                        self._next_tick = now + self.rate
+                        self._has_audio = False
+                        return True
+
+                    wake_at = self._next_tick
+
+                if deadline is not None:
+                    if now >= deadline:
+                        return False
+                    wake_at = deadline if wake_at is None else min(wake_at, deadline)
+
+                self._cond.wait(None if wake_at is None else wake_at - now)
+
+            self._woken = False
+            return False
+
+    def wait_wake(self, timeout: Optional[float] = None) -> None:
+        """Block until woken up, ignoring new audio. Used while the session is paused
+
+        Parameters
+        ----------
+        timeout : Optional[float], optional
+            maximum time to wait in seconds, by default None
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._woken, timeout)
+            self._woken = False
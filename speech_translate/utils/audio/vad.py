@@ -0,0 +1,154 @@
+from copy import copy
+from threading import Lock
+
+import numpy as np
+import torch
+from numpy import float32, ndarray
+from webrtcvad import Vad
+
+from speech_translate._constants import WHISPER_SR
+from speech_translate._logging import logger
+from speech_translate._path import dir_silero_vad
+
+
+class SileroStream:
+    """
+    Streaming wrapper for the silero vad model.
+
+    Silero is made to be run on fixed windows of 512 samples (at 16kHz) while keeping its recurrent state between
+    windows. Audio of any length is accumulated and only complete windows are passed to the model, the leftover is
+    kept for the next call. This way silero works with any device chunk size and the cost is fixed per second of audio.
+    """
+    WINDOW_SIZE = 512
+
+    def __init__(self, model, sample_rate: int = WHISPER_SR):
+        """
+        Parameters
+        ----------
+        model : OnnxWrapper
+            silero vad model loaded from torch hub
+        sample_rate : int, optional
+            sample rate of the audio, by default WHISPER_SR
+        """
+        self.model = model
+        self.sample_rate = sample_rate
+        self.last_prob = 0.0
+        self._pending = np.zeros(0, dtype=float32)
+
+    def reset(self) -> None:
+        """Reset the model state and drop the accumulated audio, used when the stream is not continuous anymore"""
+        self.model.reset_states()
+        self.last_prob = 0.0
+        self._pending = np.zeros(0, dtype=float32)
+
+    def __call__(self, audio: ndarray) -> ndarray:
+        """Feed audio to the model
+
+        Parameters
+        ----------
+        audio : np.ndarray
+            mono float32 audio in the range of -1.0 to 1.0
+
+        Returns
+        -------
+        np.ndarray
+            speech probability of every window completed by this audio, can be empty
+        """
+        buf = np.concatenate([self._pending, audio]) if len(self._pending) > 0 else audio
+        n_windows = len(buf) // self.WINDOW_SIZE
+        probs = np.empty(n_windows, dtype=float32)
+        for i in range(n_windows):
+            window = buf[i * self.WINDOW_SIZE:(i + 1) * self.WINDOW_SIZE]
+            probs[i] = self.model(torch.from_numpy(np.ascontiguousarray(window)), self.sample_rate).item()
+
+        self._pending = buf[n_windows * self.WINDOW_SIZE:].copy()
+        if n_windows > 0:
+            self.last_prob = float(probs[-1])
+
+        return probs
+
+    def is_speech(self, audio: ndarray, min_conf: float) -> bool:
+        """Feed audio to the model and check if it contains speech
+
+        When the audio does not complete a window, the probability of the last window is used.
+
+        Parameters
+        ----------
+        audio : np.ndarray
+            mono float32 audio in the range of -1.0 to 1.0
+        min_conf : float
+            minimum speech probability to be considered as speech
+
+        Returns
+        -------
+        bool
+            True if any of the completed windows (or the last window) is speech
+        """
+        probs = self(audio)
+        conf = float(probs.max()) if len(probs) > 0 else self.last_prob
+        return conf >= min_conf
+
+
+class VadRegistry:
+    """
+    Process wide registry of the vad models.
+
+    The silero onnx model is loaded lazily once and shared by every stream (setting page meters and record sessions).
+    Each stream gets its own handle that shares the onnx session but has its own recurrent state, so streams that
+    run at the same time do not mix their states and memory does not grow with the amount of streams.
+    """
+    def __init__(self):
+        self._lock = Lock()
+        self._silero_model = None
+
+    def silero_model(self):
+        """Get the shared silero model, loading it on first use
+
+        Returns
+        -------
+        OnnxWrapper
+            silero vad model
+        """
+        with self._lock:
+            if self._silero_model is None:
+                logger.debug("Loading silero vad model")
+                self._silero_model, _ = torch.hub.load(
+                    repo_or_dir=dir_silero_vad, source="local", model="silero_vad", onnx=True
+                )
+            return self._silero_model
+
+    def silero_stream(self, sample_rate: int = WHISPER_SR) -> SileroStream:
+        """Get a new silero stream handle with its own state
+
+        Parameters
+        ----------
+        sample_rate : int, optional
+            sample rate of the audio, by default WHISPER_SR
+
+        Returns
+        -------
+        SileroStream
+            streaming silero vad sharing the onnx session of the registry
+        """
+        # shallow copy shares the onnx session, reset_states rebinds the state so it is not shared
+        handle = copy(self.silero_model())
+        handle.reset_states()
+        return SileroStream(handle, sample_rate)
+
+    def webrtc_vad(self, mode: int = 3) -> Vad:
+        """Get a new webrtc vad handle. Webrtc vad has no model to load, only a small state per stream
+
+        Parameters
+        ----------
+        mode : int, optional
+            aggressiveness mode, by default 3
+
+        Returns
+        -------
+        Vad
+            webrtc vad
+        """
+        return Vad(mode)
+
+
+vad_registry = VadRegistry()
@@ -51,6 +51,10 @@ default_setting: SettingDict = {
     "dir_log": "auto",
     "dir_model": "auto",
     "auto_verify_model_on_first_setting_open": False,
+    "model_cache_budget_mb": 4096,  # memory for keeping loaded models between sessions, 0 to always reload
+    "prewarm_model": False,
+    "prewarm_dummy_decode": False,
+    "cpu_autotune": False,
     "file_slice_start": "",  # empty will be read as None
     "file_slice_end": "",  # empty will be read as None
     # ------------------ #
@@ -71,6 +75,21 @@ default_setting: SettingDict = {
     "supress_libre_api_key_warning": False,
     "libre_api_key": "",
     "libre_link": "",
+    "libre_batch_size": 50,  # texts sent in one request, 1 to send one by one
+    "libre_batch_chars": 5000,
+    "libre_pool_size": 4,
+    # concurrent requests and requests per second (0 for no limit) of each translation engine
+    "tl_workers_google": 4,
+    "tl_rate_google": 5,
+    "tl_workers_mymemory": 2,
+    "tl_rate_mymemory": 2,
+    "tl_workers_libre": 4,
+    "tl_rate_libre": 0,
+    "tl_pack_segments": True,  # send several segments in one google / mymemory request
+    "tl_memory": True,  # reuse translations of texts that were already translated
+    "tl_memory_fuzzy": 0,  # minimum similarity in percent to reuse the translation of a similar text, 0 to disable
+    "tl_memory_max_entries": 100000,
+    "tl_live_latest_only": True,  # record session only translates the newest text, skipping superseded ones
     # ------------------ #
     # Record settings
     "rec_ask_confirmation_first": True,
@@ -156,9 +175,16 @@ default_setting: SettingDict = {
     "segment_level": True,  # 1 of this must be true
     "word_level": True,  # 1 of this must be true
     "visualize_suppression": False,
+    "file_workers": 1,  # files processed at the same time
+    "file_prefetch": 2,  # files decoded ahead, 0 to disable
+    "file_prefetch_max_s": 3600,  # maximum seconds of decoded audio kept ahead
+    "file_prefetch_demucs": False,
+    "decoded_cache_mb": 2048,  # disk space for decoded audio of imported files, 0 to disable
+    "result_cache": True,  # reuse the whisper result of files imported again with the same settings
     "use_faster_whisper": True,
     "use_en_model": True,
     "transcribe_rate": 300,
+    "rec_incremental": False,
     # option for some DecodingOptions that is not available in the command line parameter is moved to the gui
     "decoding_preset": "beam search",  # greedy, beam search, custom
     "temperature": "0.0, 0.2, 0.4, 0.6, 0.8, 1.0",  # 0.0 - 1.0
@@ -0,0 +1,183 @@
+import random
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from time import monotonic, sleep
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class RetryableError(Exception):
+    """Raised by a task when it failed in a way that might succeed if tried again (connection error, rate limited)"""
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter, shared by every thread that sends requests to the same engine.
+
+    Tokens are refilled continuously at `rate` per second up to `burst`, each request takes one token and waits
+    when there is none left.
+    """
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Parameters
+        ----------
+        rate : float
+            requests per second, 0 or less for no limit
+        burst : Optional[float], optional
+            maximum tokens kept, by default the same as rate (at least 1)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._last = monotonic()
+        self._lock = Lock()
+
+    def acquire(self) -> None:
+        """Take a token, waiting until one is available"""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+
+            sleep(wait)
+
+
+class TranslationExecutor:
+    """
+    Run the requests of an engine concurrently with a concurrency limit and a rate limit, retrying failed requests
+    with jittered exponential backoff. Results are returned in the order of the input.
+
+    The limits are shared by every caller of the same engine, so several files translated at the same time do not go
+    over them together.
+    """
+    def __init__(
+        self, max_workers: int, rate: float, retries: int = 3, base_delay: float = 0.5, max_delay: float = 8.0
+    ):
+        """
+        Parameters
+        ----------
+        max_workers : int
+            maximum requests running at the same time
+        rate : float
+            maximum requests started per second, 0 or less for no limit
+        retries : int, optional
+            times a failed request is tried again, by default 3
+        base_delay : float, optional
+            delay before the first retry in seconds, doubled on every retry, by default 0.5
+        max_delay : float, optional
+            maximum delay before a retry in seconds, by default 8.0
+        """
+        self.max_workers = max(1, max_workers)
+        self.rate = rate
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._slots = BoundedSemaphore(self.max_workers)
+        self._bucket = TokenBucket(rate)
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before a retry, full jitter so requests that failed together do not retry together"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+    def _run_one(self, func: Callable[[T], R], item: T) -> R:
+        attempt = 0
+        while True:
+            with self._slots:
+                self._bucket.acquire()
+                try:
+                    return func(item)
+                except RetryableError as e:
+                    if attempt >= self.retries:
+                        raise
+                    delay = self.backoff(attempt)
+                    logger.warning(f"Translation request failed ({e}), retrying in {delay:.2f}s")
+
+            attempt += 1
+            sleep(delay)  # outside the slot so other requests can run meanwhile
+
+    def map(self, func: Callable[[T], R], items: List[T], on_done: Optional[Callable[[T], None]] = None) -> List[R]:
+        """Run func on every item
+
+        Parameters
+        ----------
+        func : Callable[[T], R]
+            task to run, raise RetryableError to have it retried
+        items : List[T]
+            inputs of the task
+        on_done : Optional[Callable[[T], None]], optional
+            called with the item when its task is done, by default None
+
+        Returns
+        -------
+        List[R]
+            results in the same order as items
+
+        Raises
+        ------
+        Exception
+            the error of the first failed task (after its retries), the remaining tasks are cancelled
+        """
+        if len(items) <= 1 or self.max_workers == 1:
+            results = []
+            for item in items:
+                results.append(self._run_one(func, item))
+                if on_done:
+                    on_done(item)
+            return results
+
+        def task(item: T) -> R:
+            result = self._run_one(func, item)
+            if on_done:
+                on_done(item)
+            return result
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            futures = [pool.submit(task, item) for item in items]
+            try:
+                return [future.result() for future in futures]
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+
+EXECUTORS: Dict[str, TranslationExecutor] = {}
+EXECUTORS_LOCK = Lock()
+
+
+def get_executor(engine: str, max_workers: int, rate: float) -> TranslationExecutor:
+    """Get the shared executor of an engine, made again if the limits changed
+
+    Parameters
+    ----------
+    engine : str
+        name of the engine
+    max_workers : int
+        maximum requests running at the same time
+    rate : float
+        maximum requests started per second, 0 or less for no limit
+
+    Returns
+    -------
+    TranslationExecutor
+        the executor
+    """
+    with EXECUTORS_LOCK:
+        executor = EXECUTORS.get(engine)
+        if executor is None or executor.max_workers != max(1, max_workers) or executor.rate != rate:
+            executor = TranslationExecutor(max_workers, rate)
+            EXECUTORS[engine] = executor
+
+    return executor
@@ -0,0 +1,58 @@
+from collections import deque
+from threading import Condition
+from typing import Any, Callable, Deque, Optional
+
+
+class LiveTranslationQueue:
+    """
+    Translate stage queue of the record session where the newest text wins.
+
+    Every transcription tick sends the whole current text of the sentence, which the next tick usually revises.
+    A tick that is still waiting when a newer one of the same sentence arrives is dropped, so a slow engine only
+    translates the latest text instead of falling behind. Markers (buffer break, stop) are never dropped and keep their
+    order, the tick before a marker is the final text of its sentence so it is always translated.
+
+    Putting never blocks, so the transcribe stage is not held back by the translation.
+    """
+    def __init__(self, on_drop: Optional[Callable[[Any], None]] = None):
+        """
+        Parameters
+        ----------
+        on_drop : Optional[Callable[[Any], None]], optional
+            called with a job that is dropped because a newer one replaced it (e.g. to remove its temp audio),
+            by default None
+        """
+        self.on_drop = on_drop
+        self.superseded = 0  # ticks dropped because a newer one came before they were translated
+        self.unchanged = 0  # ticks skipped because the text did not change since the last translation
+        self._jobs: Deque[Any] = deque()
+        self._cond = Condition()
+
+    def put(self, item: Any) -> None:
+        """Add a job (tuple) or a marker, a job replaces the job waiting after the last marker"""
+        dropped = None
+        with self._cond:
+            if isinstance(item, tuple) and self._jobs and isinstance(self._jobs[-1], tuple):
+                dropped = self._jobs.pop()
+                self.superseded += 1
+            self._jobs.append(item)
+            self._cond.notify()
+
+        if dropped is not None and self.on_drop is not None:
+            self.on_drop(dropped)
+
+    def get(self) -> Any:
+        """Take the oldest job or marker, waiting for one"""
+        with self._cond:
+            while not self._jobs:
+                self._cond.wait()
+            return self._jobs.popleft()
+
+    def empty(self) -> bool:
+        with self._cond:
+            return not self._jobs
+
+    @property
+    def saved(self) -> int:
+        """Translations that did not need to run"""
+        return self.superseded + self.unchanged
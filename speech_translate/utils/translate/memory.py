@@ -0,0 +1,187 @@
+import os
+import sqlite3
+import unicodedata
+from difflib import SequenceMatcher
+from threading import Lock
+from time import time
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from speech_translate._path import p_translation_memory
+
+FUZZY_CANDIDATES = 200  # closest length entries compared for a fuzzy match
+
+
+def normalize_text(text: str) -> str:
+    """Normalize a text for lookup, so the same sentence with different spacing or unicode form matches"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TranslationMemory:
+    """
+    Persistent translation memory stored in SQLite.
+
+    Translations are keyed by (engine, source language, target language, normalized text). Texts that were already
+    translated are taken from the memory instead of being sent to the engine, optionally also texts that are similar
+    enough to a translated one (fuzzy match). When there are more than `max_entries` translations, the least recently
+    used ones are deleted.
+    """
+    def __init__(self, path: str = p_translation_memory, max_entries: int = 100_000):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            path of the database, by default p_translation_memory
+        max_entries : int, optional
+            maximum translations kept, by default 100_000
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._con: Optional[sqlite3.Connection] = None
+        self._count = 0  # stored translations, counted once on open then kept up to date on every write
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use, must hold the lock"""
+        if self._con is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._con = sqlite3.connect(self.path, check_same_thread=False)
+            self._con.execute(
+                "CREATE TABLE IF NOT EXISTS tm ("
+                "engine TEXT, source TEXT, target TEXT, text TEXT, translation TEXT, length INTEGER, "
+                "last_used REAL, PRIMARY KEY (engine, source, target, text))"
+            )
+            self._con.execute("CREATE INDEX IF NOT EXISTS tm_length ON tm (engine, source, target, length)")
+            self._con.execute("CREATE INDEX IF NOT EXISTS tm_last_used ON tm (last_used)")
+            self._con.commit()
+            self._count = self._con.execute("SELECT COUNT(*) FROM tm").fetchone()[0]
+
+        return self._con
+
+    def _fuzzy(self, con: sqlite3.Connection, key: Tuple[str, str, str], text: str, threshold: float) -> Optional[str]:
+        """Find the translation of the most similar text above the threshold, must hold the lock"""
+        length = len(text)
+        # texts with a length too different can not reach the threshold
+        margin = int(length * (1 - threshold)) + 1
+        rows = con.execute(
+            "SELECT text, translation FROM tm WHERE engine = ? AND source = ? AND target = ? "
+            "AND length BETWEEN ? AND ? ORDER BY ABS(length - ?) LIMIT ?",
+            (*key, length - margin, length + margin, length, FUZZY_CANDIDATES),
+        ).fetchall()
+
+        best, best_ratio = None, threshold
+        for candidate, translation in rows:
+            ratio = SequenceMatcher(None, text, candidate).ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = translation, ratio
+
+        return best
+
+    def lookup(self, engine: str, source: str, target: str, texts: List[str], fuzzy: float = 0) -> List[Optional[str]]:
+        """Get the stored translation of each text
+
+        Parameters
+        ----------
+        engine : str
+            translation engine
+        source : str
+            source language
+        target : str
+            target language
+        texts : List[str]
+            texts to translate
+        fuzzy : float, optional
+            minimum similarity (0 - 1) to use the translation of a similar text, by default 0 (exact match only)
+
+        Returns
+        -------
+        List[Optional[str]]
+            translation of each text, None if it is not in the memory
+        """
+        key = (engine, source, target)
+        found: List[Optional[str]] = []
+        used = []
+        with self._lock:
+            con = self._connect()
+            for text in texts:
+                normalized = normalize_text(text)
+                row = con.execute(
+                    "SELECT translation FROM tm WHERE engine = ? AND source = ? AND target = ? AND text = ?",
+                    (*key, normalized),
+                ).fetchone()
+                if row is not None:
+                    self.hits += 1
+                    used.append(normalized)
+                    found.append(row[0])
+                    continue
+
+                translation = self._fuzzy(con, key, normalized, fuzzy) if fuzzy > 0 and normalized else None
+                if translation is not None:
+                    self.fuzzy_hits += 1
+                else:
+                    self.misses += 1
+                found.append(translation)
+
+            if used:
+                now = time()
+                con.executemany(
+                    "UPDATE tm SET last_used = ? WHERE engine = ? AND source = ? AND target = ? AND text = ?",
+                    [(now, *key, text) for text in used],
+                )
+                con.commit()
+
+        return found
+
+    def store(self, engine: str, source: str, target: str, texts: List[str], translations: List[str]) -> None:
+        """Store the translation of each text"""
+        key = (engine, source, target)
+        now = time()
+        rows = []
+        for text, translation in zip(texts, translations):
+            normalized = normalize_text(text)
+            if normalized and translation:
+                rows.append((*key, normalized, translation, len(normalized), now))
+
+        if not rows:
+            return
+
+        with self._lock:
+            con = self._connect()
+            # insert the new texts and update the known ones separately, so only the new ones are counted
+            self._count += con.executemany("INSERT OR IGNORE INTO tm VALUES (?, ?, ?, ?, ?, ?, ?)", rows).rowcount
+            con.executemany(
+                "UPDATE tm SET translation = ?, last_used = ? "
+                "WHERE engine = ? AND source = ? AND target = ? AND text = ?",
+                [(translation, used, *row_key, text) for *row_key, text, translation, _, used in rows],
+            )
+            if self._count > self.max_entries:
+                self._count -= con.execute(
+                    "DELETE FROM tm WHERE rowid IN (SELECT rowid FROM tm ORDER BY last_used LIMIT ?)",
+                    (self._count - self.max_entries, ),
+                ).rowcount
+            con.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters since the program started and the amount of stored translations"""
+        with self._lock:
+            self._connect()
+            entries = self._count
+
+        return {"hits": self.hits, "fuzzy_hits": self.fuzzy_hits, "misses": self.misses, "entries": entries}
+
+    def clear(self) -> None:
+        """Delete every stored translation"""
+        with self._lock:
+            con = self._connect()
+            con.execute("DELETE FROM tm")
+            con.commit()
+            con.execute("VACUUM")
+            self._count = 0
+        logger.info("Translation memory cleared")
+
+
+translation_memory = TranslationMemory()
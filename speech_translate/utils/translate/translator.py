@@ -1,12 +1,37 @@
 # pylint: disable=protected-access, redefined-outer-name, import-outside-toplevel, invalid-name
-from typing import Dict, List
+import json
+from threading import Lock
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import requests
 from loguru import logger
+from requests.adapters import HTTPAdapter
 from tqdm.auto import tqdm
 
 from ..helper import get_similar_keys, no_connection_notify
+from .executor import RetryableError, get_executor
 from .language import GOOGLE_KEY_VAL, LIBRE_KEY_VAL, MYMEMORY_KEY_VAL
+from .memory import translation_memory
+
+# setting key suffix of each engine, for tl_workers_<suffix> and tl_rate_<suffix>
+TL_ENGINE_SETTING_KEY = {
+    "Google Translate": "google",
+    "MyMemoryTranslator": "mymemory",
+    "LibreTranslate": "libre",
+}
+# characters sent in one request when packing segments, under the limit of the engine (5000 and 500) to leave room
+# for the delimiters
+TL_PACK_LIMIT = {
+    "Google Translate": 4500,
+    "MyMemoryTranslator": 400,
+}
+TL_PACK_DELIMITER = "\n"
+# errors that will not go away by sending the request again
+TL_NON_RETRYABLE_ERRORS = (
+    "Error Language Code Undefined",
+    "Error: Not connected to internet",
+    "Error: Invalid parameter",
+)
 
 
 def tl_batch_with_tqdm(self, batch: List[str], **kwargs) -> list:
@@ -208,6 +233,151 @@ def memory_tl(text: List[str], from_lang: str, to_lang: str, proxies: Dict, debu
 
 
 # LibreTranslator
+LIBRE_SESSIONS: Dict[Tuple[str, str], Tuple[requests.Session, int]] = {}
+LIBRE_SESSIONS_LOCK = Lock()
+
+
+def get_tl_args(engine: str, setting_cache) -> Dict:
+    """Get the engine kwargs for translate from the setting
+
+    Args
+    ----
+        engine (str): Engine to use
+        setting_cache (SettingDict): Setting cache
+
+    Returns
+    -------
+        Dict: kwargs to pass to translate
+    """
+    key = TL_ENGINE_SETTING_KEY.get(engine)
+    if key is None:
+        return {}
+
+    kwargs = {"tl_workers": setting_cache[f"tl_workers_{key}"], "tl_rate": setting_cache[f"tl_rate_{key}"]}
+    if engine in TL_PACK_LIMIT:
+        kwargs["tl_pack"] = setting_cache["tl_pack_segments"]
+    if setting_cache["tl_memory"]:
+        translation_memory.max_entries = setting_cache["tl_memory_max_entries"]
+        kwargs["tl_memory_fuzzy"] = setting_cache["tl_memory_fuzzy"] / 100
+    if engine == "LibreTranslate":
+        kwargs.update(
+            {
+                "libre_link": setting_cache["libre_link"],
+                "libre_api_key": setting_cache["libre_api_key"],
+                "libre_batch_size": setting_cache["libre_batch_size"],
+                "libre_batch_chars": setting_cache["libre_batch_chars"],
+                # every concurrent request needs its own connection
+                "libre_pool_size": max(setting_cache["libre_pool_size"], setting_cache["tl_workers_libre"]),
+            }
+        )
+
+    return kwargs
+
+
+def get_libre_session(host: str, proxies: Dict, pool_size: int) -> requests.Session:
+    """Get the keep alive session of a LibreTranslate host, so every request after the first one reuses the connection
+    instead of doing a new TCP / TLS handshake
+
+    Args
+    ----
+        host (str): LibreTranslate host
+        proxies (Dict): Proxies, each proxies setting gets its own session
+        pool_size (int): Maximum connections kept open to the host
+
+    Returns
+    -------
+        requests.Session: the session
+    """
+    key = (host, json.dumps(proxies, sort_keys=True))
+    with LIBRE_SESSIONS_LOCK:
+        session, size = LIBRE_SESSIONS.get(key, (None, 0))
+        if session is None or size != pool_size:
+            if session is not None:
+                session.close()
+            session = requests.Session()
+            session.proxies.update(proxies)
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            LIBRE_SESSIONS[key] = (session, pool_size)
+
+    return session
+
+
+def split_batches(text: List[str], max_items: int, max_chars: int, separator_len: int = 0) -> Iterator[List[str]]:
+    """Split texts into consecutive batches of at most max_items texts and max_chars characters. A text longer than
+    max_chars is sent alone
+
+    Args
+    ----
+        text (List[str]): Texts
+        max_items (int): Maximum texts in a batch, 1 or less to send one text per batch
+        max_chars (int): Maximum total characters in a batch
+        separator_len (int): Characters added to each text when the batch is joined into one request, by default 0
+
+    Yields
+    ------
+        List[str]: batch of texts, in order
+    """
+    batch, chars = [], 0
+    for q in text:
+        size = len(q) + separator_len
+        if batch and (len(batch) >= max_items or chars + size > max_chars):
+            yield batch
+            batch, chars = [], 0
+        batch.append(q)
+        chars += size
+
+    if batch:
+        yield batch
+
+
+def translate_packed(
+    engine: str, text: List[str], from_lang: str, to_lang: str, proxies: Dict, debug_log: bool, **kwargs
+) -> Tuple[bool, Union[List[str], str]]:
+    """Translate several segments in one request by joining them with a delimiter, then split the translation back.
+    If the packed request fails or its translation does not split back into the same amount of segments (the engine
+    merged or split lines), the segments are translated one by one instead
+
+    Args
+    ----
+        engine (str): Engine to use, Google Translate or MyMemoryTranslator
+        text (List[str]): Segments to translate, their total length should be within TL_PACK_LIMIT of the engine
+        from_lang (str): Language From
+        to_lang (str): Language to translate
+        proxies (Dict): Proxies
+        debug_log (bool): Debug Log
+
+    Returns
+    -------
+        is_success: Success or not
+        result: Translation of each segment or the error
+    """
+    # newlines in a segment would be taken as a delimiter, empty segments would be dropped by the engine
+    cleaned = [" ".join(q.split()) for q in text]
+    to_send = [q for q in cleaned if q]
+    if len(to_send) <= 1:
+        return tl_dict[engine](text, from_lang, to_lang, proxies, debug_log, **kwargs)
+
+    packed = TL_PACK_DELIMITER.join(to_send)
+    success, result = tl_dict[engine]([packed], from_lang, to_lang, proxies, debug_log, **kwargs)
+    if not success:
+        if str(result).startswith(TL_NON_RETRYABLE_ERRORS):
+            return success, result  # would fail the same way for every segment
+        logger.warning(f"Packed translation failed ({result}), translating one by one")
+        return tl_dict[engine](text, from_lang, to_lang, proxies, debug_log, **kwargs)
+
+    parts = [part.strip() for part in str(result[0]).split(TL_PACK_DELIMITER) if part.strip()]
+    if len(parts) != len(to_send):
+        logger.warning(
+            f"Packed translation returned {len(parts)} segments instead of {len(to_send)}, translating one by one"
+        )
+        return tl_dict[engine](text, from_lang, to_lang, proxies, debug_log, **kwargs)
+
+    parts.reverse()
+    return True, [parts.pop() if q else q for q in cleaned]
+
+
 def libre_tl(
     text: List[str],
     from_lang: str,
@@ -216,6 +386,9 @@ def libre_tl(
     debug_log: bool,
     libre_link: str,
     libre_api_key: str,
+    libre_batch_size: int = 1,
+    libre_batch_chars: int = 5000,
+    libre_pool_size: int = 4,
     **kwargs,
 ):
     """Translate Using LibreTranslate
@@ -229,6 +402,9 @@ def libre_tl(
         debug_log (bool): Debug Log. Defaults to False.
         libre_link (str): LibreTranslate Link
         libre_api_key (str): LibreTranslate API Key
+        libre_batch_size (int, optional): Maximum texts sent in one request. Defaults to 1.
+        libre_batch_chars (int, optional): Maximum characters sent in one request. Defaults to 5000.
+        libre_pool_size (int, optional): Maximum connections kept open to the host. Defaults to 4.
 
     Returns
     -------
@@ -258,28 +434,39 @@ def libre_tl(
     # --- Translate ---
     try:
         req = {"q": text, "source": LCODE_FROM, "target": LCODE_TO, "format": "text"}
+        session = get_libre_session(libre_link, proxies, max(1, libre_pool_size))
         libre_link += "/translate"
 
         if libre_api_key != "":
             req["api_key"] = libre_api_key
 
+        def post(q):
+            req["q"] = q
+            # longer read timeout for batches, the server translates the whole batch before responding
+            timeout = (5, 5 + len(q)) if isinstance(q, list) else 5
+            response = session.post(libre_link, json=req, timeout=timeout).json()
+            if "error" in response:
+                raise Exception(response["error"])
+            return response["translatedText"]
+
         arr = []
-        if kwargs.pop("live_input", False):
-            for q in text:
-                req["q"] = q
-                response = requests.post(libre_link, json=req, proxies=proxies, timeout=5).json()
-                if "error" in response:
-                    raise Exception(response["error"])
-                translated = response["translatedText"]
-                arr.append(translated)
-        else:
-            for q in tqdm(text, desc="Translating"):
-                req["q"] = q
-                response = requests.post(libre_link, json=req, proxies=proxies, timeout=5).json()
-                if "error" in response:
-                    raise Exception(response["error"])
-                translated = response["translatedText"]
-                arr.append(translated)
+        live_input = kwargs.pop("live_input", False)
+        with tqdm(total=len(text), desc="Translating", disable=live_input) as pbar:
+            for batch in split_batches(text, libre_batch_size, libre_batch_chars):
+                if len(batch) == 1:
+                    arr.append(post(batch[0]))
+                else:
+                    try:
+                        translated = post(batch)
+                    except Exception as e:
+                        logger.warning(f"LibreTranslate batch request failed: {e}")
+                        translated = None
+                    if not isinstance(translated, list) or len(translated) != len(batch):
+                        # older servers (or a lower batch limit on the server) do not accept the list
+                        logger.warning("Translating the batch one by one")
+                        translated = [post(q) for q in batch]
+                    arr.extend(translated)
+                pbar.update(len(batch))
 
         result = arr
         is_success = True
@@ -310,6 +497,10 @@ tl_dict = {
 def translate(engine: str, text: List[str], from_lang: str, to_lang: str, proxies: Dict, debug_log: bool = False, **kwargs):
     """Translate
 
+    The texts are split into requests (one text per request, packed segments for Google and MyMemory, or batches for
+    LibreTranslate) that are sent concurrently within the concurrency and rate limit of the engine, failed requests
+    are retried. Texts found in the translation memory are not sent.
+
     Args
     ----
         engine (str): Engine to use
@@ -318,7 +509,8 @@ def translate(engine: str, text: List[str], from_lang: str, to_lang: str, proxie
         to_lang (str): Language to translate
         proxies (Dict): Proxies. Defaults to None.
         debug_log (bool, optional): Debug Log. Defaults to False.
-        **libre_kwargs: LibreTranslate kwargs
+        **kwargs: tl_workers, tl_rate, and tl_pack of the engine, tl_memory_fuzzy (translation memory is only used
+            when set, 0 for exact match only), LibreTranslate kwargs, live_input
 
     Returns
     -------
@@ -332,4 +524,56 @@ def translate(engine: str, text: List[str], from_lang: str, to_lang: str, proxie
     from_lang = from_lang.lower()
     to_lang = to_lang.lower()
 
-    return tl_dict[engine](text, from_lang, to_lang, proxies, debug_log, **kwargs)
+    executor = get_executor(engine, kwargs.pop("tl_workers", 1), kwargs.pop("tl_rate", 0))
+    live_input = kwargs.pop("live_input", False)
+    memory_fuzzy = kwargs.pop("tl_memory_fuzzy", None)
+
+    # only send the texts that are not in the translation memory
+    remembered: List[Optional[str]] = [None] * len(text)
+    if memory_fuzzy is not None:
+        try:
+            remembered = translation_memory.lookup(engine, from_lang, to_lang, text, memory_fuzzy)
+        except Exception as e:
+            logger.warning(f"Failed to read translation memory: {e}")
+    full_text, text = text, [q for q, tl in zip(text, remembered) if tl is None]
+    pack = kwargs.pop("tl_pack", False) and engine in TL_PACK_LIMIT
+    if engine == "LibreTranslate":
+        chunks = list(split_batches(text, kwargs.get("libre_batch_size", 1), kwargs.get("libre_batch_chars", 5000)))
+    elif pack:
+        chunks = list(split_batches(text, len(text), TL_PACK_LIMIT[engine], len(TL_PACK_DELIMITER)))
+    else:
+        chunks = [[q] for q in text]
+
+    def run_chunk(chunk: List[str]) -> List[str]:
+        # progress is shown for the whole text below, not for each request
+        if pack:
+            success, result = translate_packed(
+                engine, chunk, from_lang, to_lang, proxies, debug_log, live_input=True, **kwargs
+            )
+        else:
+            success, result = tl_dict[engine](chunk, from_lang, to_lang, proxies, debug_log, live_input=True, **kwargs)
+        if not success:
+            if str(result).startswith(TL_NON_RETRYABLE_ERRORS):
+                raise Exception(result)
+            raise RetryableError(result)
+        return result
+
+    try:
+        with tqdm(total=len(text), desc="Translating", disable=live_input) as pbar:
+            results = executor.map(run_chunk, chunks, lambda chunk: pbar.update(len(chunk)))
+    except Exception as e:
+        return False, str(e)
+
+    translated = [q for result in results for q in result]
+    if memory_fuzzy is not None:
+        if debug_log:
+            logger.debug(f"Translation memory: {len(full_text) - len(text)}/{len(full_text)} texts reused")
+        # live text is revised on every tick, storing each partial sentence would fill the memory with drafts
+        if not live_input:
+            try:
+                translation_memory.store(engine, from_lang, to_lang, text, translated)
+            except Exception as e:
+                logger.warning(f"Failed to store translation memory: {e}")
+
+    translated.reverse()
+    return True, [tl if tl is not None else translated.pop() for tl in remembered]
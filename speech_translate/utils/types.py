@@ -121,6 +121,10 @@ class SettingDict(TypedDict):
     dir_log: str
     dir_model: str
     auto_verify_model_on_first_setting_open: bool
+    model_cache_budget_mb: int
+    prewarm_model: bool
+    prewarm_dummy_decode: bool
+    cpu_autotune: bool
     file_slice_start: str
     file_slice_end: str
     # ------------------ #
@@ -141,6 +145,20 @@ class SettingDict(TypedDict):
     supress_libre_api_key_warning: bool
     libre_api_key: str
     libre_link: str
+    libre_batch_size: int
+    libre_batch_chars: int
+    libre_pool_size: int
+    tl_workers_google: int
+    tl_rate_google: int
+    tl_workers_mymemory: int
+    tl_rate_mymemory: int
+    tl_workers_libre: int
+    tl_rate_libre: int
+    tl_pack_segments: bool
+    tl_memory: bool
+    tl_memory_fuzzy: int
+    tl_memory_max_entries: int
+    tl_live_latest_only: bool
     # ------------------ #
     # Record settings
     rec_ask_confirmation_first: bool
@@ -223,9 +241,16 @@ class SettingDict(TypedDict):
     segment_level: bool  # 1 of this must be bool
     word_level: bool  # 1 of this must be bool
     visualize_suppression: bool
+    file_workers: int
+    file_prefetch: int
+    file_prefetch_max_s: int
+    file_prefetch_demucs: bool
+    decoded_cache_mb: int
+    result_cache: bool
     use_faster_whisper: bool
     use_en_model: bool
     transcribe_rate: int
+    rec_incremental: bool
     decoding_preset: str  # greedy beam search custom
     temperature: str  # 0.0 - 1.0
     best_of: Optional[int]
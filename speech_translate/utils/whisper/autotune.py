@@ -0,0 +1,271 @@
+import hashlib
+import json
+import os
+import platform
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import stable_whisper
+import torch
+from loguru import logger
+
+from speech_translate._constants import WHISPER_SR
+from speech_translate._path import p_cpu_autotune
+
+BENCHMARK_SECONDS = 10
+FW_COMPUTE_TYPES = ["int8", "float32"]
+
+
+def machine_fingerprint() -> str:
+    """Get a short id of the cpu this is running on, tuned configs are only valid for the machine they were made on
+
+    Returns
+    -------
+    str
+        fingerprint of the machine
+    """
+    cpu_name = platform.processor()
+    try:
+        with open("/proc/cpuinfo", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    cpu_name = line.split(":", 1)[1].strip()
+                    break
+    except OSError:
+        pass
+
+    info = f"{platform.system()}|{platform.machine()}|{cpu_name}|{os.cpu_count()}"
+    return hashlib.sha1(info.encode("utf-8")).hexdigest()[:16]
+
+
+def benchmark_clip(seconds: float = BENCHMARK_SECONDS) -> np.ndarray:
+    """Make a deterministic speech like clip to benchmark with, so no audio file needs to be bundled
+
+    Parameters
+    ----------
+    seconds : float, optional
+        length of the clip, by default BENCHMARK_SECONDS
+
+    Returns
+    -------
+    np.ndarray
+        float32 mono audio at WHISPER_SR
+    """
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * WHISPER_SR), dtype=np.float32) / WHISPER_SR
+    # voiced harmonics with a wandering pitch, cut into syllable like bursts
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / WHISPER_SR
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 3 * t), 0, None)
+    audio = 0.3 * voiced * envelope + 0.01 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+def candidate_configs(use_faster_whisper: bool) -> List[Dict]:
+    """List the configs to try
+
+    Parameters
+    ----------
+    use_faster_whisper : bool
+        Whether the configs are for faster whisper or whisper
+
+    Returns
+    -------
+    List[Dict]
+        candidate configs, each with threads and compute_type (faster whisper) or dq (whisper)
+    """
+    n_cpu = os.cpu_count() or 1
+    threads = sorted({max(1, n_cpu // 4), max(1, n_cpu // 2), n_cpu})
+    if use_faster_whisper:
+        return [{"threads": t, "compute_type": c} for c in FW_COMPUTE_TYPES for t in threads]
+
+    return [{"threads": t, "dq": dq} for dq in (False, True) for t in threads]
+
+
+class TunedConfigStore:
+    """
+    Persistent store of the best cpu config of each model, per machine.
+
+    The configs are saved as {fingerprint: {"backend/model": config}} so a settings folder copied to another machine
+    does not apply configs that were tuned for a different cpu.
+    """
+    def __init__(self, path: str = p_cpu_autotune):
+        self.path = path
+        self._lock = Lock()
+        self._data: Optional[Dict[str, Dict[str, Dict]]] = None
+        self._fingerprint = machine_fingerprint()
+
+    @staticmethod
+    def make_key(model_name: str, use_faster_whisper: bool) -> str:
+        # english only models have the same size as the multilingual ones, they share the config
+        if model_name.endswith(".en"):
+            model_name = model_name[:-3]
+        return f"{'faster_whisper' if use_faster_whisper else 'whisper'}/{model_name}"
+
+    def _load(self) -> Dict[str, Dict[str, Dict]]:
+        """Load the stored configs on first use, must hold the lock"""
+        if self._data is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except FileNotFoundError:
+                self._data = {}
+            except Exception as e:
+                logger.warning(f"Failed to read cpu autotune file, starting with an empty one: {e}")
+                self._data = {}
+
+        return self._data
+
+    def get(self, model_name: str, use_faster_whisper: bool) -> Optional[Dict]:
+        """Get the tuned config of a model on this machine
+
+        Parameters
+        ----------
+        model_name : str
+            name of the model
+        use_faster_whisper : bool
+            Whether the model is loaded with faster whisper
+
+        Returns
+        -------
+        Optional[Dict]
+            the tuned config, None if the model has not been tuned yet
+        """
+        with self._lock:
+            return self._load().get(self._fingerprint, {}).get(self.make_key(model_name, use_faster_whisper))
+
+    def set(self, model_name: str, use_faster_whisper: bool, config: Dict) -> None:
+        """Save the tuned config of a model on this machine"""
+        with self._lock:
+            data = self._load()
+            data.setdefault(self._fingerprint, {})[self.make_key(model_name, use_faster_whisper)] = config
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=4)
+            except Exception as e:
+                logger.warning(f"Failed to save cpu autotune file: {e}")
+
+
+tuned_config_store = TunedConfigStore()
+
+
+def apply_tuned_model_args(model_name: str, use_faster_whisper: bool, model_args: Dict) -> None:
+    """Apply the tuned config of a model to the load arguments, options set by the user in the arguments are kept
+
+    Parameters
+    ----------
+    model_name : str
+        name of the model
+    use_faster_whisper : bool
+        Whether the model is loaded with faster whisper
+    model_args : Dict
+        arguments to load the model, modified in place
+    """
+    if model_args.get("device") != "cpu":
+        return  # only tuned for cpu inference
+
+    tuned = tuned_config_store.get(model_name, use_faster_whisper)
+    if tuned is None:
+        return
+
+    if use_faster_whisper:
+        model_args.setdefault("compute_type", tuned["compute_type"])
+        model_args.setdefault("cpu_threads", tuned["threads"])
+    else:
+        model_args.setdefault("dq", tuned["dq"])
+
+    logger.debug(f"Using tuned cpu config for {model_name}: {tuned}")
+
+
+def tuned_threads(model_name: str, use_faster_whisper: bool) -> int:
+    """Get the tuned torch thread count of a model, 0 if not tuned. Faster whisper sets its threads when loading"""
+    if use_faster_whisper:
+        return 0
+
+    tuned = tuned_config_store.get(model_name, use_faster_whisper)
+    return tuned["threads"] if tuned else 0
+
+
+def autotune_model(
+    model_name: str,
+    use_faster_whisper: bool,
+    model_args: Dict,
+    progress_cb: Optional[Callable[[str], None]] = None,
+) -> Dict:
+    """Benchmark every candidate config of a model on the cpu and save the fastest one
+
+    Each config is timed on the benchmark clip after a short warm up run, the real time factor
+    (processing time / audio duration) of every config is kept in the saved result.
+
+    Parameters
+    ----------
+    model_name : str
+        name of the model, must already be downloaded
+    use_faster_whisper : bool
+        Whether to tune for faster whisper or whisper
+    model_args : Dict
+        base arguments to load the model, device is forced to cpu
+    progress_cb : Optional[Callable[[str], None]], optional
+        called with a status message before each config, by default None
+
+    Returns
+    -------
+    Dict
+        the best config with its real time factor and the results of every config
+    """
+    clip = benchmark_clip()
+    duration = len(clip) / WHISPER_SR
+    prev_threads = torch.get_num_threads()
+    results = []
+
+    try:
+        configs = candidate_configs(use_faster_whisper)
+        for i, config in enumerate(configs):
+            if progress_cb:
+                progress_cb(f"Testing config {i + 1}/{len(configs)}: {config}")
+
+            load_args = {**model_args, "device": "cpu"}
+            model, transcribe = None, None
+            try:
+                # loading is part of the config, e.g. a compute type that the cpu does not support fails here
+                if use_faster_whisper:
+                    load_args.update(compute_type=config["compute_type"], cpu_threads=config["threads"])
+                    model = stable_whisper.load_faster_whisper(model_name, **load_args)
+                    transcribe = model.transcribe_stable
+                    transcribe_args = {"input_sr": WHISPER_SR, "temperature": 0, "verbose": None}
+                else:
+                    torch.set_num_threads(config["threads"])
+                    load_args["dq"] = config["dq"]
+                    model = stable_whisper.load_model(model_name, **load_args)
+                    transcribe = model.transcribe
+                    transcribe_args = {"temperature": 0, "condition_on_previous_text": False, "verbose": None}
+
+                transcribe(clip[:WHISPER_SR], **transcribe_args)  # warm up
+                t_start = perf_counter()
+                transcribe(clip, **transcribe_args)
+                rtf = (perf_counter() - t_start) / duration
+            except Exception as e:
+                logger.exception(e)
+                logger.warning(f"Config {config} failed to {'run' if model is not None else 'load'}, skipping it")
+                continue
+            finally:
+                del model, transcribe
+
+            logger.debug(f"Config {config} real time factor: {rtf:.3f}")
+            results.append({**config, "rtf": round(rtf, 4)})
+    finally:
+        torch.set_num_threads(prev_threads)
+
+    if not results:
+        raise Exception("Every config failed to run, check the log for details")
+
+    best = dict(min(results, key=lambda r: r["rtf"]))
+    best["results"] = results
+    tuned_config_store.set(model_name, use_faster_whisper, best)
+    logger.info(f"Best cpu config for {model_name}: {best}")
+
+    return best
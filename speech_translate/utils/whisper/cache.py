@@ -0,0 +1,214 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator, Literal, Set, Tuple
+
+import stable_whisper
+from loguru import logger
+
+# approximate size in MB of each model when loaded, used when the size can not be measured (faster whisper)
+APPROX_MODEL_SIZE_MB = {
+    "tiny": 150,
+    "base": 290,
+    "small": 970,
+    "medium": 3060,
+    "large": 6200,
+}
+
+ModelKey = Tuple[str, str, str, str]
+
+
+def estimate_model_size_mb(model, model_name: str) -> float:
+    """Estimate the memory used by a loaded model
+
+    Parameters
+    ----------
+    model :
+        loaded whisper or faster whisper model
+    model_name : str
+        name of the model
+
+    Returns
+    -------
+    float
+        size in MB
+    """
+    try:
+        # whisper model is a torch module
+        size = sum(t.numel() * t.element_size() for t in list(model.parameters()) + list(model.buffers()))
+        return size / 1024 / 1024
+    except Exception:
+        pass
+
+    for name, size_mb in APPROX_MODEL_SIZE_MB.items():
+        if model_name.startswith(name):
+            return size_mb
+
+    return APPROX_MODEL_SIZE_MB["large"]
+
+
+class ModelCache:
+    """
+    Warm model cache shared by record sessions, file processing, refinement, and alignment.
+
+    Models are kept loaded after a session ends, keyed by (backend, model name, device, load options), so the next
+    session with the same model gets it right away instead of loading it from disk again. When the total size of the
+    kept models goes over the budget, the least recently used models are dropped from the cache.
+    """
+    def __init__(self, budget_mb: float = 4096):
+        """
+        Parameters
+        ----------
+        budget_mb : float, optional
+            maximum total size of the kept models in MB, by default 4096. 0 disables keeping models
+        """
+        self.budget_mb = budget_mb
+        self._lock = Lock()
+        self._models: "OrderedDict[ModelKey, Tuple[object, float]]" = OrderedDict()
+        self._loading: Dict[ModelKey, Lock] = {}
+        self._claimed: Set[ModelKey] = set()  # models that a session has used, they do not need a warm up
+        self._warming: Dict[ModelKey, Lock] = {}  # held while a warm up decode runs on the model
+
+    @staticmethod
+    def make_key(backend: str, model_name: str, **model_args) -> ModelKey:
+        device = str(model_args.get("device", ""))
+        options = repr(sorted((k, repr(v)) for k, v in model_args.items() if k != "device"))
+        return backend, model_name, device, options
+
+    @property
+    def size_mb(self) -> float:
+        """Total size of the kept models in MB"""
+        return sum(size for _, size in self._models.values())
+
+    def is_cached(self, backend: str, model_name: str, **model_args) -> bool:
+        return self.make_key(backend, model_name, **model_args) in self._models
+
+    def load(self, backend: Literal["whisper", "faster_whisper"], model_name: str, claim: bool = True, **model_args):
+        """Get the model from the cache or load it if not cached yet
+
+        Loading the same model at the same time (e.g. prewarm and a session start) only loads it once,
+        the other caller waits for it to finish.
+
+        Parameters
+        ----------
+        backend : Literal["whisper", "faster_whisper"]
+            backend used to load the model
+        model_name : str
+            name of the model
+        claim : bool, optional
+            whether the caller is going to run the model, by default True. A claimed model is not warmed up anymore
+            and the caller waits for a warm up that is already running, so they do not decode at the same time
+        **model_args :
+            arguments to load the model
+
+        Returns
+        -------
+        whisper.Whisper or faster_whisper.WhisperModel
+            the loaded model
+        """
+        key = self.make_key(backend, model_name, **model_args)
+        with self._lock:
+            key_lock = self._loading.setdefault(key, Lock())
+
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    logger.debug(f"Using cached model {model_name} ({backend})")
+                    model = self._models[key][0]
+                else:
+                    model = None
+
+            if model is not None:
+                if claim:
+                    self._claim(key)
+                return model
+
+            logger.debug(f"Loading model {model_name} ({backend})")
+            if backend == "faster_whisper":
+                model = stable_whisper.load_faster_whisper(model_name, **model_args)
+            else:
+                model = stable_whisper.load_model(model_name, **model_args)
+
+            size_mb = estimate_model_size_mb(model, model_name)
+            with self._lock:
+                self._models[key] = (model, size_mb)
+                self._evict()
+                self._loading.pop(key, None)
+
+        if claim:
+            self._claim(key)
+        return model
+
+    def _claim(self, key: ModelKey) -> None:
+        """Mark the model as used by a session, waiting for its warm up to finish if one is running"""
+        with self._lock:
+            if key in self._models:  # a model that is not kept is a new object every load, nothing to mark
+                self._claimed.add(key)
+            warm_lock = self._warming.get(key)
+
+        if warm_lock is not None:
+            with warm_lock:
+                pass
+
+    @contextmanager
+    def warmup(self, backend: Literal["whisper", "faster_whisper"], model_name: str, **model_args) -> Iterator[bool]:
+        """Context to run a warm up decode on a cached model without running at the same time as a session
+
+        Parameters
+        ----------
+        backend : Literal["whisper", "faster_whisper"]
+            backend used to load the model
+        model_name : str
+            name of the model
+        **model_args :
+            arguments to load the model
+
+        Yields
+        ------
+        bool
+            True if the warm up can run, False if a session already claimed the model or it is being warmed up
+        """
+        key = self.make_key(backend, model_name, **model_args)
+        with self._lock:
+            if key in self._claimed or key in self._warming:
+                warm_lock = None
+            else:
+                # taken before releasing the cache lock, so a session claiming right after waits for it
+                warm_lock = self._warming[key] = Lock()
+                warm_lock.acquire()
+
+        if warm_lock is None:
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            with self._lock:
+                self._warming.pop(key, None)
+            warm_lock.release()
+
+    def set_budget(self, budget_mb: float) -> None:
+        """Change the budget, dropping models that no longer fit"""
+        with self._lock:
+            self.budget_mb = budget_mb
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop the least recently used models until the total size is within the budget, must hold the lock.
+        Models that are still used by a running session stay loaded until the session ends"""
+        while self._models and self.size_mb > self.budget_mb:
+            key, _ = self._models.popitem(last=False)
+            self._claimed.discard(key)
+            backend, model_name, _, _ = key
+            logger.debug(f"Dropping cached model {model_name} ({backend})")
+
+    def clear(self) -> None:
+        """Drop every cached model"""
+        with self._lock:
+            self._models.clear()
+            self._claimed.clear()
+
+
+model_cache = ModelCache()
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+from threading import Lock
+from typing import Dict, Optional
+
+from loguru import logger
+
+from speech_translate._path import p_file_checksum_cache, p_model_checksum_cache
+
+CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def file_sha256(path: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """Hash a file in chunks, so big model files are never loaded into memory whole
+
+    Parameters
+    ----------
+    path : str
+        path of the file
+    chunk_size : int, optional
+        size of each read in bytes, by default CHUNK_SIZE
+
+    Returns
+    -------
+    str
+        sha256 hex digest of the file
+    """
+    h = hashlib.sha256()
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            h.update(view[:n])
+
+    return h.hexdigest()
+
+
+class ChecksumCache:
+    """
+    Persistent cache of model file checksums.
+
+    Each entry is keyed by the absolute path of the file and stores the size and modification time of the file when it
+    was hashed. As long as both stay the same the stored checksum is used, so checking a model that was already verified
+    only costs a stat call instead of reading the whole file again.
+    """
+    def __init__(self, path: str = p_model_checksum_cache):
+        """
+        Parameters
+        ----------
+        path : str, optional
+            path of the json file storing the cache, by default p_model_checksum_cache
+        """
+        self.path = path
+        self._lock = Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load the stored entries on first use, must hold the lock"""
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except FileNotFoundError:
+                self._entries = {}
+            except Exception as e:
+                logger.warning(f"Failed to read model checksum cache, starting with an empty one: {e}")
+                self._entries = {}
+
+        return self._entries
+
+    def _save(self) -> None:
+        """Write the entries to disk, must hold the lock"""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp = self.path + ".tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=4)
+            os.replace(temp, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to save model checksum cache: {e}")
+
+    def sha256(self, path: str) -> str:
+        """Get the sha256 of a file, only hashing it if it changed since the last time it was hashed
+
+        Parameters
+        ----------
+        path : str
+            path of the file
+
+        Returns
+        -------
+        str
+            sha256 hex digest of the file
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        with self._lock:
+            entry = self._load().get(path)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                return entry["sha256"]
+
+        logger.debug(f"Hashing {path}")
+        digest = file_sha256(path)
+        with self._lock:
+            self._load()[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest}
+            self._save()
+
+        return digest
+
+    def forget(self, path: str) -> None:
+        """Drop the entry of a file"""
+        with self._lock:
+            if self._load().pop(os.path.abspath(path), None) is not None:
+                self._save()
+
+
+checksum_cache = ChecksumCache()
+file_checksum_cache = ChecksumCache(p_file_checksum_cache)  # imported audio / video files
@@ -1,5 +1,4 @@
 # pylint: disable=import-outside-toplevel, protected-access
-import hashlib
 import os
 
 from huggingface_hub import HfApi
@@ -7,6 +6,10 @@ from huggingface_hub.file_download import repo_folder_name
 from loguru import logger
 
 from speech_translate.ui.custom.download import faster_whisper_download_with_progress_gui, whisper_download_with_progress_gui
+from speech_translate.utils.whisper.checksum import checksum_cache
+
+# files that must be in a faster whisper snapshot for the model to be usable
+FW_REQUIRED_FILES = ["config.json", "model.bin", "tokenizer.json"]
 
 
 # donwload function
@@ -48,6 +51,9 @@ def download_model(model_key, root_win, **kwargs):
 def verify_model_whisper(model_key, download_root=None):
     """Verify the SHA256 checksum of a downloaded model
 
+    The checksum is cached by path, size, and modification time, so only the first check after the file changes
+    needs to read the whole file.
+
     Parameters
     ----------
     model_key : str
@@ -73,8 +79,7 @@ def verify_model_whisper(model_key, download_root=None):
 
     expected_sha256 = _MODELS[model_key].split("/")[-2]
 
-    model_bytes = open(model_file, "rb").read()
-    return hashlib.sha256(model_bytes).hexdigest() == expected_sha256
+    return checksum_cache.sha256(model_file) == expected_sha256
 
 
 def verify_model_faster_whisper(model_key: str, cache_dir) -> bool:
@@ -82,6 +87,9 @@ def verify_model_faster_whisper(model_key: str, cache_dir) -> bool:
     Verify downloaded faster whisper model, 
     a somewhat hacky check to see if the model is already downloaded
 
+    The local snapshot pointed by the downloaded ref is checked first, the huggingface server is only asked
+    when there is no local ref yet.
+
     Parameters
     ----------
     model_key : str
@@ -105,6 +113,18 @@ def verify_model_faster_whisper(model_key: str, cache_dir) -> bool:
         raise ValueError(f"Invalid model size '{model_key}', expected one of: {', '.join(FW_MODELS.keys())}")
 
     storage_folder = os.path.join(cache_dir, repo_folder_name(repo_id=repo_id, repo_type="model"))
+    blob_folder = os.path.join(storage_folder, "blobs")
+    ref_path = os.path.join(storage_folder, "refs", "main")
+    if os.path.isfile(ref_path):
+        with open(ref_path, "r", encoding="utf-8") as f:
+            commit_hash = f.read().strip()
+
+        snapshot_folder = os.path.join(storage_folder, "snapshots", commit_hash)
+        if not all(os.path.exists(os.path.join(snapshot_folder, file)) for file in FW_REQUIRED_FILES):
+            return False
+
+        return not has_incomplete_blob(blob_folder)
+
     try:
         api = HfApi()
         logger.debug("Connecting to huggingface server to verify model")
@@ -113,28 +133,40 @@ def verify_model_faster_whisper(model_key: str, cache_dir) -> bool:
 
         commit_hash = repo_info.sha
         snapshot_folder = os.path.join(storage_folder, "snapshots", commit_hash)
-        blob_folder = os.path.join(storage_folder, "blobs")
 
         if not os.path.exists(snapshot_folder):
             return False
     except Exception:
         logger.warning("Failed to connect to huggingface server, verifying using local cache instead")
-        blob_folder = os.path.join(storage_folder, "blobs")
 
     # if blob folder does not exist, then model is not downloaded
     if not os.path.exists(blob_folder):
         return False
 
-    # check if blob contain any .incomplete file or .lock file
-    # meaning that the download is not finished
+    # should be safe to assume that model is downloaded
+    return not has_incomplete_blob(blob_folder)
+
+
+def has_incomplete_blob(blob_folder: str) -> bool:
+    """Check if the blob folder contain any .incomplete file or .lock file, meaning that the download is not finished
+
+    Parameters
+    ----------
+    blob_folder : str
+        The blob folder of the model
+
+    Returns
+    -------
+    bool
+        True if the download is not finished
+    """
     for _root, _dirs, files in os.walk(blob_folder):
         for file in files:
             if file.endswith(".incomplete") or file.endswith(".lock"):
                 logger.warning("Found incomplete file in blob folder, meaning that the download is not finished")
-                return False
+                return True
 
-    # should be safe to assume that model is downloaded
-    return True
+    return False
 
 
 # get default download root
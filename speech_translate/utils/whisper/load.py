@@ -1,5 +1,8 @@
 import argparse
-from typing import Literal, Optional, Union
+from copy import deepcopy
+from functools import lru_cache
+from threading import Lock
+from typing import Dict, Literal, Optional, Tuple, Union
 
 import stable_whisper
 import torch
@@ -8,7 +11,10 @@ from stable_whisper.utils import isolate_useful_options, str_to_valid_type
 from whisper import DecodingOptions
 
 from speech_translate.utils.types import SettingDict
+from speech_translate.utils.whisper.autotune import apply_tuned_model_args, tuned_threads
+from speech_translate.utils.whisper.cache import model_cache
 from speech_translate.utils.whisper.download import get_default_download_root
+from speech_translate.utils.whisper.shared_encoder import set_encoder_sharing
 
 from .helper import get_temperature
 
@@ -39,36 +45,229 @@ class ArgumentParserWithErrors(argparse.ArgumentParser):
         raise ValueError(message)
 
 
-def parse_args_stable_ts(
-    arguments: str, mode: Union[Literal["load", "transcribe", "align", "refine", "save"], str], method=None, **kwargs
-):
-    """Parse arguments to be passed onto stable ts with each mode in mind
+class ParseCache:
+    """
+    Parse results of the current stable ts arguments, keyed by (mode, method, kwargs).
+    Only the results of one arguments string are kept, changing the setting drops them.
+    """
+    def __init__(self):
+        self.arguments: Optional[str] = None
+        self._results: Dict[Tuple, dict] = {}
+        self._lock = Lock()
 
-    Pass in kwargs if needed
+    def get(self, arguments: str, key: Optional[Tuple]) -> Optional[dict]:
+        """Get the stored result, the caller must copy it before changing it"""
+        with self._lock:
+            if arguments != self.arguments:
+                self._results.clear()
+                self.arguments = arguments
+
+            return self._results.get(key) if key is not None else None
+
+    def set(self, arguments: str, key: Tuple, result: dict) -> None:
+        """Store a copy of the result, ignored if the arguments changed meanwhile"""
+        with self._lock:
+            if arguments == self.arguments:
+                self._results[key] = deepcopy(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self.arguments = None
 
-    Parameters
-    ----------
-    arguments : str
-        arguments to be parsed
-    mode : Literal[&quot;load&quot;, &quot;transcribe&quot;, &quot;align&quot;, &quot;refine&quot;, &quot;save&quot;]
-        mode to parse arguments for
-    pass_method : _type_, optional
-        method to pass arguments to, by default None
+
+parse_cache = ParseCache()
+
+
+@lru_cache(maxsize=None)
+def get_stable_ts_parser() -> ArgumentParserWithErrors:
+    """Build the parser for the stable ts arguments, built only once because adding the arguments is costly
 
     Returns
     -------
-    dict
-        parsed arguments
-
-    Raises
-    ------
-    ValueError
-        if there are missing values or invalid values
+    ArgumentParserWithErrors
+        the parser
     """
-
     parser = ArgumentParserWithErrors(
         description="Example Argument Parser", formatter_class=argparse.ArgumentDefaultsHelpFormatter
     )
+    # ruff: noqa: E501
+    # yapf: disable
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu",
+                        help="device to use for PyTorch inference")
+    parser.add_argument("--cpu_preload", type=str2bool, default=True,
+                        help="load model into CPU memory first then move model to specified device; "
+                            "this reduces GPU memory usage when loading model.")
+
+    parser.add_argument("--dynamic_quantization", "-dq", action='store_true',
+                    help="whether to apply Dynamic Quantization to model "
+                         "to reduced memory usage (~half less) and increase inference speed "
+                         "at cost of slight decrease in accuracy; Only for CPU; "
+                         "NOTE: overhead might make inference slower for models smaller than 'large'")
+
+    parser.add_argument("--prepend_punctuations", '-pp', type=str, default="\"'“¿([{-",
+                        help="Punctuations to prepend to next word")
+    parser.add_argument("--append_punctuations", '-ap', type=str, default="\"'.。,，!！?？:：”)]}、",
+                        help="Punctuations to append to previous word")
+
+    parser.add_argument("--gap_padding", type=str, default=" ...",
+                        help="padding prepend to each segments for word timing alignment;"
+                            "used to reduce the probability of model predicting timestamps "
+                            "earlier than the first utterance")
+
+    parser.add_argument("--word_timestamps", type=str2bool, default=True,
+                        help="extract word-level timestamps using the cross-attention pattern and dynamic time warping,"
+                         "and include the timestamps for each word in each segment;"
+                         "disabling this will prevent segments from splitting/merging properly.")
+
+    parser.add_argument("--regroup", type=str, default="True",
+                        help="whether to regroup all words into segments with more natural boundaries;"
+                            "specify string for customizing the regrouping algorithm"
+                            "ignored if [word_timestamps]=False.")
+
+    parser.add_argument('--ts_num', type=int, default=0,
+                        help="number of extra inferences to perform to find the mean timestamps")
+    parser.add_argument('--ts_noise', type=float, default=0.1,
+                        help="percentage of noise to add to audio_features to perform inferences for [ts_num]")
+
+    parser.add_argument('--suppress_silence', type=str2bool, default=True,
+                        help="whether to suppress timestamp where audio is silent at segment-level"
+                            "and word-level if [suppress_word_ts]=True")
+    parser.add_argument('--suppress_word_ts', type=str2bool, default=True,
+                        help="whether to suppress timestamps where audio is silent at word-level; "
+                            "ignored if [suppress_silence]=False")
+
+    parser.add_argument('--suppress_ts_tokens', type=str2bool, default=False,
+                        help="whether to use silence mask to suppress silent timestamp tokens during inference; "
+                            "increases word accuracy in some cases, but tends reduce 'verbatimness' of the transcript"
+                            "ignored if [suppress_silence]=False")
+
+    parser.add_argument("--q_levels", type=int, default=20,
+                        help="quantization levels for generating timestamp suppression mask; "
+                            "acts as a threshold to marking sound as silent;"
+                            "fewer levels will increase the threshold of volume at which to mark a sound as silent")
+
+    parser.add_argument("--k_size", type=int, default=5,
+                        help="Kernel size for average pooling waveform to generate suppression mask; "
+                            "recommend 5 or 3; higher sizes will reduce detection of silence")
+
+    parser.add_argument('--time_scale', type=float,
+                        help="factor for scaling audio duration for inference;"
+                            "greater than 1.0 'slows down' the audio; "
+                            "less than 1.0 'speeds up' the audio; "
+                            "1.0 is no scaling")
+
+    parser.add_argument('--vad', type=str2bool, default=False,
+                        help='whether to use Silero VAD to generate timestamp suppression mask; '
+                            'Silero VAD requires PyTorch 1.12.0+;'
+                            'Official repo: https://github.com/snakers4/silero-vad')
+    parser.add_argument('--vad_threshold', type=float, default=0.35,
+                        help='threshold for detecting speech with Silero VAD. (Default: 0.35); '
+                            'low threshold reduces false positives for silence detection')
+    parser.add_argument('--vad_onnx', type=str2bool, default=False,
+                        help='whether to use ONNX for Silero VAD')
+
+    parser.add_argument('--min_word_dur', type=float, default=0.1,
+                        help="only allow suppressing timestamps that result in word durations greater than this value")
+
+    # parser.add_argument('--max_chars', type=int,
+    #                     help="maximum number of character allowed in each segment")
+    # parser.add_argument('--max_words', type=int,
+    #                     help="maximum number of words allowed in each segment")
+
+    parser.add_argument('--demucs', type=str2bool, default=False,
+                        help='whether to reprocess the audio track with Demucs to isolate vocals/remove noise; '
+                            'Demucs official repo: https://github.com/facebookresearch/demucs')
+    parser.add_argument('--demucs_output', action="extend", nargs="+", type=str,
+                    help='path(s) to save the vocals isolated by Demucs as WAV file(s); '
+                         'ignored if [demucs]=False')
+    parser.add_argument('--only_voice_freq', '-ovf', action='store_true',
+                        help='whether to only use sound between 200 - 5000 Hz, where majority of human speech are.')
+
+    parser.add_argument('--strip', type=str2bool, default=True,
+                        help="whether to remove spaces before and after text on each segment for output")
+
+    parser.add_argument('--tag', type=str, action="extend", nargs="+",
+                        help="a pair tags used to change the properties a word at its predicted time"
+                            "SRT Default: '<font color=\"#00ff00\">', '</font>'"
+                            "VTT Default: '<u>', '</u>'"
+                            "ASS Default: '{\\1c&HFF00&}', '{\\r}'")
+    # parser.add_argument('--segment_level', type=str2bool, default=True,
+    #                     help="whether to use segment-level timestamps in output")
+    # parser.add_argument('--word_level', type=str2bool, default=True,
+    #                     help="whether to use word-level timestamps in output")
+
+    parser.add_argument('--reverse_text', type=str2bool, default=False,
+                        help="whether to reverse the order of words for each segment of text output")
+
+    # ass output
+    parser.add_argument('--font', type=str, default='Arial',
+                        help="word font for ASS output(s)")
+    parser.add_argument('--font_size', type=int, default=48,
+                        help="word font size for ASS output(s)")
+    parser.add_argument('--karaoke', type=str2bool, default=False,
+                        help="whether to use progressive filling highlights for karaoke effect (only for ASS outputs)")
+
+    # parser.add_argument("--temperature", type=float, default=0,
+    #                     help="temperature to use for sampling")
+    # parser.add_argument("--best_of", type=optional_int,
+    #                     help="number of candidates when sampling with non-zero temperature")
+    # parser.add_argument("--beam_size", type=optional_int,
+    #                     help="number of beams in beam search, only applicable when temperature is zero")
+    # parser.add_argument("--patience", type=float, default=None,
+    #                     help="optional patience value to use in beam decoding, "
+    #                         "as in https://arxiv.org/abs/2204.05424, "
+    #                         "the default (1.0) is equivalent to conventional beam search")
+
+    parser.add_argument("--length_penalty", type=float, default=None,
+                        help="optional token length penalty coefficient (alpha) "
+                            "as in https://arxiv.org/abs/1609.08144, uses simple length normalization by default")
+
+    # parser.add_argument("--fp16", type=str2bool, default=True,
+    #                     help="whether to perform inference in fp16; True by default")
+
+    parser.add_argument("--compression_ratio_threshold", type=optional_float, default=2.4,
+                        help="if the gzip compression ratio is higher than this value, treat the decoding as failed")
+    parser.add_argument("--logprob_threshold", type=optional_float, default=-1.0,
+                        help="if the average log probability is lower than this value, treat the decoding as failed")
+    parser.add_argument("--no_speech_threshold", type=optional_float, default=0.6,
+                        help="if the probability of the <|nospeech|> token is higher than this value AND the decoding "
+                            "has failed due to `logprob_threshold`, consider the segment as silence")
+    parser.add_argument("--threads", type=optional_int, default=0,
+                        help="number of threads used by torch for CPU inference; "
+                            "supercedes MKL_NUM_THREADS/OMP_NUM_THREADS")
+
+    parser.add_argument('--mel_first', action='store_true',
+                        help='process entire audio track into log-Mel spectrogram first instead in chunks')
+
+    # parser.add_argument('--align', '-a', action="extend", nargs='+', type=str,
+    #                     help='path(s) to TXT file(s) or JSON previous result(s)')
+
+    # parser.add_argument('--refine', '-r', action='store_true',
+    #                     help='Refine timestamps to increase precision of timestamps')
+
+    parser.add_argument('--demucs_option', '-do', action="extend", nargs='+', type=str,
+                    help='Extra option(s) to use for demucs; Replace True/False with 1/0; '
+                         'E.g. --demucs_option "shifts=3" --demucs_options "overlap=0.5"')
+
+    parser.add_argument('--refine_option', '-ro', action="extend", nargs='+', type=str,
+                        help='Extra option(s) to use for refining timestamps; Replace True/False with 1/0; '
+                            'E.g. --refine_option "steps=sese" --refine_options "rel_prob_decrease=0.05"')
+    parser.add_argument('--model_option', '-mo', action="extend", nargs='+', type=str,
+                        help='Extra option(s) to use for loading model; Replace True/False with 1/0; '
+                            'E.g. --model_option "download_root=./downloads"')
+    parser.add_argument('--transcribe_option', '-to', action="extend", nargs='+', type=str,
+                        help='Extra option(s) to use for transcribing/alignment; Replace True/False with 1/0; '
+                            'E.g. --transcribe_option "ignore_compatibility=1"')
+    parser.add_argument('--save_option', '-so', action="extend", nargs='+', type=str,
+                        help='Extra option(s) to use for text outputs; Replace True/False with 1/0; '
+                            'E.g. --save_option "highlight_color=ffffff"')
+    # yapf: enable
+    return parser
+
+
+def _parse_args_stable_ts(arguments: str, mode: str, method=None, **kwargs):
+    """Parse the arguments without the cache, see parse_args_stable_ts"""
     args = {}
 
     def update_options_with_args(arg_key: str, options: Optional[dict] = None, pop: bool = False):
@@ -88,179 +287,7 @@ def parse_args_stable_ts(
         options.update(extra_options)
 
     try:
-        # ruff: noqa: E501
-        # yapf: disable
-        parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu",
-                            help="device to use for PyTorch inference")
-        parser.add_argument("--cpu_preload", type=str2bool, default=True,
-                            help="load model into CPU memory first then move model to specified device; "
-                                "this reduces GPU memory usage when loading model.")
-
-        parser.add_argument("--dynamic_quantization", "-dq", action='store_true',
-                        help="whether to apply Dynamic Quantization to model "
-                             "to reduced memory usage (~half less) and increase inference speed "
-                             "at cost of slight decrease in accuracy; Only for CPU; "
-                             "NOTE: overhead might make inference slower for models smaller than 'large'")
-
-        parser.add_argument("--prepend_punctuations", '-pp', type=str, default="\"'“¿([{-",
-                            help="Punctuations to prepend to next word")
-        parser.add_argument("--append_punctuations", '-ap', type=str, default="\"'.。,，!！?？:：”)]}、",
-                            help="Punctuations to append to previous word")
-
-        parser.add_argument("--gap_padding", type=str, default=" ...",
-                            help="padding prepend to each segments for word timing alignment;"
-                                "used to reduce the probability of model predicting timestamps "
-                                "earlier than the first utterance")
-
-        parser.add_argument("--word_timestamps", type=str2bool, default=True,
-                            help="extract word-level timestamps using the cross-attention pattern and dynamic time warping,"
-                             "and include the timestamps for each word in each segment;"
-                             "disabling this will prevent segments from splitting/merging properly.")
-
-        parser.add_argument("--regroup", type=str, default="True",
-                            help="whether to regroup all words into segments with more natural boundaries;"
-                                "specify string for customizing the regrouping algorithm"
-                                "ignored if [word_timestamps]=False.")
-
-        parser.add_argument('--ts_num', type=int, default=0,
-                            help="number of extra inferences to perform to find the mean timestamps")
-        parser.add_argument('--ts_noise', type=float, default=0.1,
-                            help="percentage of noise to add to audio_features to perform inferences for [ts_num]")
-
-        parser.add_argument('--suppress_silence', type=str2bool, default=True,
-                            help="whether to suppress timestamp where audio is silent at segment-level"
-                                "and word-level if [suppress_word_ts]=True")
-        parser.add_argument('--suppress_word_ts', type=str2bool, default=True,
-                            help="whether to suppress timestamps where audio is silent at word-level; "
-                                "ignored if [suppress_silence]=False")
-
-        parser.add_argument('--suppress_ts_tokens', type=str2bool, default=False,
-                            help="whether to use silence mask to suppress silent timestamp tokens during inference; "
-                                "increases word accuracy in some cases, but tends reduce 'verbatimness' of the transcript"
-                                "ignored if [suppress_silence]=False")
-
-        parser.add_argument("--q_levels", type=int, default=20,
-                            help="quantization levels for generating timestamp suppression mask; "
-                                "acts as a threshold to marking sound as silent;"
-                                "fewer levels will increase the threshold of volume at which to mark a sound as silent")
-
-        parser.add_argument("--k_size", type=int, default=5,
-                            help="Kernel size for average pooling waveform to generate suppression mask; "
-                                "recommend 5 or 3; higher sizes will reduce detection of silence")
-
-        parser.add_argument('--time_scale', type=float,
-                            help="factor for scaling audio duration for inference;"
-                                "greater than 1.0 'slows down' the audio; "
-                                "less than 1.0 'speeds up' the audio; "
-                                "1.0 is no scaling")
-
-        parser.add_argument('--vad', type=str2bool, default=False,
-                            help='whether to use Silero VAD to generate timestamp suppression mask; '
-                                'Silero VAD requires PyTorch 1.12.0+;'
-                                'Official repo: https://github.com/snakers4/silero-vad')
-        parser.add_argument('--vad_threshold', type=float, default=0.35,
-                            help='threshold for detecting speech with Silero VAD. (Default: 0.35); '
-                                'low threshold reduces false positives for silence detection')
-        parser.add_argument('--vad_onnx', type=str2bool, default=False,
-                            help='whether to use ONNX for Silero VAD')
-
-        parser.add_argument('--min_word_dur', type=float, default=0.1,
-                            help="only allow suppressing timestamps that result in word durations greater than this value")
-
-        # parser.add_argument('--max_chars', type=int,
-        #                     help="maximum number of character allowed in each segment")
-        # parser.add_argument('--max_words', type=int,
-        #                     help="maximum number of words allowed in each segment")
-
-        parser.add_argument('--demucs', type=str2bool, default=False,
-                            help='whether to reprocess the audio track with Demucs to isolate vocals/remove noise; '
-                                'Demucs official repo: https://github.com/facebookresearch/demucs')
-        parser.add_argument('--demucs_output', action="extend", nargs="+", type=str,
-                        help='path(s) to save the vocals isolated by Demucs as WAV file(s); '
-                             'ignored if [demucs]=False')
-        parser.add_argument('--only_voice_freq', '-ovf', action='store_true',
-                            help='whether to only use sound between 200 - 5000 Hz, where majority of human speech are.')
-
-        parser.add_argument('--strip', type=str2bool, default=True,
-                            help="whether to remove spaces before and after text on each segment for output")
-
-        parser.add_argument('--tag', type=str, action="extend", nargs="+",
-                            help="a pair tags used to change the properties a word at its predicted time"
-                                "SRT Default: '<font color=\"#00ff00\">', '</font>'"
-                                "VTT Default: '<u>', '</u>'"
-                                "ASS Default: '{\\1c&HFF00&}', '{\\r}'")
-        # parser.add_argument('--segment_level', type=str2bool, default=True,
-        #                     help="whether to use segment-level timestamps in output")
-        # parser.add_argument('--word_level', type=str2bool, default=True,
-        #                     help="whether to use word-level timestamps in output")
-
-        parser.add_argument('--reverse_text', type=str2bool, default=False,
-                            help="whether to reverse the order of words for each segment of text output")
-
-        # ass output
-        parser.add_argument('--font', type=str, default='Arial',
-                            help="word font for ASS output(s)")
-        parser.add_argument('--font_size', type=int, default=48,
-                            help="word font size for ASS output(s)")
-        parser.add_argument('--karaoke', type=str2bool, default=False,
-                            help="whether to use progressive filling highlights for karaoke effect (only for ASS outputs)")
-
-        # parser.add_argument("--temperature", type=float, default=0,
-        #                     help="temperature to use for sampling")
-        # parser.add_argument("--best_of", type=optional_int,
-        #                     help="number of candidates when sampling with non-zero temperature")
-        # parser.add_argument("--beam_size", type=optional_int,
-        #                     help="number of beams in beam search, only applicable when temperature is zero")
-        # parser.add_argument("--patience", type=float, default=None,
-        #                     help="optional patience value to use in beam decoding, "
-        #                         "as in https://arxiv.org/abs/2204.05424, "
-        #                         "the default (1.0) is equivalent to conventional beam search")
-
-        parser.add_argument("--length_penalty", type=float, default=None,
-                            help="optional token length penalty coefficient (alpha) "
-                                "as in https://arxiv.org/abs/1609.08144, uses simple length normalization by default")
-
-        # parser.add_argument("--fp16", type=str2bool, default=True,
-        #                     help="whether to perform inference in fp16; True by default")
-
-        parser.add_argument("--compression_ratio_threshold", type=optional_float, default=2.4,
-                            help="if the gzip compression ratio is higher than this value, treat the decoding as failed")
-        parser.add_argument("--logprob_threshold", type=optional_float, default=-1.0,
-                            help="if the average log probability is lower than this value, treat the decoding as failed")
-        parser.add_argument("--no_speech_threshold", type=optional_float, default=0.6,
-                            help="if the probability of the <|nospeech|> token is higher than this value AND the decoding "
-                                "has failed due to `logprob_threshold`, consider the segment as silence")
-        parser.add_argument("--threads", type=optional_int, default=0,
-                            help="number of threads used by torch for CPU inference; "
-                                "supercedes MKL_NUM_THREADS/OMP_NUM_THREADS")
-
-        parser.add_argument('--mel_first', action='store_true',
-                            help='process entire audio track into log-Mel spectrogram first instead in chunks')
-
-        # parser.add_argument('--align', '-a', action="extend", nargs='+', type=str,
-        #                     help='path(s) to TXT file(s) or JSON previous result(s)')
-
-        # parser.add_argument('--refine', '-r', action='store_true',
-        #                     help='Refine timestamps to increase precision of timestamps')
-
-        parser.add_argument('--demucs_option', '-do', action="extend", nargs='+', type=str,
-                        help='Extra option(s) to use for demucs; Replace True/False with 1/0; '
-                             'E.g. --demucs_option "shifts=3" --demucs_options "overlap=0.5"')
-
-        parser.add_argument('--refine_option', '-ro', action="extend", nargs='+', type=str,
-                            help='Extra option(s) to use for refining timestamps; Replace True/False with 1/0; '
-                                'E.g. --refine_option "steps=sese" --refine_options "rel_prob_decrease=0.05"')
-        parser.add_argument('--model_option', '-mo', action="extend", nargs='+', type=str,
-                            help='Extra option(s) to use for loading model; Replace True/False with 1/0; '
-                                'E.g. --model_option "download_root=./downloads"')
-        parser.add_argument('--transcribe_option', '-to', action="extend", nargs='+', type=str,
-                            help='Extra option(s) to use for transcribing/alignment; Replace True/False with 1/0; '
-                                'E.g. --transcribe_option "ignore_compatibility=1"')
-        parser.add_argument('--save_option', '-so', action="extend", nargs='+', type=str,
-                            help='Extra option(s) to use for text outputs; Replace True/False with 1/0; '
-                                'E.g. --save_option "highlight_color=ffffff"')
-        # yapf: enable
-        args = parser.parse_args(arguments.split()).__dict__
+        args = get_stable_ts_parser().parse_args(arguments.split()).__dict__
         threads = args.pop('threads')  # pop to be added in certain mode -> transcribe, align, refine
 
         args['demucs_options'] = update_options_with_args('demucs_option', pop=True)
@@ -376,7 +403,65 @@ def parse_args_stable_ts(
     return args
 
 
-def get_tc_args(process_func, setting_cache: SettingDict, mode="transcribe"):
+def parse_args_stable_ts(
+    arguments: str, mode: Union[Literal["load", "transcribe", "align", "refine", "save"], str], method=None, **kwargs
+):
+    """Parse arguments to be passed onto stable ts with each mode in mind
+
+    Pass in kwargs if needed. Results are cached by (arguments, mode, method, kwargs) so repeated calls (e.g. saving
+    every file in every format) do not go through argparse again, a copy is returned so it is safe to modify.
+
+    Parameters
+    ----------
+    arguments : str
+        arguments to be parsed
+    mode : Literal[&quot;load&quot;, &quot;transcribe&quot;, &quot;align&quot;, &quot;refine&quot;, &quot;save&quot;]
+        mode to parse arguments for
+    pass_method : _type_, optional
+        method to pass arguments to, by default None
+
+    Returns
+    -------
+    dict
+        parsed arguments
+
+    Raises
+    ------
+    ValueError
+        if there are missing values or invalid values
+    """
+    show_parsed = kwargs.pop("show_parsed", True)
+    # the save path is different for every file, it is filled in after so the result can be reused across files
+    save_path = kwargs.pop("save_path", None)
+    try:
+        # bound methods of different results share the same function and the same parameters
+        key = (mode, getattr(method, "__func__", method), repr(sorted(kwargs.items())))
+        hash(key)
+    except TypeError:
+        key = None  # unhashable method, parse without caching
+
+    cached = parse_cache.get(arguments, key)
+    if cached is not None:
+        args = deepcopy(cached)
+    else:
+        args = _parse_args_stable_ts(arguments, mode, method, show_parsed=show_parsed, **kwargs)
+        if key is not None and args["success"]:
+            parse_cache.set(arguments, key, args)
+
+    if mode == "save" and args["success"]:
+        for path_key in ("filepath", "path"):
+            if path_key in args and args[path_key] is None:
+                args[path_key] = save_path
+
+    return args
+
+
+def clear_parse_cache() -> None:
+    """Drop every cached parse result"""
+    parse_cache.clear()
+
+
+def get_tc_args(process_func, setting_cache: SettingDict, mode="transcribe", model_name: Optional[str] = None):
     """
     Get arguments / parameter to load to stable ts 
     for transcribe / translate using whisper and get their respective function
@@ -391,6 +476,10 @@ def get_tc_args(process_func, setting_cache: SettingDict, mode="transcribe"):
         Wether the source language is auto or not
     setting_cache : SettingDict
         The setting value
+    mode : str, optional
+        The parse mode, by default "transcribe"
+    model_name : Optional[str], optional
+        The model name, used to apply the tuned cpu threads when cpu autotune is enabled, by default None
 
     Returns
     -------
@@ -447,6 +536,8 @@ def get_tc_args(process_func, setting_cache: SettingDict, mode="transcribe"):
     else:
         whisper_args = data
         threads = whisper_args.pop("threads")
+        if not threads and model_name and setting_cache["cpu_autotune"]:
+            threads = tuned_threads(model_name, setting_cache["use_faster_whisper"])
         if threads:
             torch.set_num_threads(threads)
 
@@ -454,7 +545,13 @@ def get_tc_args(process_func, setting_cache: SettingDict, mode="transcribe"):
 
 
 def get_model(
-    transcribe: bool, translate: bool, tl_engine_whisper: bool, model_name_tc: str, engine: str, setting_cache: SettingDict,
+    transcribe: bool,
+    translate: bool,
+    tl_engine_whisper: bool,
+    model_name_tc: str,
+    engine: str,
+    setting_cache: SettingDict,
+    share_encoder: bool = False,
     **model_args
 ):
     """Get model and the function for stable whisper while also checking using faster whisper or not
@@ -473,6 +570,9 @@ def get_model(
         engine name
     setting_cache : SettingDict
         Setting value
+    share_encoder : bool, optional
+        Reuse the encoder output between transcribe and translate when both use the same model, by default False.
+        Only for live chunks, where both tasks encode the same window right after each other
 
     Returns
     -------
@@ -480,22 +580,33 @@ def get_model(
         model_tc, model_tl, stable_tc, stable_tl, load_to_tc_args
     """
     model_tc, model_tl, stable_tc, stable_tl = None, None, None, None
+
+    def model_args_for(model_name: str):
+        # the tuned cpu config is different for each model
+        if not setting_cache["cpu_autotune"]:
+            return model_args
+        args = dict(model_args)
+        apply_tuned_model_args(model_name, setting_cache["use_faster_whisper"], args)
+        return args
+
+    # models are kept warm in the cache between sessions
+    model_cache.set_budget(setting_cache["model_cache_budget_mb"])
     if setting_cache["use_faster_whisper"] and model_name_tc:
         if transcribe and translate and model_name_tc == engine:
             # same model for both transcribe and translate. Load only once
             logger.debug("Loading model for both transcribe and translate using faster-whisper | Load only once")
-            model_tc = stable_whisper.load_faster_whisper(model_name_tc, **model_args)
+            model_tc = model_cache.load("faster_whisper", model_name_tc, **model_args_for(model_name_tc))
             stable_tc = model_tc.transcribe_stable  # type: ignore
             stable_tl = stable_tc
         else:
             if transcribe:  # if transcribe, load model for transcribe
                 logger.debug("Loading model for transcribe using faster-whisper")
-                model_tc = stable_whisper.load_faster_whisper(model_name_tc, **model_args)
+                model_tc = model_cache.load("faster_whisper", model_name_tc, **model_args_for(model_name_tc))
                 stable_tc = model_tc.transcribe_stable  # type: ignore
 
             if translate and tl_engine_whisper:  # if translate using whisper, load model for translate
                 logger.debug("Loading model for translate using faster-whisper")
-                model_tl = stable_whisper.load_faster_whisper(engine, **model_args)
+                model_tl = model_cache.load("faster_whisper", engine, **model_args_for(engine))
                 stable_tl = model_tl.transcribe_stable  # type: ignore
 
             # if translate and the engine is not using whisper,
@@ -506,24 +617,24 @@ def get_model(
                     "Mode is translate and engine is not using whisper, " \
                     "model for transcribe is not loaded yet, loading model for transcribe"
                 )
-                model_tc = stable_whisper.load_faster_whisper(model_name_tc, **model_args)
+                model_tc = model_cache.load("faster_whisper", model_name_tc, **model_args_for(model_name_tc))
                 stable_tc = model_tc.transcribe_stable  # type: ignore
     else:
         if transcribe and translate and model_name_tc == engine:
             # same model for both transcribe and translate. Load only once
             logger.debug("Loading model for both transcribe and translate using whisper | Load only once")
-            model_tc = stable_whisper.load_model(model_name_tc, **model_args)
+            model_tc = model_cache.load("whisper", model_name_tc, **model_args_for(model_name_tc))
             stable_tc = model_tc.transcribe
             stable_tl = stable_tc
         else:
             if transcribe:  # if transcribe, load model for transcribe
                 logger.debug("Loading model for transcribe using whisper")
-                model_tc = stable_whisper.load_model(model_name_tc, **model_args)
+                model_tc = model_cache.load("whisper", model_name_tc, **model_args_for(model_name_tc))
                 stable_tc = model_tc.transcribe
 
             if translate and tl_engine_whisper:  # if translate using whisper, load model for translate
                 logger.debug("Loading model for translate using whisper")
-                model_tl = stable_whisper.load_model(engine, **model_args)
+                model_tl = model_cache.load("whisper", engine, **model_args_for(engine))
                 stable_tl = model_tl.transcribe
 
             # if translate and the engine is not using whisper,
@@ -534,9 +645,16 @@ def get_model(
                     "Mode is translate and engine is not using whisper, " \
                     "model for transcribe is not loaded yet, loading model for transcribe"
                 )
-                model_tc = stable_whisper.load_model(model_name_tc, **model_args)
+                model_tc = model_cache.load("whisper", model_name_tc, **model_args_for(model_name_tc))
                 stable_tc = model_tc.transcribe_stable
 
+    # same model for both, the translate pass reuses the encoder output of the transcribe pass on the same chunk
+    if share_encoder:
+        shared = transcribe and translate and model_name_tc == engine
+        for model in (model_tc, model_tl):
+            if model is not None:
+                set_encoder_sharing(model, shared)
+
     load_to_tc_args = stable_tc if stable_tc is not None else stable_tl  # making sure that the load_to_tc_args is not None
 
     logger.debug(f"Model loaded | Is Faster Whisper: {setting_cache['use_faster_whisper']} | Load Status:")
@@ -548,13 +666,15 @@ def get_model(
     return model_tc, model_tl, stable_tc, stable_tl, load_to_tc_args
 
 
-def get_model_args(setting_cache: SettingDict):
+def get_model_args(setting_cache: SettingDict, model_name: Optional[str] = None):
     """Get arguments / parameter to load to stable ts
 
     Parameters
     ----------
     setting_cache: dict
         Setting value
+    model_name: Optional[str], optional
+        The model name, used to apply the tuned cpu config when cpu autotune is enabled, by default None
 
     Returns
     -------
@@ -582,4 +702,7 @@ def get_model_args(setting_cache: SettingDict):
     else:
         model_args["download_root"] = get_default_download_root()
 
+    if model_name and setting_cache["cpu_autotune"]:
+        apply_tuned_model_args(model_name, setting_cache["use_faster_whisper"], model_args)
+
     return model_args
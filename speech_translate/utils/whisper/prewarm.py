@@ -0,0 +1,151 @@
+from threading import Lock, Timer
+from typing import List, Optional
+
+import numpy as np
+from loguru import logger
+
+from speech_translate._constants import WHISPER_SR
+from speech_translate.utils.types import SettingDict
+from speech_translate.utils.whisper.cache import model_cache
+from speech_translate.utils.whisper.download import (
+    get_default_download_root,
+    verify_model_faster_whisper,
+    verify_model_whisper,
+)
+from speech_translate.utils.whisper.helper import append_dot_en, model_keys
+from speech_translate.utils.whisper.load import get_model_args
+
+
+class ModelPrewarmer:
+    """
+    Load the selected models into the model cache in the background, so pressing record / start does not have to
+    wait for the model to load.
+
+    Requests are debounced so the load only starts after the selection settles. A new request cancels the previous one,
+    a model that is already being loaded will finish loading (it stays in the cache) but the rest of the request
+    is skipped.
+    """
+    def __init__(self, delay: float = 1.0):
+        """
+        Parameters
+        ----------
+        delay : float, optional
+            time in seconds the selection has to stay the same before loading, by default 1.0
+        """
+        self.delay = delay
+        self._lock = Lock()
+        self._timer: Optional[Timer] = None
+        self._generation = 0
+
+    def request(self, model_names: List[str], setting_cache: SettingDict) -> None:
+        """Request models to be prewarmed, cancelling the previous request
+
+        Parameters
+        ----------
+        model_names : List[str]
+            name of the models to load
+        setting_cache : SettingDict
+            setting value
+        """
+        with self._lock:
+            self._generation += 1
+            if self._timer is not None:
+                self._timer.cancel()
+
+            self._timer = Timer(
+                self.delay, self._run, args=(self._generation, list(dict.fromkeys(model_names)), setting_cache)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def cancel(self) -> None:
+        """Cancel the current request"""
+        with self._lock:
+            self._generation += 1
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _is_cancelled(self, generation: int) -> bool:
+        return generation != self._generation
+
+    def _run(self, generation: int, model_names: List[str], setting_cache: SettingDict):
+        try:
+            use_faster_whisper = setting_cache["use_faster_whisper"]
+            backend = "faster_whisper" if use_faster_whisper else "whisper"
+            model_dir = setting_cache["dir_model"]
+            if model_dir == "auto":
+                model_dir = get_default_download_root()
+            model_cache.set_budget(setting_cache["model_cache_budget_mb"])
+
+            for model_name in model_names:
+                if self._is_cancelled(generation):
+                    return
+
+                # never download from here, the download is confirmed by the user when starting
+                if use_faster_whisper:
+                    ok = verify_model_faster_whisper(model_name, model_dir)
+                else:
+                    ok = verify_model_whisper(model_name, model_dir)
+                if not ok or self._is_cancelled(generation):
+                    continue
+
+                logger.debug(f"Prewarming model {model_name}")
+                model_args = get_model_args(setting_cache, model_name)
+                model = model_cache.load(backend, model_name, claim=False, **model_args)
+
+                if setting_cache["prewarm_dummy_decode"] and not self._is_cancelled(generation):
+                    # skipped once a session uses the model, and a session starting meanwhile waits for it to finish
+                    with model_cache.warmup(backend, model_name, **model_args) as can_run:
+                        if can_run:
+                            # run a short decode so the first real decode does not pay for the initialization
+                            silence = np.zeros(WHISPER_SR, dtype=np.float32)
+                            if use_faster_whisper:
+                                model.transcribe_stable(silence, input_sr=WHISPER_SR, verbose=None)
+                            else:
+                                model.transcribe(silence, verbose=None)
+
+                logger.debug(f"Model {model_name} is ready")
+        except Exception as e:
+            logger.exception(e)
+            logger.warning("Failed to prewarm model, it will be loaded when starting instead")
+
+
+model_prewarmer = ModelPrewarmer()
+
+
+def prewarm_selection(
+    transcribe: bool, translate: bool, model_key: str, engine: str, lang_source: str, setting_cache: SettingDict
+) -> None:
+    """Prewarm the models that will be used for the current selection, if prewarm is enabled
+
+    Parameters
+    ----------
+    transcribe : bool
+        Transcribe or not
+    translate : bool
+        Translate or not
+    model_key : str
+        Key of the selected transcribe model
+    engine : str
+        Selected translate engine
+    lang_source : str
+        Selected source language
+    setting_cache : SettingDict
+        Setting value
+    """
+    if not setting_cache["prewarm_model"] or setting_cache["model_cache_budget_mb"] <= 0:
+        return  # nothing to prewarm into if the model cache is disabled
+
+    keys = []
+    if transcribe or (translate and engine not in model_keys):
+        keys.append(model_key)
+    if translate and engine in model_keys:
+        keys.append(engine)
+
+    is_english = lang_source.lower() == "english"
+    names = [append_dot_en(k, is_english, setting_cache["use_en_model"]) for k in keys if k in model_keys]
+    if names:
+        model_prewarmer.request(names, setting_cache)
+    else:
+        model_prewarmer.cancel()
@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+from threading import Lock
+from typing import Dict, Optional
+
+import stable_whisper
+from loguru import logger
+
+from speech_translate._path import dir_result_cache
+from speech_translate.utils.whisper.checksum import file_checksum_cache
+
+# arguments that do not change the result, or are set per run by the program
+IGNORED_OPTIONS = {"verbose", "input_sr", "progress_callback"}
+
+
+def normalize_options(options: Dict) -> str:
+    """Turn the decode options into a stable string, so the same settings always give the same key
+
+    Parameters
+    ----------
+    options : Dict
+        arguments given to the transcribe / translate function
+
+    Returns
+    -------
+    str
+        json of the options that affect the result, sorted by key
+    """
+    normalized = {}
+    for key, value in options.items():
+        if key in IGNORED_OPTIONS or callable(value):
+            continue
+        if isinstance(value, tuple):
+            value = list(value)
+        normalized[key] = value
+
+    # objects (e.g. a loaded vad model) are identified by their type only, their repr changes every run
+    return json.dumps(normalized, sort_keys=True, default=lambda o: type(o).__name__)
+
+
+class ResultCache:
+    """
+    Persistent store of whisper results of imported files.
+
+    Each result is saved as stable ts json, keyed by the sha256 of the file content, the model, the backend, the task,
+    and the normalized decode options (which include the language). Importing the same file again with the same settings
+    (for example to export another format) loads the stored result instead of running whisper again.
+    When there are more than `max_entries` results, the least recently used ones are deleted.
+    """
+    def __init__(self, cache_dir: str = dir_result_cache, max_entries: int = 1000):
+        """
+        Parameters
+        ----------
+        cache_dir : str, optional
+            folder to store the results, by default dir_result_cache
+        max_entries : int, optional
+            maximum amount of results kept, by default 1000
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._lock = Lock()
+
+    @staticmethod
+    def make_key(path: str, model_name: str, use_faster_whisper: bool, task: str, options: Dict) -> str:
+        """Make the key of a result
+
+        Parameters
+        ----------
+        path : str
+            path of the audio / video file
+        model_name : str
+            name of the model
+        use_faster_whisper : bool
+            Whether the model is loaded with faster whisper
+        task : str
+            transcribe or translate
+        options : Dict
+            arguments given to the transcribe / translate function
+
+        Returns
+        -------
+        str
+            key of the result
+        """
+        backend = "faster_whisper" if use_faster_whisper else "whisper"
+        info = f"{model_name}|{backend}|{task}|{normalize_options(options)}"
+        digest = hashlib.sha256(info.encode("utf-8")).hexdigest()[:16]
+        return f"{file_checksum_cache.sha256(path)[:32]}_{digest}"
+
+    def get(self, key: str) -> Optional[stable_whisper.WhisperResult]:
+        """Get a stored result, None if there is none"""
+        target = os.path.join(self.cache_dir, key + ".json")
+        if not os.path.exists(target):
+            return None
+
+        try:
+            with open(target, "r", encoding="utf-8") as f:
+                result = stable_whisper.WhisperResult(json.load(f))
+            os.utime(target)  # mark as recently used
+            logger.debug(f"Using stored result {key}")
+            return result
+        except Exception as e:
+            logger.warning(f"Failed to read stored result, running whisper again: {e}")
+            return None
+
+    def set(self, key: str, result: stable_whisper.WhisperResult) -> None:
+        """Store a result"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            target = os.path.join(self.cache_dir, key + ".json")
+            temp = target + ".tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump(result.to_dict(), f, ensure_ascii=False)
+            os.replace(temp, target)
+            self._evict()
+        except Exception as e:
+            logger.warning(f"Failed to store result: {e}")
+
+    def _evict(self) -> None:
+        """Delete the least recently used results over max_entries"""
+        with self._lock:
+            try:
+                entries = [e for e in os.scandir(self.cache_dir) if e.name.endswith(".json")]
+            except FileNotFoundError:
+                return
+
+            if len(entries) <= self.max_entries:
+                return
+
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            for entry in entries[:len(entries) - self.max_entries]:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+result_cache = ResultCache()
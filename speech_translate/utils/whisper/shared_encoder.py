@@ -0,0 +1,165 @@
+from threading import Lock
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+import torch
+from loguru import logger
+
+
+class EncoderMemo:
+    """
+    Small LRU of encoder outputs keyed by the encoder input, used by the record session.
+
+    Transcribe and translate of a live chunk on the same model encode the same audio window, the encoder output only
+    depends on the mel spectrogram so the second task can reuse the output of the first one and only run its own
+    decoder. Retries with a higher temperature on the same window also reuse it.
+
+    Inputs are compared where they are (on the gpu for whisper) instead of being hashed, so a lookup does not copy the
+    mel to the cpu.
+    """
+    def __init__(self, size: int = 4):
+        """
+        Parameters
+        ----------
+        size : int, optional
+            maximum amount of kept outputs, by default 4. A live chunk is encoded by transcribe and translate right
+            after each other, so only the last few windows are needed
+        """
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        self._entries: List[Tuple[object, object]] = []  # (input, output), most recently used last
+
+    @staticmethod
+    def same(a, b) -> bool:
+        """Whether two encoder inputs are equal, without moving them off their device"""
+        if type(a) is not type(b) or a.shape != b.shape or a.dtype != b.dtype:
+            return False
+        if isinstance(a, torch.Tensor):
+            return a.device == b.device and bool(torch.equal(a, b))
+
+        return bool(np.array_equal(a, b))
+
+    @staticmethod
+    def keep(features) -> Optional[object]:
+        """Copy of the input to compare later (the caller may reuse its buffer), None if it can not be compared"""
+        if isinstance(features, torch.Tensor):
+            return features.detach().clone()
+        if isinstance(features, np.ndarray):
+            return features.copy()
+
+        return None
+
+    def __call__(self, features, encode: Callable):
+        """Get the encoder output of the features, running the encoder only if it is not kept
+
+        Parameters
+        ----------
+        features : torch.Tensor or np.ndarray
+            encoder input
+        encode : Callable
+            the original encoder
+
+        Returns
+        -------
+        object
+            encoder output
+        """
+        with self._lock:
+            for i, (kept, output) in enumerate(self._entries):
+                if self.same(kept, features):
+                    self._entries.append(self._entries.pop(i))
+                    self.hits += 1
+                    return output
+
+        output = encode(features)
+        kept = self.keep(features)
+        if kept is None:
+            return output
+
+        with self._lock:
+            self.misses += 1
+            self._entries.append((kept, output))
+            del self._entries[:-self.size]
+
+        return output
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SharedAudioEncoder(torch.nn.Module):
+    """Drop in replacement of the whisper audio encoder that reuses the output through an EncoderMemo"""
+    def __init__(self, encoder: torch.nn.Module, memo: EncoderMemo):
+        super().__init__()
+        self.encoder = encoder
+        self.memo = memo
+
+    def forward(self, x):  # pylint: disable=arguments-differ
+        return self.memo(x, self.encoder)
+
+    def __getattr__(self, name):
+        try:
+            return super().__getattr__(name)
+        except AttributeError:
+            # anything that reads the encoder attributes (dims, conv layers, etc.) still get them
+            return getattr(self._modules["encoder"], name)
+
+
+class SharedEncode:
+    """Replacement of the faster whisper encode method that reuses the output through an EncoderMemo"""
+    def __init__(self, encode: Callable, memo: EncoderMemo):
+        """
+        Parameters
+        ----------
+        encode : Callable
+            the original bound encode method of the model
+        memo : EncoderMemo
+            memo of the encoder outputs
+        """
+        self.encode = encode
+        self.memo = memo
+
+    def __call__(self, features):
+        return self.memo(features, self.encode)
+
+
+def get_encoder_memo(model) -> Optional[EncoderMemo]:
+    """Memo of the model if its encoder output is being reused, None otherwise"""
+    if isinstance(model, torch.nn.Module):  # whisper
+        encoder = model.encoder
+        return encoder.memo if isinstance(encoder, SharedAudioEncoder) else None
+
+    encode = vars(model).get("encode")  # faster whisper, only an instance attribute is a replacement
+    return encode.memo if isinstance(encode, SharedEncode) else None
+
+
+def set_encoder_sharing(model, enabled: bool) -> None:
+    """Enable or disable reusing the encoder output of a model, used by the record session when transcribe and
+    translate share the model. The model is shared through the model cache, so the session turns it off when it stops
+
+    Parameters
+    ----------
+    model : whisper.Whisper or faster_whisper.WhisperModel
+        the loaded model
+    enabled : bool
+        whether to reuse the encoder output
+    """
+    memo = get_encoder_memo(model)
+    if enabled and memo is None:
+        memo = EncoderMemo()
+        if isinstance(model, torch.nn.Module):
+            model.encoder = SharedAudioEncoder(model.encoder, memo)
+        else:  # the segments generator calls self.encode, so an instance attribute takes over the method
+            model.encode = SharedEncode(model.encode, memo)
+        logger.debug("Encoder output is shared between transcribe and translate")
+    elif not enabled and memo is not None:
+        logger.debug(f"Encoder sharing stopped, reused {memo.hits} of {memo.hits + memo.misses} encoder passes")
+        if isinstance(model, torch.nn.Module):
+            model.encoder = model.encoder.encoder
+        else:
+            del model.encode  # the class method is used again
+    elif memo is not None:
+        memo.clear()
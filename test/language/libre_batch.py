@@ -0,0 +1,126 @@
+import json
+import os
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep
+
+from loguru import logger
+
+toAdd = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(toAdd)
+
+from speech_translate.utils.translate.translator import libre_tl, translate  # pylint: disable=wrong-import-position
+
+# check the LibreTranslate batching against a local stub server, no real server is needed
+# the stub "translates" by upper casing the text, and accepts a list in q like LibreTranslate >= 1.3
+
+
+class Stub:
+    requests = []  # q of every request, in the order they arrived
+    connections = set()  # (host, port) of every client connection
+    reject_batch = False  # answer list requests with an error, like an older server
+    lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep alive, so the client can reuse the connection
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        q = body["q"]
+        with Stub.lock:
+            Stub.requests.append(q)
+            Stub.connections.add(self.client_address)
+
+        sleep(random.uniform(0, 0.02))  # answer out of order when requests run concurrently
+        if isinstance(q, list) and Stub.reject_batch:
+            status, out = 400, {"error": "Invalid request: q must be a string"}
+        else:
+            status, out = 200, {"translatedText": [x.upper() for x in q] if isinstance(q, list) else q.upper()}
+
+        data = json.dumps(out).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def reset():
+    Stub.requests.clear()
+    Stub.connections.clear()
+    Stub.reject_batch = False
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+LINK = f"http://127.0.0.1:{server.server_port}"
+
+TEXTS = [f"segment number {i}" for i in range(23)]
+EXPECTED = [q.upper() for q in TEXTS]
+
+# BATCH COUNT, ORDER, CONNECTION REUSE
+logger.debug("---------------------------------------------------------")
+logger.debug("testing batch count")
+reset()
+success, result = libre_tl(TEXTS, "english", "french", {}, False, LINK, "", libre_batch_size=10, libre_pool_size=1)
+assert success, result
+assert result == EXPECTED, result
+assert len(Stub.requests) == 3, f"expected 3 requests, got {len(Stub.requests)}"
+assert [len(q) for q in Stub.requests] == [10, 10, 3], Stub.requests
+assert len(Stub.connections) == 1, f"expected 1 connection, got {len(Stub.connections)}"
+logger.debug(f"{len(TEXTS)} texts sent in {len(Stub.requests)} requests over {len(Stub.connections)} connection")
+
+# character limit
+logger.debug("---------------------------------------------------------")
+logger.debug("testing character limit")
+reset()
+success, result = libre_tl(TEXTS, "english", "french", {}, False, LINK, "", libre_batch_size=100, libre_batch_chars=100)
+assert success, result
+assert result == EXPECTED, result
+assert all(sum(len(x) for x in q) <= 100 for q in Stub.requests if isinstance(q, list)), Stub.requests
+logger.debug(f"Sent in {len(Stub.requests)} requests with at most 100 characters each")
+
+# FALLBACK
+logger.debug("---------------------------------------------------------")
+logger.debug("testing per text fallback when a batch fails")
+reset()
+Stub.reject_batch = True
+success, result = libre_tl(TEXTS, "english", "french", {}, False, LINK, "", libre_batch_size=10, libre_pool_size=1)
+assert success, result
+assert result == EXPECTED, result
+batches = [q for q in Stub.requests if isinstance(q, list)]
+singles = [q for q in Stub.requests if isinstance(q, str)]
+assert len(batches) == 3, f"expected 3 rejected batches, got {len(batches)}"
+assert singles == TEXTS, singles
+logger.debug(f"{len(batches)} batches rejected, {len(singles)} texts sent one by one")
+
+# CONCURRENT ORDER
+logger.debug("---------------------------------------------------------")
+logger.debug("testing order with concurrent requests")
+reset()
+success, result = translate(
+    "LibreTranslate",
+    TEXTS,
+    "English",
+    "French", {},
+    tl_workers=4,
+    tl_rate=0,
+    libre_link=LINK,
+    libre_api_key="",
+    libre_batch_size=3,
+    libre_pool_size=4
+)
+assert success, result
+assert result == EXPECTED, result
+assert len(Stub.requests) == 8, f"expected 8 requests, got {len(Stub.requests)}"
+assert len(Stub.connections) <= 4, f"expected at most 4 connections, got {len(Stub.connections)}"
+logger.debug(f"Sent in {len(Stub.requests)} requests over {len(Stub.connections)} connections, result in order")
+
+server.shutdown()
+logger.debug("All LibreTranslate batch checks passed")